@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Application Search Benchmark
+Compares search latency of the legacy unanchored $regex path against the
+indexed search_terms path at 10k and 100k applications.
+
+Runs against a scratch database (never the portal's DB_NAME):
+    MONGO_URL=mongodb://localhost:27017 python benchmarks/bench_application_search.py [sizes...]
+"""
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.indexes import ensure_indexes
+from utils.search import SEARCH_CANDIDATE_LIMIT, build_search_filter, build_search_terms, rank_applications
+
+MONGO_URL = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
+BENCH_DB_NAME = os.environ.get('BENCH_DB_NAME', 'topwar_search_bench')
+DEFAULT_SIZES = [10_000, 100_000]
+REPETITIONS = 20
+PAGE_SIZE = 100
+
+SYLLABLES = ["ka", "ri", "zo", "mel", "dra", "ven", "tor", "lux", "shi", "ra", "gon", "bel", "nyx", "ash", "qu", "el"]
+QUERIES = ["ka", "dragon", "shira", "tor ven", "1234", "xx_nomatch_xx"]
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def _application(rng: random.Random, submitted_at: datetime) -> dict:
+    doc = {
+        "id": str(uuid.uuid4()),
+        "name": f"{_word(rng).title()} {_word(rng).title()}",
+        "discord_handle": f"{_word(rng)}_{rng.randint(1, 9999)}",
+        "ingame_name": _word(rng).title(),
+        "server": str(rng.randint(1, 2500)),
+        "status": "awaiting_review",
+        "previous_experience": "Lorem ipsum " * 40,
+        "submitted_at": submitted_at,
+    }
+    doc["search_terms"] = build_search_terms(doc)
+    return doc
+
+
+async def seed(db, size: int):
+    """Replace the scratch applications collection with `size` synthetic rows."""
+    await db.applications.drop()
+    await ensure_indexes(db)
+    rng = random.Random(size)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    batch = []
+    for i in range(size):
+        batch.append(_application(rng, start + timedelta(minutes=i)))
+        if len(batch) == 5000:
+            await db.applications.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        await db.applications.insert_many(batch, ordered=False)
+
+
+async def regex_search(db, search: str):
+    """The original get_applications search: four unanchored case-insensitive regexes."""
+    query = {
+        "$or": [
+            {"name": {"$regex": search, "$options": "i"}},
+            {"discord_handle": {"$regex": search, "$options": "i"}},
+            {"ingame_name": {"$regex": search, "$options": "i"}},
+            {"server": {"$regex": search, "$options": "i"}}
+        ]
+    }
+    return await db.applications.find(query, {"_id": 0, "search_terms": 0}).sort("submitted_at", -1).to_list(1000)
+
+
+async def indexed_search(db, search: str):
+    """The search_terms path used by get_applications."""
+    candidates = await db.applications.find(build_search_filter(search), {"_id": 0, "search_terms": 0}).sort(
+        [("submitted_at", -1), ("id", -1)]
+    ).limit(SEARCH_CANDIDATE_LIMIT).to_list(SEARCH_CANDIDATE_LIMIT)
+    return rank_applications(candidates, search)[:PAGE_SIZE]
+
+
+async def time_path(path, db, search: str) -> list:
+    timings = []
+    for _ in range(REPETITIONS):
+        started = time.perf_counter()
+        await path(db, search)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def _summary(timings: list) -> str:
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+    return f"median {statistics.median(ordered):8.2f} ms  p95 {p95:8.2f} ms"
+
+
+async def main(sizes):
+    client = AsyncIOMotorClient(MONGO_URL)
+    db = client[BENCH_DB_NAME]
+    try:
+        for size in sizes:
+            print(f"\n=== {size:,} applications ===")
+            await seed(db, size)
+            for search in QUERIES:
+                regex_timings = await time_path(regex_search, db, search)
+                indexed_timings = await time_path(indexed_search, db, search)
+                print(f"{search!r:>16}  regex: {_summary(regex_timings)}  |  indexed: {_summary(indexed_timings)}")
+    finally:
+        await client.drop_database(BENCH_DB_NAME)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES))
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Email Sender Benchmark
+Compares delivery throughput of the legacy one-connection-per-email sender
+against the pooled SMTP sender used by the email outbox, using a local SMTP
+sink. The sink's connect delay stands in for a real provider's TLS + AUTH
+handshake, which is the cost connection reuse removes.
+
+    python benchmarks/bench_email_outbox.py [messages] [connect_delay_ms]
+"""
+import asyncio
+import os
+import smtplib
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "topwar_email_bench")
+os.environ.setdefault("EMAIL_FROM", "bench@example.com")
+
+from tests.smtp_sink import SMTPSink
+from utils.outbox import EMAIL_SMTP_CONNECTIONS, SMTPConnectionPool, build_message
+
+DEFAULT_MESSAGES = 200
+DEFAULT_CONNECT_DELAY_MS = 50
+
+
+def _messages(count: int) -> list:
+    return [build_message({
+        "to_email": f"applicant{i}@example.com",
+        "subject": "Top War - Application Received",
+        "body_html": "<p>Thank you for applying.</p>" * 50,
+    }) for i in range(count)]
+
+
+def legacy_send(sink: SMTPSink, messages: list):
+    """The original send_email: connect, send one message, quit."""
+    for msg in messages:
+        with smtplib.SMTP(sink.host, sink.port) as server:
+            server.send_message(msg)
+
+
+async def pooled_send(sink: SMTPSink, messages: list):
+    """The outbox path: concurrent sends over a small pool of reused connections."""
+    pool = SMTPConnectionPool(host=sink.host, port=sink.port, username="", password="", starttls=False)
+    await asyncio.gather(*(asyncio.to_thread(pool.send, msg) for msg in messages))
+    await asyncio.to_thread(pool.close)
+
+
+def _report(label: str, sink: SMTPSink, count: int, elapsed: float):
+    print(f"{label:>8}: {count} emails in {elapsed:6.2f}s  ({count / elapsed:7.1f}/s)  "
+          f"connections opened: {sink.connections}")
+
+
+def main(count: int, connect_delay_ms: float):
+    messages = _messages(count)
+    print(f"{count} emails, {connect_delay_ms:.0f} ms simulated handshake, "
+          f"{EMAIL_SMTP_CONNECTIONS} pooled connections\n")
+
+    with SMTPSink(connect_delay=connect_delay_ms / 1000) as sink:
+        started = time.perf_counter()
+        legacy_send(sink, messages)
+        _report("legacy", sink, count, time.perf_counter() - started)
+
+    with SMTPSink(connect_delay=connect_delay_ms / 1000) as sink:
+        started = time.perf_counter()
+        asyncio.run(pooled_send(sink, messages))
+        _report("pooled", sink, count, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else DEFAULT_MESSAGES,
+         float(args[1]) if len(args) > 1 else DEFAULT_CONNECT_DELAY_MS)
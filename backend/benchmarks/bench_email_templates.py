@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Email Template Rendering Benchmark
+Reports the one-off compile cost and the per-email render time (HTML plus
+plain text) for every notification email type, rendered singly and in a
+batch for many recipients.
+
+    python benchmarks/bench_email_templates.py [batch_size]
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.email_templates import EMAIL_SUBJECTS, preload_templates, render_batch, render_email
+
+DEFAULT_BATCH_SIZE = 1000
+REPETITIONS = 2000
+
+
+def _context(i: int) -> dict:
+    return {
+        "name": f"Applicant {i}",
+        "manager_comment": "Thanks for your detailed answers & enthusiasm." if i % 2 else "",
+        "reset_link": f"https://example.com/moderator/reset-password?token={i:032d}",
+    }
+
+
+def main(batch_size: int):
+    started = time.perf_counter()
+    compiled = preload_templates()
+    print(f"compiled {compiled} templates in {(time.perf_counter() - started) * 1000:.1f} ms\n")
+
+    contexts = [_context(i) for i in range(batch_size)]
+    print(f"{'email type':<34}{'single (us)':>14}{'batch (us/email)':>20}")
+    for email_type in EMAIL_SUBJECTS:
+        timings = []
+        for i in range(REPETITIONS):
+            started = time.perf_counter()
+            render_email(email_type, **contexts[i % batch_size])
+            timings.append((time.perf_counter() - started) * 1e6)
+
+        started = time.perf_counter()
+        render_batch(email_type, contexts)
+        per_email = (time.perf_counter() - started) * 1e6 / batch_size
+        print(f"{email_type:<34}{statistics.median(timings):>14.1f}{per_email:>20.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BATCH_SIZE)
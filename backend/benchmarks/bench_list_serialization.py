@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+List Response Serialization Benchmark
+Compares serialization time and peak memory of FastAPI's response_model path
+(validate every row, dump to Python, json.dumps) and its plain-dict path
+(jsonable_encoder, json.dumps) against the serializer-only fast path in
+utils/responses.py, for synthetic application and audit-log lists.
+
+    python benchmarks/bench_list_serialization.py [rows]
+"""
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "topwar_serialization_bench")
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from models.schemas import Application
+from utils.responses import dump_rows_json
+
+DEFAULT_ROWS = 1000
+REPETITIONS = 20
+
+
+def _application(i: int, submitted_at: datetime) -> dict:
+    """A full application row as get_applications hands it to the response layer."""
+    row = {field: f"Answer {i} " * 8 for field, info in Application.model_fields.items()
+           if info.annotation is str}
+    row.update({
+        "id": str(uuid.uuid4()), "name": f"Applicant {i}", "email": f"applicant{i}@example.com",
+        "age": 20 + i % 30, "highest_character_level": 100 + i % 50, "status": "pending",
+        "approve_votes": i % 7, "reject_votes": i % 3, "comment_count": i % 11,
+        "my_vote": "approve" if i % 2 else None, "viewed": bool(i % 2),
+        "submitted_at": submitted_at, "reviewed_at": None,
+    })
+    return row
+
+
+def _audit_log(i: int, created_at: datetime) -> dict:
+    return {
+        "id": str(uuid.uuid4()), "action": "status_changed", "application_id": str(uuid.uuid4()),
+        "application_name": f"Applicant {i}", "performed_by": "moderator", "comment": "Looks good " * 5,
+        "old_status": "pending", "new_status": "approved", "created_at": created_at,
+    }
+
+
+def response_model_path(adapter: TypeAdapter, rows: list) -> bytes:
+    """What FastAPI does for a route with response_model: validate, dump, json.dumps."""
+    validated = adapter.validate_python(rows)
+    return json.dumps(adapter.dump_python(validated, mode="json"), ensure_ascii=False).encode("utf-8")
+
+
+def plain_dict_path(rows: list) -> bytes:
+    """What FastAPI does for a route returning plain dicts without a response_model."""
+    return json.dumps(jsonable_encoder(rows), ensure_ascii=False).encode("utf-8")
+
+
+def measure(render) -> tuple:
+    timings = []
+    for _ in range(REPETITIONS):
+        started = time.perf_counter()
+        render()
+        timings.append((time.perf_counter() - started) * 1000)
+    tracemalloc.start()
+    body = render()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak / 1024 / 1024, len(body)
+
+
+def _report(label: str, result: tuple):
+    median_ms, peak_mb, size = result
+    print(f"{label:>24}: median {median_ms:8.2f} ms  peak {peak_mb:7.2f} MiB  body {size / 1024:8.1f} KiB")
+
+
+def main(count: int):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    applications = [_application(i, start + timedelta(minutes=i)) for i in range(count)]
+    audit_logs = [_audit_log(i, start + timedelta(minutes=i)) for i in range(count)]
+    adapter = TypeAdapter(List[Application])
+
+    print(f"{count} applications ({len(Application.model_fields)} fields)")
+    _report("response_model", measure(lambda: response_model_path(adapter, applications)))
+    _report("fast path", measure(lambda: dump_rows_json(applications, Application)))
+
+    print(f"\n{count} audit log entries")
+    _report("jsonable_encoder", measure(lambda: plain_dict_path(audit_logs)))
+    _report("fast path", measure(lambda: dump_rows_json(audit_logs)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS)
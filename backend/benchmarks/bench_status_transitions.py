@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Application Status Transition Benchmark
+Counts MongoDB round trips and latency per status change, team approval and
+team unapproval, comparing the legacy read-modify-read handlers against the
+conditional find_one_and_update path used by routes/applications.py.
+
+Runs against a scratch database (never the portal's DB_NAME):
+    MONGO_URL=mongodb://localhost:27017 python benchmarks/bench_status_transitions.py [repetitions]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BENCH_DB_NAME = os.environ.get('BENCH_DB_NAME', 'topwar_transition_bench')
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ["DB_NAME"] = BENCH_DB_NAME
+
+from models.schemas import ApplicationUpdate, TeamApprovalUpdate
+from routes import applications
+from utils.indexes import ensure_indexes
+
+MONGO_URL = os.environ['MONGO_URL']
+DEFAULT_REPETITIONS = 200
+MODERATOR = {"username": "bench_leader", "role": "admin", "roles": ["admin"], "is_admin": True,
+             "is_in_game_leader": True, "is_discord_leader": True}
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts commands sent to the server; each one is a network round trip."""
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+def _application() -> dict:
+    # No email address, so neither path enqueues applicant emails
+    return {
+        "id": str(uuid.uuid4()),
+        "name": "Bench Applicant",
+        "discord_handle": "bench",
+        "ingame_name": "Bench",
+        "position": "Discord",
+        "server": "1",
+        "status": "pending",
+        "discord_approved": False,
+        "in_game_approved": False,
+        "comment_count": 0,
+        "submitted_at": datetime.now(timezone.utc),
+    }
+
+
+def _audit_doc(action: str, app: dict, old_status: str, new_status: str) -> dict:
+    return {
+        "id": str(uuid.uuid4()), "action": action, "application_id": app["id"],
+        "application_name": app.get("name", "Unknown"), "performed_by": MODERATOR["username"],
+        "comment": "bench", "old_status": old_status, "new_status": new_status,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def _comment(application_id: str, text: str) -> dict:
+    return {"id": str(uuid.uuid4()), "application_id": application_id, "moderator": MODERATOR["username"],
+            "comment": text, "timestamp": datetime.now(timezone.utc).isoformat()}
+
+
+async def legacy_status_change(db, application_id: str, status: str):
+    """The original update_application_status: read, update, comment, audit, re-read."""
+    await db.moderators.find_one({"username": MODERATOR["username"]}, {"_id": 0})
+    existing = await db.applications.find_one({"id": application_id}, {"_id": 0})
+    await db.applications.update_one({"id": application_id}, {"$set": {
+        "status": status, "reviewed_at": datetime.now(timezone.utc).isoformat(),
+        "reviewed_by": MODERATOR["username"]}, "$inc": {"comment_count": 1}})
+    await db.application_comments.insert_one(_comment(application_id, f"[STATUS CHANGE] {status}"))
+    await db.audit_logs.insert_one(_audit_doc("status_changed", existing, existing["status"], status))
+    return await db.applications.find_one({"id": application_id}, {"_id": 0, "search_terms": 0})
+
+
+async def legacy_team_approve(db, application_id: str, approved: bool):
+    """The original team_approve_application / team_unapprove_application."""
+    await db.moderators.find_one({"username": MODERATOR["username"]}, {"_id": 0})
+    existing = await db.applications.find_one({"id": application_id}, {"_id": 0})
+    await db.applications.update_one({"id": application_id}, {"$set": {
+        "discord_approved": approved, "discord_approved_by": MODERATOR["username"] if approved else None},
+        "$inc": {"comment_count": 1}})
+    await db.application_comments.insert_one(_comment(application_id, "[DISCORD APPROVED]"))
+    if approved:
+        await db.audit_logs.insert_one(_audit_doc("team_approved", existing, existing["status"], "discord_approved"))
+    return await db.applications.find_one({"id": application_id}, {"_id": 0, "search_terms": 0})
+
+
+async def current_status_change(application_id: str, status: str):
+    return await applications.update_application_status(
+        application_id, ApplicationUpdate(status=status, comment="bench"), current_user=MODERATOR)
+
+
+async def current_team_approve(application_id: str, approved: bool):
+    update = TeamApprovalUpdate(approval_type="discord", comment="bench")
+    if approved:
+        return await applications.team_approve_application(application_id, update, current_user=MODERATOR)
+    return await applications.team_unapprove_application(application_id, update, current_user=MODERATOR)
+
+
+async def measure(counter: CommandCounter, label: str, calls) -> str:
+    timings, trips = [], []
+    for call in calls:
+        before = counter.count
+        started = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - started) * 1000)
+        trips.append(counter.count - before)
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+    return (f"{label:>22}: {statistics.mean(trips):4.1f} round trips  "
+            f"median {statistics.median(ordered):7.2f} ms  p95 {p95:7.2f} ms")
+
+
+async def main(repetitions: int):
+    counter = CommandCounter()
+    client = AsyncIOMotorClient(MONGO_URL, event_listeners=[counter])
+    db = client[BENCH_DB_NAME]
+    # Route the handlers' queries through the counting client
+    applications.db = db
+    try:
+        await client.drop_database(BENCH_DB_NAME)
+        await ensure_indexes(db)
+        await db.moderators.insert_one({"username": MODERATOR["username"], "role": "admin",
+                                        "is_admin": True, "active": True})
+        apps = [_application() for _ in range(repetitions)]
+        await db.applications.insert_many([dict(app) for app in apps])
+        ids = [app["id"] for app in apps]
+        # Warm the moderator cache and the connection pool before timing
+        await current_team_approve(ids[0], True)
+        await current_team_approve(ids[0], False)
+
+        print(f"{repetitions} transitions each\n")
+        print(await measure(counter, "legacy status change",
+                            [lambda i=i: legacy_status_change(db, i, "approved") for i in ids]))
+        print(await measure(counter, "status change",
+                            [lambda i=i: current_status_change(i, "rejected") for i in ids]))
+        print(await measure(counter, "legacy team approve",
+                            [lambda i=i: legacy_team_approve(db, i, True) for i in ids]))
+        await db.applications.update_many({}, {"$set": {"discord_approved": False}})
+        print(await measure(counter, "team approve",
+                            [lambda i=i: current_team_approve(i, True) for i in ids]))
+        print(await measure(counter, "legacy team unapprove",
+                            [lambda i=i: legacy_team_approve(db, i, False) for i in ids]))
+        await db.applications.update_many({}, {"$set": {"discord_approved": True}})
+        print(await measure(counter, "team unapprove",
+                            [lambda i=i: current_team_approve(i, False) for i in ids]))
+    finally:
+        await client.drop_database(BENCH_DB_NAME)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_REPETITIONS))
@@ -1,16 +1,120 @@
 """Database connection module."""
+import asyncio
 import os
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
 from motor.motor_asyncio import AsyncIOMotorClient
 from pathlib import Path
 from dotenv import load_dotenv
 
+from utils.metrics import command_metrics
+from utils.pool_stats import PoolStatsListener
+from utils.slow_queries import slow_query_log
+
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+SUPPORTED_COMPRESSORS = ("zstd", "snappy", "zlib")
+
+
+def _env_int(name: str, default: Optional[int]) -> Optional[int]:
+    """Read an optional integer environment variable."""
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError as exc:
+        raise ValueError(f"{name} must be an integer, got {raw!r}") from exc
+
+
+@dataclass(frozen=True)
+class MongoSettings:
+    """Typed MongoDB client settings, defaulting to the driver's own defaults."""
+    url: str = field(repr=False)
+    db_name: str
+    max_pool_size: int = 100
+    min_pool_size: int = 0
+    max_idle_time_ms: Optional[int] = None
+    wait_queue_timeout_ms: Optional[int] = None
+    server_selection_timeout_ms: int = 30000
+    connect_timeout_ms: int = 20000
+    compressors: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_env(cls) -> "MongoSettings":
+        compressors = tuple(
+            name.strip().lower()
+            for name in os.environ.get('MONGO_COMPRESSORS', '').split(',')
+            if name.strip()
+        )
+        unknown = [name for name in compressors if name not in SUPPORTED_COMPRESSORS]
+        if unknown:
+            raise ValueError(f"MONGO_COMPRESSORS contains unsupported values: {', '.join(unknown)}")
+
+        settings = cls(
+            url=os.environ['MONGO_URL'],
+            db_name=os.environ['DB_NAME'],
+            max_pool_size=_env_int('MONGO_MAX_POOL_SIZE', 100),
+            min_pool_size=_env_int('MONGO_MIN_POOL_SIZE', 0),
+            max_idle_time_ms=_env_int('MONGO_MAX_IDLE_TIME_MS', None),
+            wait_queue_timeout_ms=_env_int('MONGO_WAIT_QUEUE_TIMEOUT_MS', None),
+            server_selection_timeout_ms=_env_int('MONGO_SERVER_SELECTION_TIMEOUT_MS', 30000),
+            connect_timeout_ms=_env_int('MONGO_CONNECT_TIMEOUT_MS', 20000),
+            compressors=compressors,
+        )
+        if settings.min_pool_size > settings.max_pool_size:
+            raise ValueError("MONGO_MIN_POOL_SIZE cannot exceed MONGO_MAX_POOL_SIZE")
+        return settings
+
+    def client_options(self) -> dict:
+        """Keyword arguments for AsyncIOMotorClient."""
+        options = {
+            # Timestamps are stored as BSON dates; read them back as aware UTC datetimes
+            "tz_aware": True,
+            "maxPoolSize": self.max_pool_size,
+            "minPoolSize": self.min_pool_size,
+            "serverSelectionTimeoutMS": self.server_selection_timeout_ms,
+            "connectTimeoutMS": self.connect_timeout_ms,
+        }
+        if self.max_idle_time_ms is not None:
+            options["maxIdleTimeMS"] = self.max_idle_time_ms
+        if self.wait_queue_timeout_ms is not None:
+            options["waitQueueTimeoutMS"] = self.wait_queue_timeout_ms
+        if self.compressors:
+            options["compressors"] = ",".join(self.compressors)
+        return options
+
+    def public_dict(self) -> dict:
+        """Settings safe to expose on admin endpoints (the URL may hold credentials)."""
+        return {
+            "db_name": self.db_name,
+            "max_pool_size": self.max_pool_size,
+            "min_pool_size": self.min_pool_size,
+            "max_idle_time_ms": self.max_idle_time_ms,
+            "wait_queue_timeout_ms": self.wait_queue_timeout_ms,
+            "server_selection_timeout_ms": self.server_selection_timeout_ms,
+            "connect_timeout_ms": self.connect_timeout_ms,
+            "compressors": list(self.compressors),
+        }
+
+
 # MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+mongo_settings = MongoSettings.from_env()
+pool_stats = PoolStatsListener()
+client = AsyncIOMotorClient(
+    mongo_settings.url,
+    event_listeners=[pool_stats, command_metrics, slow_query_log],
+    **mongo_settings.client_options()
+)
+db = client[mongo_settings.db_name]
+
+async def warm_pool(connections: int) -> int:
+    """Open up to ``connections`` pooled connections by pinging concurrently; returns how many pings ran."""
+    connections = max(1, min(connections, mongo_settings.max_pool_size))
+    await asyncio.gather(*(client.admin.command("ping") for _ in range(connections)))
+    return connections
+
 
 async def close_db_connection():
     """Close the database connection."""
@@ -61,14 +61,42 @@ class Application(BaseModel):
     in_game_approved: bool = False
     discord_approved_by: Optional[str] = None
     in_game_approved_by: Optional[str] = None
-    votes: List[Dict] = Field(default_factory=list)
-    comments: List[Dict] = Field(default_factory=list)
-    viewed_by: List[str] = Field(default_factory=list)
+    # Tallies maintained with $inc; the threads live in application_votes / application_comments
+    approve_votes: int = 0
+    reject_votes: int = 0
+    comment_count: int = 0
+    my_vote: Optional[str] = None  # The requesting moderator's vote; not stored
+    viewed: bool = False  # Whether the requesting moderator has opened it; not stored
     submitted_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     reviewed_at: Optional[datetime] = None
     reviewed_by: Optional[str] = None
 
 
+class ApplicationSummary(BaseModel):
+    """Lightweight row for application list views; the full document is served by GET /applications/{id}."""
+    model_config = ConfigDict(extra="ignore")
+    
+    id: str
+    name: str
+    discord_handle: str
+    ingame_name: str
+    position: str
+    server: str
+    status: str = "awaiting_review"
+    discord_approved: bool = False
+    in_game_approved: bool = False
+    discord_approved_by: Optional[str] = None
+    in_game_approved_by: Optional[str] = None
+    approve_votes: int = 0
+    reject_votes: int = 0
+    comment_count: int = 0
+    my_vote: Optional[str] = None  # The requesting moderator's vote, if any
+    viewed: bool = False  # Whether the requesting moderator has opened it
+    submitted_at: datetime
+    reviewed_at: Optional[datetime] = None
+    reviewed_by: Optional[str] = None
+
+
 class ApplicationCreate(BaseModel):
     name: str
     email: str
@@ -136,6 +164,26 @@ class CommentCreate(BaseModel):
     comment: str
 
 
+class ApplicationVote(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    
+    id: str
+    application_id: str
+    moderator: str
+    vote: str
+    timestamp: datetime
+
+
+class ApplicationComment(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    application_id: str
+    moderator: str
+    comment: str
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
 # ============= Moderator Models =============
 
 class Moderator(BaseModel):
@@ -335,7 +383,7 @@ class AuditLog(BaseModel):
 
 class PollOption(BaseModel):
     text: str
-    votes: List[str] = Field(default_factory=list)
+    vote_count: int = 0
 
 
 class Poll(BaseModel):
@@ -345,11 +393,11 @@ class Poll(BaseModel):
     question: str
     options: List[Dict] = Field(default_factory=list)
     show_voters: bool = False
+    total_votes: int = 0
     created_by: str
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     expires_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc) + timedelta(days=7))
     is_active: bool = True
-    viewed_by: List[str] = Field(default_factory=list)
 
 
 class PollCreate(BaseModel):
@@ -376,7 +424,7 @@ class EasterEggPage(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     page_key: str  # e.g., "troll", "valentine", "developer", "garuda"
     username: str
-    password: str
+    password_hash: str  # see utils.egg_credentials
     title: str
     content: Dict = Field(default_factory=dict)  # Flexible content storage
     is_active: bool = True
@@ -0,0 +1,116 @@
+"""Administrative diagnostics routes."""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Response
+
+from database import db, mongo_settings, pool_stats
+from utils.announcement_cache import announcement_feed
+from utils.auth import password_hasher, require_admin_role
+from utils.collection_versions import collection_versions
+from utils.config_cache import application_settings_cache
+from utils.date_backfill import date_backfill
+from utils.egg_credentials import easter_egg_cache, easter_egg_throttle
+from utils.events import event_broker
+from utils.indexes import ensure_indexes, index_coverage_report
+from utils.metrics import PROMETHEUS_CONTENT_TYPE, render_prometheus
+from utils.moderator_cache import moderator_cache
+from utils.outbox import outbox_worker
+from utils.poll_scheduler import poll_expiry_scheduler
+from utils.slow_queries import SLOW_QUERIES_COLLECTION, slow_query_log
+from utils.startup import startup_report
+from utils.view_buffer import application_view_buffer
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+@router.get("/indexes/report")
+async def get_index_report(current_user: dict = Depends(require_admin_role)):
+    """Explain each route's canonical query and flag any that need a collection scan (admin only)."""
+    report = await index_coverage_report(db)
+    flagged = [entry["route"] for entry in report if entry.get("collscan")]
+    return {"collscan_count": len(flagged), "collscan_routes": flagged, "queries": report}
+
+
+@router.post("/indexes/reconcile")
+async def reconcile_indexes(current_user: dict = Depends(require_admin_role)):
+    """Re-run index reconciliation without restarting the API (admin only)."""
+    return await ensure_indexes(db)
+
+
+@router.get("/db/pool")
+async def get_pool_stats(current_user: dict = Depends(require_admin_role)):
+    """Connection pool settings plus live checkout, in-use and churn statistics (admin only)."""
+    return {"settings": mongo_settings.public_dict(), **pool_stats.snapshot()}
+
+
+@router.get("/metrics")
+async def get_metrics(current_user: dict = Depends(require_admin_role)):
+    """Per-route latency histograms, in-flight requests and MongoDB command metrics in Prometheus text format (admin only)."""
+    return Response(content=render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@router.get("/slow-queries")
+async def get_slow_queries(
+    limit: int = Query(100, ge=1, le=1000),
+    collection: Optional[str] = None,
+    current_user: dict = Depends(require_admin_role)
+):
+    """Most recent MongoDB commands over the slow query threshold, with redacted shapes and plans (admin only)."""
+    query = {"collection": collection} if collection else {}
+    cursor = db[SLOW_QUERIES_COLLECTION].find(query, {"_id": 0}).sort("$natural", -1).limit(limit)
+    return {**slow_query_log.stats(), "entries": await cursor.to_list(limit)}
+
+
+@router.get("/caches")
+async def get_cache_stats(current_user: dict = Depends(require_admin_role)):
+    """Hit, miss and eviction counters for this worker's in-process caches (admin only)."""
+    return {
+        "moderators": moderator_cache.stats(),
+        "announcements": announcement_feed.stats(),
+        "collection_versions": collection_versions.stats(),
+        "application_settings": application_settings_cache.stats(),
+        "easter_eggs": easter_egg_cache.stats(),
+        "easter_egg_throttle": easter_egg_throttle.stats(),
+    }
+
+
+@router.get("/startup")
+async def get_startup_report(current_user: dict = Depends(require_admin_role)):
+    """Duration of each startup phase of this worker and when it became ready (admin only)."""
+    return startup_report.stats()
+
+
+@router.get("/hashing")
+async def get_hashing_stats(current_user: dict = Depends(require_admin_role)):
+    """Password hashing pool concurrency, queue depth and timing (admin only)."""
+    return password_hasher.stats()
+
+
+@router.get("/email/outbox")
+async def get_outbox_stats(current_user: dict = Depends(require_admin_role)):
+    """Email outbox queue depth by status and this worker's delivery counters (admin only)."""
+    return await outbox_worker.stats()
+
+
+@router.get("/polls/scheduler")
+async def get_poll_scheduler_stats(current_user: dict = Depends(require_admin_role)):
+    """Poll expiry scheduler leadership, next planned wake-up and sweep counters (admin only)."""
+    return await poll_expiry_scheduler.stats()
+
+
+@router.get("/events")
+async def get_event_stats(current_user: dict = Depends(require_admin_role)):
+    """Connected event stream subscribers, queue depth and relay counters for this worker (admin only)."""
+    return event_broker.stats()
+
+
+@router.get("/applications/views")
+async def get_application_view_stats(current_user: dict = Depends(require_admin_role)):
+    """Buffered application views awaiting a flush and flush counters for this worker (admin only)."""
+    return application_view_buffer.stats()
+
+
+@router.get("/migrations/dates")
+async def get_date_backfill_stats(current_user: dict = Depends(require_admin_role)):
+    """Progress of the ISO-string to BSON date backfill on this worker (admin only)."""
+    return date_backfill.stats()
@@ -1,19 +1,23 @@
 """Announcement routes."""
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from typing import List
 
 from database import db
 from models.schemas import Announcement, AnnouncementCreate
+from utils.announcement_cache import announcement_feed
 from utils.auth import get_current_moderator
+from utils.collection_versions import cache_headers, collection_versions, conditional_get
+from utils.events import event_broker
 
 router = APIRouter(prefix="/announcements", tags=["Announcements"])
 
 
 @router.get("")
-async def get_announcements():
+async def get_announcements(etag: str = Depends(conditional_get("announcements"))):
     """Get all active announcements - accessible to everyone."""
-    announcements = await db.announcements.find({"is_active": True}, {"_id": 0}).sort("created_at", -1).to_list(100)
-    return announcements
+    # Served from this worker's pre-serialized copy; no database work on a hit
+    return Response(content=await announcement_feed.get(), media_type="application/json",
+                    headers=cache_headers(etag))
 
 
 @router.get("/all")
@@ -78,6 +82,9 @@ async def create_announcement(announcement: AnnouncementCreate, current_user: di
         created_by=current_user["username"]
     )
     await db.announcements.insert_one(new_announcement.model_dump())
+    announcement_feed.invalidate()
+    await collection_versions.bump("announcements")
+    await event_broker.publish("announcement.created", {"id": new_announcement.id})
     return {"message": "Announcement created successfully", "id": new_announcement.id}
 
 
@@ -90,6 +97,9 @@ async def delete_announcement(announcement_id: str, current_user: dict = Depends
     result = await db.announcements.delete_one({"id": announcement_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Announcement not found")
+    announcement_feed.invalidate()
+    await collection_versions.bump("announcements")
+    await event_broker.publish("announcement.deleted", {"id": announcement_id})
     return {"message": "Announcement deleted successfully"}
 
 
@@ -105,4 +115,7 @@ async def toggle_announcement(announcement_id: str, current_user: dict = Depends
     
     new_status = not announcement.get("is_active", True)
     await db.announcements.update_one({"id": announcement_id}, {"$set": {"is_active": new_status}})
+    announcement_feed.invalidate()
+    await collection_versions.bump("announcements")
+    await event_broker.publish("announcement.toggled", {"id": announcement_id, "is_active": new_status})
     return {"message": f"Announcement {'activated' if new_status else 'deactivated'} successfully"}
@@ -1,14 +1,26 @@
 """Application management routes."""
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from typing import Annotated, List, Literal, Optional, Union
+from pydantic import Field
 from datetime import datetime, timezone
+import asyncio
+import uuid
+from pymongo import ReturnDocument, UpdateOne
 
 from database import db
 from models.schemas import (
-    Application, ApplicationCreate, ApplicationUpdate, TeamApprovalUpdate,
-    VoteCreate, CommentCreate, AuditLog, ApplicationSettings, ApplicationSettingsUpdate
+    Application, ApplicationSummary, ApplicationCreate, ApplicationUpdate, TeamApprovalUpdate,
+    VoteCreate, CommentCreate, ApplicationVote, ApplicationComment, AuditLog, ApplicationSettings,
+    ApplicationSettingsUpdate
 )
 from utils.auth import get_current_moderator, require_admin, has_any_role
+from utils.collection_versions import collection_versions, conditional_get
+from utils.config_cache import application_settings_cache
+from utils.moderator_cache import moderator_cache
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, encode_cursor, keyset_filter
+from utils.responses import fast_json_response
+from utils.search import SEARCH_CANDIDATE_LIMIT, build_search_filter, build_search_terms, rank_applications
+from utils.view_buffer import application_view_buffer, unviewed_application_count, viewed_application_ids
 from utils.email import (
     send_application_confirmation_email,
     send_application_approved_email,
@@ -19,6 +31,92 @@ from utils.email import (
 
 router = APIRouter(prefix="/applications", tags=["Applications"])
 
+# Internal fields never returned to clients
+APPLICATION_PROJECTION = {"_id": 0, "search_terms": 0}
+
+# Plain fields copied into list-view summaries
+SUMMARY_FIELDS = (
+    "id", "name", "discord_handle", "ingame_name", "position", "server", "status",
+    "discord_approved", "in_game_approved", "discord_approved_by", "in_game_approved_by",
+    "approve_votes", "reject_votes", "comment_count",
+    "submitted_at", "reviewed_at", "reviewed_by",
+)
+SUMMARY_PROJECTION = {"_id": 0, **{field: 1 for field in SUMMARY_FIELDS}}
+
+# Vote value -> tally field on the application
+VOTE_COUNTERS = {"approve": "approve_votes", "reject": "reject_votes"}
+
+APPLICATION_STATUSES = (
+    "awaiting_review", "pending", "waiting", "in_game_approved", "discord_approved", "approved", "rejected",
+)
+
+# Team approval type -> (flag, approved-by field, label)
+TEAM_APPROVALS = {
+    "discord": ("discord_approved", "discord_approved_by", "DISCORD"),
+    "in_game": ("in_game_approved", "in_game_approved_by", "IN-GAME"),
+}
+
+# Full documents are tried first: a full document would also validate as a summary
+ApplicationListResponse = Annotated[
+    Union[List[Application], List[ApplicationSummary]],
+    Field(union_mode="left_to_right")
+]
+
+
+async def attach_moderator_state(applications: list, username: str):
+    """Set the requesting moderator's vote and viewed flag on each application."""
+    application_ids = [app["id"] for app in applications]
+    if not application_ids:
+        return
+    votes = await db.application_votes.find(
+        {"application_id": {"$in": application_ids}, "moderator": username},
+        {"_id": 0, "application_id": 1, "vote": 1}
+    ).to_list(None)
+    my_votes = {vote["application_id"]: vote["vote"] for vote in votes}
+    viewed = await viewed_application_ids(username, application_ids)
+    for app in applications:
+        app['my_vote'] = my_votes.get(app["id"])
+        app['viewed'] = app["id"] in viewed
+
+
+async def add_application_comment(application_id: str, moderator: str, text: str) -> dict:
+    """Store a comment in the application's thread; the caller maintains comment_count."""
+    comment = ApplicationComment(application_id=application_id, moderator=moderator, comment=text).model_dump()
+    await db.application_comments.insert_one(comment)
+    comment.pop('_id', None)
+    return comment
+
+
+def build_audit_doc(**fields) -> dict:
+    """Audit log document ready for insertion."""
+    return AuditLog(**fields).model_dump()
+
+
+async def unchanged_application(application_id: str) -> dict:
+    """The application as it is, when the requested change is already in effect; 404 if it is gone.
+
+    Only called after a conditional update matched nothing, so the happy path
+    never pays for this extra read. Repeating a change (a double click, a
+    retry) succeeds without another comment, audit log entry or email.
+    """
+    application = await db.applications.find_one({"id": application_id}, APPLICATION_PROJECTION)
+    if not application:
+        raise HTTPException(status_code=404, detail="Application not found")
+    return application
+
+
+async def require_team_leader(username: str, approval_type: str, action: str):
+    """Only the matching team leader (or an admin) may give or remove a team approval."""
+    moderator = await moderator_cache.get(username)
+    if not moderator:
+        raise HTTPException(status_code=404, detail="Moderator not found")
+    is_admin = moderator.get("is_admin", False)
+    if approval_type == "discord" and not moderator.get("is_discord_leader", False) and not is_admin:
+        raise HTTPException(status_code=403, detail=f"Only Discord Leaders can {action} Discord approval")
+    if approval_type == "in_game" and not moderator.get("is_in_game_leader", False) and not is_admin:
+        raise HTTPException(status_code=403, detail=f"Only In-Game Leaders can {action} In-Game approval")
+
+
 async def require_application_status_manager(current_user: dict = Depends(get_current_moderator)):
     """Allow elevated moderators and leader-permission users to change application statuses."""
     allowed_roles = {"admin", "mmod"}
@@ -29,26 +127,95 @@ async def require_application_status_manager(current_user: dict = Depends(get_cu
 
 
 
-def convert_application_timestamps(app: dict) -> dict:
-    """Convert ISO string timestamps to datetime objects."""
-    if isinstance(app.get('submitted_at'), str):
-        app['submitted_at'] = datetime.fromisoformat(app['submitted_at'])
-    if app.get('reviewed_at') and isinstance(app['reviewed_at'], str):
-        app['reviewed_at'] = datetime.fromisoformat(app['reviewed_at'])
-    for vote in app.get('votes', []):
-        if isinstance(vote.get('timestamp'), str):
-            vote['timestamp'] = datetime.fromisoformat(vote['timestamp'])
-    for comment in app.get('comments', []):
-        if isinstance(comment.get('timestamp'), str):
-            comment['timestamp'] = datetime.fromisoformat(comment['timestamp'])
-    return app
+def submitted_range_filter(after: Optional[datetime], before: Optional[datetime]) -> dict:
+    """Filter on submitted_at within [after, before); empty when neither bound is given."""
+    bounds = {}
+    if after is not None:
+        bounds["$gte"] = after
+    if before is not None:
+        bounds["$lt"] = before
+    return {"submitted_at": bounds} if bounds else {}
+
+
+async def migrate_embedded_application_views() -> int:
+    """Move viewed_by arrays embedded in applications into application_views.
+
+    Views are upserted before the array is removed, so an interrupted
+    migration picks the remaining applications up on next start.
+    """
+    applications = await db.applications.find(
+        {"viewed_by": {"$exists": True}}, {"_id": 0, "id": 1, "viewed_by": 1, "submitted_at": 1}
+    ).to_list(None)
+    if not applications:
+        return 0
+
+    view_writes = [
+        UpdateOne(
+            {"application_id": app["id"], "username": username},
+            {"$setOnInsert": {"viewed_at": app.get("submitted_at")}},
+            upsert=True
+        )
+        for app in applications
+        for username in app.get("viewed_by", [])
+    ]
+    if view_writes:
+        await db.application_views.bulk_write(view_writes, ordered=False)
+    await db.applications.update_many(
+        {"id": {"$in": [app["id"] for app in applications]}}, {"$unset": {"viewed_by": ""}}
+    )
+    return len(applications)
+
+
+async def migrate_embedded_application_threads() -> int:
+    """Move votes and comments embedded in applications into their side collections.
+
+    Thread records are upserted before the arrays are replaced by tallies, so
+    an interrupted migration picks the remaining applications up on next start.
+    """
+    applications = await db.applications.find(
+        {"$or": [{"votes": {"$exists": True}}, {"comments": {"$exists": True}}]},
+        {"_id": 0, "id": 1, "votes": 1, "comments": 1}
+    ).to_list(None)
+    if not applications:
+        return 0
+
+    vote_writes, comment_writes, application_writes = [], [], []
+    for app in applications:
+        latest_votes = {}
+        for vote in app.get("votes", []):
+            latest_votes[vote["moderator"]] = vote
+        for moderator, vote in latest_votes.items():
+            vote_writes.append(UpdateOne(
+                {"application_id": app["id"], "moderator": moderator},
+                {"$setOnInsert": {"id": str(uuid.uuid4()), "vote": vote["vote"], "timestamp": vote.get("timestamp")}},
+                upsert=True
+            ))
+        for comment in app.get("comments", []):
+            comment_writes.append(UpdateOne(
+                {"application_id": app["id"], "moderator": comment["moderator"], "timestamp": comment.get("timestamp")},
+                {"$setOnInsert": {"id": str(uuid.uuid4()), "comment": comment["comment"]}},
+                upsert=True
+            ))
+        tallies = {counter: sum(1 for vote in latest_votes.values() if vote["vote"] == value)
+                   for value, counter in VOTE_COUNTERS.items()}
+        tallies["comment_count"] = len(app.get("comments", []))
+        application_writes.append(UpdateOne(
+            {"id": app["id"]}, {"$set": tallies, "$unset": {"votes": "", "comments": ""}}
+        ))
+
+    if vote_writes:
+        await db.application_votes.bulk_write(vote_writes, ordered=False)
+    if comment_writes:
+        await db.application_comments.bulk_write(comment_writes, ordered=False)
+    await db.applications.bulk_write(application_writes, ordered=False)
+    return len(application_writes)
 
 
 @router.post("", response_model=Application)
-async def submit_application(app_data: ApplicationCreate, background_tasks: BackgroundTasks):
+async def submit_application(app_data: ApplicationCreate):
     """Submit a new application."""
     # Check if applications are enabled
-    settings = await db.application_settings.find_one({"id": "app_settings"}, {"_id": 0})
+    settings = await application_settings_cache.get("app_settings")
     if settings and not settings.get("applications_enabled", True):
         raise HTTPException(
             status_code=403, 
@@ -56,73 +223,103 @@ async def submit_application(app_data: ApplicationCreate, background_tasks: Back
         )
     
     app_obj = Application(**app_data.model_dump())
-    doc = app_obj.model_dump()
-    doc['submitted_at'] = doc['submitted_at'].isoformat()
+    doc = app_obj.model_dump(exclude={"my_vote", "viewed"})
+    doc['search_terms'] = build_search_terms(doc)
     
     await db.applications.insert_one(doc)
     
-    # Send confirmation email in background
-    background_tasks.add_task(send_application_confirmation_email, app_data.email, app_data.name)
+    # Queue confirmation email in the outbox
+    await send_application_confirmation_email(app_data.email, app_data.name)
     
     return app_obj
 
 
-@router.get("", response_model=List[Application])
-async def get_applications(search: Optional[str] = None, current_user: dict = Depends(get_current_moderator)):
-    """Get all applications."""
+@router.get("", response_model=ApplicationListResponse)
+async def get_applications(
+    search: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    view: Literal["full", "summary"] = "full",
+    submitted_after: Optional[datetime] = None,
+    submitted_before: Optional[datetime] = None,
+    current_user: dict = Depends(get_current_moderator)
+):
+    """Get applications, newest first, one keyset page at a time.
+
+    When more rows exist, the opaque cursor for the next page is returned in the
+    X-Next-Cursor response header; pass it back as ``cursor`` to continue.
+    A ``search`` returns the ``limit`` most relevant prefix matches instead and
+    is not paginated. ``view=summary`` returns ApplicationSummary rows without
+    the free-text answers, votes, comments or viewers. ``submitted_after`` and
+    ``submitted_before`` restrict either mode to a submission date range.
+    """
     # Check if user can view applications
-    moderator = await db.moderators.find_one({"username": current_user['username']}, {"_id": 0})
+    moderator = await moderator_cache.get(current_user['username'])
     if moderator and not moderator.get('can_view_applications', True):
         raise HTTPException(status_code=403, detail="You do not have permission to view applications")
     
     # Check if user is training manager (for name visibility)
     is_training_manager = moderator.get('is_training_manager', False) if moderator else False
     
-    query = {}
-    if search:
-        query = {
-            "$or": [
-                {"name": {"$regex": search, "$options": "i"}},
-                {"discord_handle": {"$regex": search, "$options": "i"}},
-                {"ingame_name": {"$regex": search, "$options": "i"}},
-                {"server": {"$regex": search, "$options": "i"}}
-            ]
-        }
+    projection = SUMMARY_PROJECTION if view == "summary" else APPLICATION_PROJECTION
+    date_filter = submitted_range_filter(submitted_after, submitted_before)
     
-    applications = await db.applications.find(query, {"_id": 0}).sort("submitted_at", -1).to_list(1000)
+    headers = {}
+    if search:
+        search_filter = build_search_filter(search)
+        if not search_filter:
+            # Nothing searchable in the input (e.g. only punctuation)
+            return []
+        candidates = await db.applications.find({**search_filter, **date_filter}, projection).sort(
+            [("submitted_at", -1), ("id", -1)]
+        ).limit(SEARCH_CANDIDATE_LIMIT).to_list(SEARCH_CANDIDATE_LIMIT)
+        applications = rank_applications(candidates, search)[:limit]
+    else:
+        # Fetch one extra row to learn whether another page follows
+        query = {**keyset_filter("submitted_at", cursor), **date_filter}
+        applications = await db.applications.find(query, projection).sort(
+            [("submitted_at", -1), ("id", -1)]
+        ).limit(limit + 1).to_list(limit + 1)
+        
+        if len(applications) > limit:
+            applications = applications[:limit]
+            last = applications[-1]
+            headers["X-Next-Cursor"] = encode_cursor(last["submitted_at"], last["id"])
     
+    await attach_moderator_state(applications, current_user['username'])
     for app in applications:
-        convert_application_timestamps(app)
         # Hide real name if not training manager
         if not is_training_manager:
             app['name'] = "[Hidden - Training Manager Only]"
     
-    return applications
+    # Rows already have the response shape; encode them without re-validation
+    return fast_json_response(applications, ApplicationSummary if view == "summary" else Application, headers=headers)
+
+
+@router.get("/unviewed-count")
+async def get_unviewed_count(current_user: dict = Depends(get_current_moderator)):
+    """Number of applications the current moderator has not opened yet."""
+    return {"count": await unviewed_application_count(current_user['username'])}
 
 
 @router.get("/{application_id}", response_model=Application)
 async def get_application(application_id: str, current_user: dict = Depends(get_current_moderator)):
     """Get a specific application."""
-    application = await db.applications.find_one({"id": application_id}, {"_id": 0})
+    application = await db.applications.find_one({"id": application_id}, APPLICATION_PROJECTION)
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
     
     # Check if user is training manager (for name visibility)
-    moderator = await db.moderators.find_one({"username": current_user['username']}, {"_id": 0})
+    moderator = await moderator_cache.get(current_user['username'])
     is_training_manager = moderator.get('is_training_manager', False) if moderator else False
     
-    # Track view
-    username = current_user['username']
-    if username not in application.get('viewed_by', []):
-        await db.applications.update_one(
-            {"id": application_id},
-            {"$addToSet": {"viewed_by": username}}
-        )
-        if 'viewed_by' not in application:
-            application['viewed_by'] = []
-        application['viewed_by'].append(username)
-    
-    convert_application_timestamps(application)
+    # Track the view in the write-behind buffer rather than writing on this read
+    application_view_buffer.record(application_id, current_user['username'])
+    my_vote = await db.application_votes.find_one(
+        {"application_id": application_id, "moderator": current_user['username']}, {"_id": 0, "vote": 1}
+    )
+    application['my_vote'] = my_vote["vote"] if my_vote else None
+    application['viewed'] = True
     
     # Hide real name and email if not training manager
     if not is_training_manager:
@@ -135,133 +332,161 @@ async def get_application(application_id: str, current_user: dict = Depends(get_
 @router.post("/{application_id}/vote")
 async def vote_on_application(application_id: str, vote_data: VoteCreate, current_user: dict = Depends(get_current_moderator)):
     """Vote on an application."""
-    if vote_data.vote not in ["approve", "reject"]:
+    if vote_data.vote not in VOTE_COUNTERS:
         raise HTTPException(status_code=400, detail="Vote must be 'approve' or 'reject'")
     
-    application = await db.applications.find_one({"id": application_id}, {"_id": 0})
+    # Upsert the moderator's vote, getting the previous one back to adjust the tallies
+    previous = await db.application_votes.find_one_and_update(
+        {"application_id": application_id, "moderator": current_user['username']},
+        {
+            "$set": {"vote": vote_data.vote, "timestamp": datetime.now(timezone.utc)},
+            "$setOnInsert": {"id": str(uuid.uuid4())}
+        },
+        projection={"_id": 0, "vote": 1},
+        upsert=True,
+        return_document=ReturnDocument.BEFORE
+    )
+    previous_vote = previous["vote"] if previous else None
+    
+    counters = {}
+    if previous_vote != vote_data.vote:
+        counters[VOTE_COUNTERS[vote_data.vote]] = 1
+        if previous_vote in VOTE_COUNTERS:
+            counters[VOTE_COUNTERS[previous_vote]] = -1
+    
+    if counters:
+        application = await db.applications.find_one_and_update(
+            {"id": application_id}, {"$inc": counters}, projection={"_id": 0, "status": 1}
+        )
+    else:
+        application = await db.applications.find_one({"id": application_id}, {"_id": 0, "status": 1})
     if not application:
+        if previous is None:
+            await db.application_votes.delete_one({"application_id": application_id, "moderator": current_user['username']})
         raise HTTPException(status_code=404, detail="Application not found")
     
-    votes = application.get('votes', [])
-    existing_vote = next((v for v in votes if v['moderator'] == current_user['username']), None)
-    
     # Change status from awaiting_review to pending when first vote is cast
-    update_fields = {}
     if application.get('status') == 'awaiting_review':
-        update_fields['status'] = 'pending'
-    
-    if existing_vote:
         await db.applications.update_one(
-            {"id": application_id, "votes.moderator": current_user['username']},
-            {"$set": {
-                "votes.$.vote": vote_data.vote,
-                "votes.$.timestamp": datetime.now(timezone.utc).isoformat(),
-                **update_fields
-            }}
+            {"id": application_id, "status": "awaiting_review"},
+            {"$set": {"status": "pending"}}
         )
-    else:
-        vote = {
-            "moderator": current_user['username'],
-            "vote": vote_data.vote,
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        }
-        update_query = {"$push": {"votes": vote}}
-        if update_fields:
-            update_query["$set"] = update_fields
-        
-        await db.applications.update_one({"id": application_id}, update_query)
     
     return {"message": "Vote recorded successfully"}
 
 
+@router.get("/{application_id}/votes", response_model=List[ApplicationVote])
+async def get_application_votes(
+    application_id: str,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_moderator)
+):
+    """Get an application's votes, oldest first, one keyset page at a time (see X-Next-Cursor)."""
+    return await _thread_page(db.application_votes, application_id, response, limit, cursor)
+
+
 @router.post("/{application_id}/comment")
 async def comment_on_application(application_id: str, comment_data: CommentCreate, current_user: dict = Depends(get_current_moderator)):
     """Add a comment to an application."""
-    application = await db.applications.find_one({"id": application_id}, {"_id": 0})
+    application = await db.applications.find_one_and_update(
+        {"id": application_id}, {"$inc": {"comment_count": 1}}, projection={"_id": 0, "id": 1}
+    )
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
     
-    comment = {
-        "moderator": current_user['username'],
-        "comment": comment_data.comment,
-        "timestamp": datetime.now(timezone.utc).isoformat()
-    }
-    await db.applications.update_one(
-        {"id": application_id},
-        {"$push": {"comments": comment}}
-    )
-    
+    comment = await add_application_comment(application_id, current_user['username'], comment_data.comment)
     return {"message": "Comment added successfully", "comment": comment}
 
 
+@router.get("/{application_id}/comments", response_model=List[ApplicationComment])
+async def get_application_comments(
+    application_id: str,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_moderator)
+):
+    """Get an application's comments, oldest first, one keyset page at a time (see X-Next-Cursor)."""
+    return await _thread_page(db.application_comments, application_id, response, limit, cursor)
+
+
+async def _thread_page(collection, application_id: str, response: Response, limit: int, cursor: Optional[str]) -> list:
+    query = {"application_id": application_id, **keyset_filter("timestamp", cursor, ascending=True)}
+    rows = await collection.find(query, {"_id": 0}).sort(
+        [("timestamp", 1), ("id", 1)]
+    ).limit(limit + 1).to_list(limit + 1)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1]["timestamp"], rows[-1]["id"])
+    return rows
+
+
 @router.patch("/{application_id}", response_model=Application)
-async def update_application_status(application_id: str, update: ApplicationUpdate, background_tasks: BackgroundTasks, current_user: dict = Depends(require_application_status_manager)):
+async def update_application_status(application_id: str, update: ApplicationUpdate, current_user: dict = Depends(require_application_status_manager)):
     """Update application status."""
-    if update.status not in ["approved", "rejected", "pending", "awaiting_review", "waiting", "in_game_approved", "discord_approved"]:
+    if update.status not in APPLICATION_STATUSES:
         raise HTTPException(status_code=400, detail="Status must be 'approved', 'rejected', 'pending', 'awaiting_review', 'waiting', 'in_game_approved', or 'discord_approved'")
     
     if not update.comment or not update.comment.strip():
         raise HTTPException(status_code=400, detail="A comment is required when changing application status")
     
-    existing_app = await db.applications.find_one({"id": application_id}, {"_id": 0})
-    if not existing_app:
-        raise HTTPException(status_code=404, detail="Application not found")
-    
-    old_status = existing_app.get('status', 'awaiting_review')
-    
-    await db.applications.update_one(
-        {"id": application_id},
-        {"$set": {
-            "status": update.status,
-            "reviewed_at": datetime.now(timezone.utc).isoformat(),
-            "reviewed_by": current_user['username']
-        }}
-    )
-    
-    # Add status change comment
-    comment = {
-        "moderator": current_user['username'],
-        "comment": f"[STATUS CHANGE: {old_status.upper()} → {update.status.upper()}] {update.comment}",
-        "timestamp": datetime.now(timezone.utc).isoformat()
+    changes = {
+        "status": update.status,
+        "reviewed_at": datetime.now(timezone.utc),
+        "reviewed_by": current_user['username']
     }
-    await db.applications.update_one(
+    # The pre-image is returned because the old status drives the comment,
+    # audit log and email; the post-image is rebuilt from it without another
+    # read. Re-applying the current status still records the moderator's
+    # comment and audit entry, but the applicant is only emailed on a change.
+    existing_app = await db.applications.find_one_and_update(
         {"id": application_id},
-        {"$push": {"comments": comment}}
+        {"$set": changes, "$inc": {"comment_count": 1}},
+        projection=APPLICATION_PROJECTION,
+        return_document=ReturnDocument.BEFORE
     )
+    if not existing_app:
+        raise HTTPException(status_code=404, detail="Application not found")
     
-    # Create audit log
-    audit_log = AuditLog(
-        action="status_changed",
-        application_id=application_id,
-        application_name=existing_app.get('name', 'Unknown'),
-        performed_by=current_user['username'],
-        comment=update.comment,
-        old_status=old_status,
-        new_status=update.status
-    )
-    audit_doc = audit_log.model_dump()
-    audit_doc['created_at'] = audit_doc['created_at'].isoformat()
-    await db.audit_logs.insert_one(audit_doc)
+    old_status = existing_app.get('status', 'awaiting_review')
+    application = {**existing_app, **changes, "comment_count": existing_app.get("comment_count", 0) + 1}
+    
+    writes = [
+        add_application_comment(
+            application_id, current_user['username'],
+            f"[STATUS CHANGE: {old_status.upper()} → {update.status.upper()}] {update.comment}"
+        ),
+        db.audit_logs.insert_one(build_audit_doc(
+            action="status_changed",
+            application_id=application_id,
+            application_name=existing_app.get('name', 'Unknown'),
+            performed_by=current_user['username'],
+            comment=update.comment,
+            old_status=old_status,
+            new_status=update.status
+        )),
+    ]
     
     # Send email notification
     applicant_email = existing_app.get('email')
     applicant_name = existing_app.get('name', 'Applicant')
-    if applicant_email:
+    if applicant_email and old_status != update.status:
         if update.status == "approved":
             # Check if coming from waiting list
             if old_status == "waiting":
-                background_tasks.add_task(send_application_waitlist_to_approved_email, applicant_email, applicant_name, update.comment)
+                writes.append(send_application_waitlist_to_approved_email(applicant_email, applicant_name, update.comment))
             else:
                 # Include the manager's comment in the approval email
-                background_tasks.add_task(send_application_approved_email, applicant_email, applicant_name, update.comment)
+                writes.append(send_application_approved_email(applicant_email, applicant_name, update.comment))
         elif update.status == "rejected":
-            background_tasks.add_task(send_application_rejected_email, applicant_email, applicant_name, update.comment)
+            writes.append(send_application_rejected_email(applicant_email, applicant_name, update.comment))
         elif update.status == "waiting":
-            background_tasks.add_task(send_application_waitlist_email, applicant_email, applicant_name)
+            writes.append(send_application_waitlist_email(applicant_email, applicant_name))
     
-    # Get updated application
-    application = await db.applications.find_one({"id": application_id}, {"_id": 0})
-    convert_application_timestamps(application)
+    # Comment, audit log and email outbox inserts are independent; pipeline them
+    await asyncio.gather(*writes)
     
     return application
 
@@ -269,74 +494,38 @@ async def update_application_status(application_id: str, update: ApplicationUpda
 @router.post("/{application_id}/team-approve")
 async def team_approve_application(application_id: str, update: TeamApprovalUpdate, current_user: dict = Depends(get_current_moderator)):
     """Discord or In-Game leader approves an application for their team."""
-    if update.approval_type not in ["discord", "in_game"]:
+    if update.approval_type not in TEAM_APPROVALS:
         raise HTTPException(status_code=400, detail="approval_type must be 'discord' or 'in_game'")
     
     if not update.comment or not update.comment.strip():
         raise HTTPException(status_code=400, detail="A comment is required when approving")
     
-    # Check permissions
-    moderator = await db.moderators.find_one({"username": current_user['username']}, {"_id": 0})
-    if not moderator:
-        raise HTTPException(status_code=404, detail="Moderator not found")
-    
-    is_discord_leader = moderator.get("is_discord_leader", False)
-    is_in_game_leader = moderator.get("is_in_game_leader", False)
-    is_admin = moderator.get("is_admin", False)
-    
-    if update.approval_type == "discord" and not is_discord_leader and not is_admin:
-        raise HTTPException(status_code=403, detail="Only Discord Leaders can give Discord approval")
-    if update.approval_type == "in_game" and not is_in_game_leader and not is_admin:
-        raise HTTPException(status_code=403, detail="Only In-Game Leaders can give In-Game approval")
-    
-    existing_app = await db.applications.find_one({"id": application_id}, {"_id": 0})
-    if not existing_app:
-        raise HTTPException(status_code=404, detail="Application not found")
-    
-    # Set the appropriate approval flag
-    update_fields = {}
-    if update.approval_type == "discord":
-        update_fields["discord_approved"] = True
-        update_fields["discord_approved_by"] = current_user['username']
-        approval_label = "DISCORD APPROVED"
-    else:
-        update_fields["in_game_approved"] = True
-        update_fields["in_game_approved_by"] = current_user['username']
-        approval_label = "IN-GAME APPROVED"
+    await require_team_leader(current_user['username'], update.approval_type, "give")
     
-    await db.applications.update_one(
-        {"id": application_id},
-        {"$set": update_fields}
-    )
-    
-    # Add comment
-    comment = {
-        "moderator": current_user['username'],
-        "comment": f"[{approval_label}] {update.comment}",
-        "timestamp": datetime.now(timezone.utc).isoformat()
-    }
-    await db.applications.update_one(
-        {"id": application_id},
-        {"$push": {"comments": comment}}
+    # Set the appropriate approval flag, only if it is not already set
+    flag, approved_by, team = TEAM_APPROVALS[update.approval_type]
+    approval_label = f"{team} APPROVED"
+    application = await db.applications.find_one_and_update(
+        {"id": application_id, flag: {"$ne": True}},
+        {"$set": {flag: True, approved_by: current_user['username']}, "$inc": {"comment_count": 1}},
+        projection=APPLICATION_PROJECTION,
+        return_document=ReturnDocument.AFTER
     )
-    
-    # Create audit log
-    audit_log = AuditLog(
-        action="team_approved",
-        application_id=application_id,
-        application_name=existing_app.get('name', 'Unknown'),
-        performed_by=current_user['username'],
-        comment=update.comment,
-        old_status=existing_app.get('status', 'unknown'),
-        new_status=approval_label.lower().replace(" ", "_")
+    if not application:
+        return await unchanged_application(application_id)
+    
+    await asyncio.gather(
+        add_application_comment(application_id, current_user['username'], f"[{approval_label}] {update.comment}"),
+        db.audit_logs.insert_one(build_audit_doc(
+            action="team_approved",
+            application_id=application_id,
+            application_name=application.get('name', 'Unknown'),
+            performed_by=current_user['username'],
+            comment=update.comment,
+            old_status=application.get('status', 'unknown'),
+            new_status=approval_label.lower().replace(" ", "_")
+        )),
     )
-    audit_doc = audit_log.model_dump()
-    audit_doc['created_at'] = audit_doc['created_at'].isoformat()
-    await db.audit_logs.insert_one(audit_doc)
-    
-    # Get updated application
-    application = await db.applications.find_one({"id": application_id}, {"_id": 0})
-    convert_application_timestamps(application)
     
     return application
 
@@ -344,57 +533,24 @@ async def team_approve_application(application_id: str, update: TeamApprovalUpda
 @router.post("/{application_id}/team-unapprove")
 async def team_unapprove_application(application_id: str, update: TeamApprovalUpdate, current_user: dict = Depends(get_current_moderator)):
     """Discord or In-Game leader removes their team approval."""
-    if update.approval_type not in ["discord", "in_game"]:
+    if update.approval_type not in TEAM_APPROVALS:
         raise HTTPException(status_code=400, detail="approval_type must be 'discord' or 'in_game'")
     
-    # Check permissions
-    moderator = await db.moderators.find_one({"username": current_user['username']}, {"_id": 0})
-    if not moderator:
-        raise HTTPException(status_code=404, detail="Moderator not found")
+    await require_team_leader(current_user['username'], update.approval_type, "remove")
     
-    is_discord_leader = moderator.get("is_discord_leader", False)
-    is_in_game_leader = moderator.get("is_in_game_leader", False)
-    is_admin = moderator.get("is_admin", False)
-    
-    if update.approval_type == "discord" and not is_discord_leader and not is_admin:
-        raise HTTPException(status_code=403, detail="Only Discord Leaders can remove Discord approval")
-    if update.approval_type == "in_game" and not is_in_game_leader and not is_admin:
-        raise HTTPException(status_code=403, detail="Only In-Game Leaders can remove In-Game approval")
-    
-    existing_app = await db.applications.find_one({"id": application_id}, {"_id": 0})
-    if not existing_app:
-        raise HTTPException(status_code=404, detail="Application not found")
-    
-    # Remove the appropriate approval flag
-    update_fields = {}
-    if update.approval_type == "discord":
-        update_fields["discord_approved"] = False
-        update_fields["discord_approved_by"] = None
-        approval_label = "DISCORD APPROVAL REMOVED"
-    else:
-        update_fields["in_game_approved"] = False
-        update_fields["in_game_approved_by"] = None
-        approval_label = "IN-GAME APPROVAL REMOVED"
-    
-    await db.applications.update_one(
-        {"id": application_id},
-        {"$set": update_fields}
-    )
-    
-    # Add comment
-    comment = {
-        "moderator": current_user['username'],
-        "comment": f"[{approval_label}] {update.comment or 'Approval removed'}",
-        "timestamp": datetime.now(timezone.utc).isoformat()
-    }
-    await db.applications.update_one(
-        {"id": application_id},
-        {"$push": {"comments": comment}}
+    # Remove the appropriate approval flag, only if it is currently set
+    flag, approved_by, team = TEAM_APPROVALS[update.approval_type]
+    approval_label = f"{team} APPROVAL REMOVED"
+    application = await db.applications.find_one_and_update(
+        {"id": application_id, flag: True},
+        {"$set": {flag: False, approved_by: None}, "$inc": {"comment_count": 1}},
+        projection=APPLICATION_PROJECTION,
+        return_document=ReturnDocument.AFTER
     )
+    if not application:
+        return await unchanged_application(application_id)
     
-    # Get updated application
-    application = await db.applications.find_one({"id": application_id}, {"_id": 0})
-    convert_application_timestamps(application)
+    await add_application_comment(application_id, current_user['username'], f"[{approval_label}] {update.comment or 'Approval removed'}")
     
     return application
 
@@ -416,24 +572,27 @@ async def delete_application(application_id: str, current_user: dict = Depends(r
         old_status=existing_app.get('status', 'unknown'),
         new_status="deleted"
     )
-    audit_doc = audit_log.model_dump()
-    audit_doc['created_at'] = audit_doc['created_at'].isoformat()
-    await db.audit_logs.insert_one(audit_doc)
+    await db.audit_logs.insert_one(audit_log.model_dump())
     
     result = await db.applications.delete_one({"id": application_id})
     
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Application not found")
     
+    application_view_buffer.discard_application(application_id)
+    await db.application_views.delete_many({"application_id": application_id})
+    await db.application_votes.delete_many({"application_id": application_id})
+    await db.application_comments.delete_many({"application_id": application_id})
+    
     return {"message": f"Application from {existing_app.get('name', 'Unknown')} deleted successfully"}
 
 
 # ============= Application Settings Endpoints =============
 
 @router.get("/settings/status")
-async def get_application_settings():
+async def get_application_settings(etag: str = Depends(conditional_get("application_settings"))):
     """Get application settings (public endpoint for checking if applications are enabled)."""
-    settings = await db.application_settings.find_one({"id": "app_settings"}, {"_id": 0})
+    settings = await application_settings_cache.get("app_settings")
     if not settings:
         # Return default settings if none exist
         return {"applications_enabled": True}
@@ -450,6 +609,7 @@ async def get_application_settings_admin(current_user: dict = Depends(require_ad
         doc = default_settings.model_dump()
         doc['updated_at'] = doc['updated_at'].isoformat()
         await db.application_settings.insert_one(doc)
+        await application_settings_cache.reload()
         return default_settings
     
     # Convert timestamp if needed
@@ -475,6 +635,8 @@ async def update_application_settings(update: ApplicationSettingsUpdate, current
         },
         upsert=True
     )
+    await application_settings_cache.reload()
+    await collection_versions.bump("application_settings")
     
     return {
         "message": f"Applications {'enabled' if update.applications_enabled else 'disabled'} successfully",
@@ -3,6 +3,7 @@ from fastapi import APIRouter, HTTPException, Depends
 
 from database import db
 from utils.auth import get_current_moderator
+from utils.responses import fast_json_response
 
 router = APIRouter(prefix="/audit-logs", tags=["Audit Logs"])
 
@@ -14,4 +15,4 @@ async def get_audit_logs(current_user: dict = Depends(get_current_moderator)):
         raise HTTPException(status_code=403, detail="Only Admin and MMOD can view audit logs")
     
     logs = await db.audit_logs.find({}, {"_id": 0}).sort("created_at", -1).to_list(500)
-    return logs
+    return fast_json_response(logs)
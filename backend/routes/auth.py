@@ -13,11 +13,13 @@ from models.schemas import (
     Token
 )
 from utils.auth import (
-    pwd_context, create_access_token, get_current_moderator, require_admin,
+    password_hasher, create_access_token, get_current_moderator, require_admin,
     validate_password_strength, check_password_history, PASSWORD_HISTORY_COUNT,
     MAX_LOGIN_ATTEMPTS, normalize_roles, get_highest_role
 )
 from utils.email import send_moderator_email_confirmation, send_password_reset_email
+from utils.collection_versions import collection_versions
+from utils.moderator_cache import moderator_cache
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -50,7 +52,7 @@ def has_valid_email(email: Optional[str]) -> bool:
 
 
 @router.post("/register", response_model=dict)
-async def register_moderator(moderator: ModeratorCreate, background_tasks: BackgroundTasks):
+async def register_moderator(moderator: ModeratorCreate):
     """Register a new moderator."""
     # Check if username already exists
     existing = await db.moderators.find_one({"username": moderator.username}, {"_id": 0})
@@ -71,7 +73,7 @@ async def register_moderator(moderator: ModeratorCreate, background_tasks: Backg
         raise HTTPException(status_code=400, detail=message)
     
     # Hash password
-    hashed_password = pwd_context.hash(moderator.password)
+    hashed_password = await password_hasher.hash(moderator.password)
     
     # Create moderator with must_change_password=True for new users
     normalized_roles = normalize_roles(moderator.role, moderator.roles)
@@ -85,12 +87,11 @@ async def register_moderator(moderator: ModeratorCreate, background_tasks: Backg
         is_discord_leader=moderator.is_discord_leader or ("discord_leader" in normalized_roles),
         must_change_password=True
     )
-    doc = mod_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    
-    await db.moderators.insert_one(doc)
+    await db.moderators.insert_one(mod_obj.model_dump())
+    moderator_cache.invalidate_active_count()
+    await collection_versions.bump("moderators")
     if normalized_email:
-        background_tasks.add_task(send_moderator_email_confirmation, normalized_email, moderator.username)
+        await send_moderator_email_confirmation(normalized_email, moderator.username)
     return {"message": "Moderator registered successfully", "username": moderator.username, "role": moderator.role}
 
 
@@ -110,11 +111,11 @@ async def login_moderator(credentials: ModeratorLogin, background_tasks: Backgro
         raise HTTPException(status_code=401, detail="Account has been disabled. Contact administrator.")
     
     # Verify password
-    if not pwd_context.verify(credentials.password, moderator["hashed_password"]):
+    if not await password_hasher.verify(credentials.password, moderator["hashed_password"]):
         failed_attempts = moderator.get("failed_login_attempts", 0) + 1
         updates = {"failed_login_attempts": failed_attempts}
         if failed_attempts >= MAX_LOGIN_ATTEMPTS:
-            updates["locked_at"] = datetime.now(timezone.utc).isoformat()
+            updates["locked_at"] = datetime.now(timezone.utc)
         await db.moderators.update_one(
             {"username": credentials.username},
             {"$set": updates}
@@ -137,10 +138,11 @@ async def login_moderator(credentials: ModeratorLogin, background_tasks: Backgro
     await db.moderators.update_one(
         {"username": credentials.username},
         {"$set": {
-            "last_login": datetime.now(timezone.utc).isoformat(),
+            "last_login": datetime.now(timezone.utc),
             "login_count": login_count
         }}
     )
+    await collection_versions.bump("moderators")
     
     # Create token - include multi-role data with computed primary role
     is_admin = moderator.get("is_admin", False)
@@ -181,7 +183,7 @@ async def change_password(password_data: PasswordChange, current_user: dict = De
         raise HTTPException(status_code=404, detail="Moderator not found")
     
     # Verify old password
-    if not pwd_context.verify(password_data.old_password, moderator["hashed_password"]):
+    if not await password_hasher.verify(password_data.old_password, moderator["hashed_password"]):
         raise HTTPException(status_code=400, detail="Current password is incorrect")
     
     # Validate password strength
@@ -191,11 +193,11 @@ async def change_password(password_data: PasswordChange, current_user: dict = De
     
     # Check password history
     password_history = moderator.get("password_history", [])
-    if not check_password_history(password_data.new_password, password_history):
+    if not await check_password_history(password_data.new_password, password_history):
         raise HTTPException(status_code=400, detail="Password has been used recently. Please choose a different password.")
     
     # Hash new password
-    new_hashed = pwd_context.hash(password_data.new_password)
+    new_hashed = await password_hasher.hash(password_data.new_password)
     
     # Update password history (keep last 10)
     new_history = [moderator["hashed_password"]] + password_history
@@ -228,7 +230,7 @@ async def reset_password(username: str, password_data: PasswordReset, current_us
         raise HTTPException(status_code=400, detail=message)
     
     # Hash new password
-    new_hashed = pwd_context.hash(password_data.new_password)
+    new_hashed = await password_hasher.hash(password_data.new_password)
     
     # Update password history (keep last 10)
     password_history = moderator.get("password_history", [])
@@ -249,7 +251,7 @@ async def reset_password(username: str, password_data: PasswordReset, current_us
 
 
 @router.post("/request-password-reset")
-async def request_password_reset(request: PasswordResetRequest, background_tasks: BackgroundTasks):
+async def request_password_reset(request: PasswordResetRequest):
     """Request a password reset via email.
 
     A reset token is only generated when the provided username/email pair matches
@@ -267,15 +269,10 @@ async def request_password_reset(request: PasswordResetRequest, background_tasks
             {"username": request.username, "email": normalized_email},
             {"$set": {
                 "password_reset_token": reset_token,
-                "password_reset_expires": reset_expires.isoformat()
+                "password_reset_expires": reset_expires
             }}
         )
-        background_tasks.add_task(
-            send_password_reset_email,
-            normalized_email,
-            request.username,
-            reset_token
-        )
+        await send_password_reset_email(normalized_email, request.username, reset_token)
     return {"message": "If the username/email pair exists, a reset link will be sent."}
 
 
@@ -283,29 +280,21 @@ async def request_password_reset(request: PasswordResetRequest, background_tasks
 async def reset_password_by_email(payload: PasswordResetByEmail):
     """Reset password using a token sent via email."""
     moderator = await db.moderators.find_one(
-        {"password_reset_token": payload.token},
+        {"password_reset_token": payload.token, "password_reset_expires": {"$gte": datetime.now(timezone.utc)}},
         {"_id": 0}
     )
     if not moderator:
         raise HTTPException(status_code=400, detail="Invalid or expired reset token")
 
-    expires_raw = moderator.get("password_reset_expires")
-    if not expires_raw:
-        raise HTTPException(status_code=400, detail="Invalid or expired reset token")
-
-    expires = datetime.fromisoformat(expires_raw)
-    if datetime.now(timezone.utc) > expires:
-        raise HTTPException(status_code=400, detail="Invalid or expired reset token")
-
     is_valid, message = validate_password_strength(payload.new_password)
     if not is_valid:
         raise HTTPException(status_code=400, detail=message)
 
     password_history = moderator.get("password_history", [])
-    if not check_password_history(payload.new_password, password_history):
+    if not await check_password_history(payload.new_password, password_history):
         raise HTTPException(status_code=400, detail="Password has been used recently. Please choose a different password.")
 
-    new_hashed = pwd_context.hash(payload.new_password)
+    new_hashed = await password_hasher.hash(payload.new_password)
     new_history = [moderator["hashed_password"]] + password_history
     new_history = new_history[:PASSWORD_HISTORY_COUNT]
 
@@ -326,7 +315,7 @@ async def reset_password_by_email(payload: PasswordResetByEmail):
 
 
 @router.post("/set-email")
-async def set_moderator_email(payload: ModeratorEmailUpdate, background_tasks: BackgroundTasks, current_user: dict = Depends(get_current_moderator)):
+async def set_moderator_email(payload: ModeratorEmailUpdate, current_user: dict = Depends(get_current_moderator)):
     """Set or update the current moderator's email."""
     normalized_email = normalize_email_address(payload.email)
     existing_email = await db.moderators.find_one({"email": normalized_email}, {"_id": 0})
@@ -340,7 +329,8 @@ async def set_moderator_email(payload: ModeratorEmailUpdate, background_tasks: B
 
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Moderator not found")
+    await collection_versions.bump("moderators")
 
-    background_tasks.add_task(send_moderator_email_confirmation, normalized_email, current_user["username"])
+    await send_moderator_email_confirmation(normalized_email, current_user["username"])
 
     return {"message": "Email saved successfully"}
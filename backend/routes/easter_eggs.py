@@ -1,11 +1,13 @@
 """Easter egg page management routes."""
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from typing import List, Optional
 from datetime import datetime, timezone
+from pymongo import UpdateOne
 
 from database import db
 from models.schemas import EasterEggPage, EasterEggPageCreate, EasterEggPageUpdate
 from utils.auth import get_current_moderator, require_admin
+from utils.egg_credentials import client_address, easter_egg_cache, easter_egg_throttle, hash_egg_password
 
 router = APIRouter(prefix="/easter-eggs", tags=["Easter Eggs"])
 
@@ -202,41 +204,69 @@ DEFAULT_EASTER_EGGS = [
 ]
 
 
+# Credentials never leave the server, not even to admins
+EGG_PROJECTION = {"_id": 0, "password": 0, "password_hash": 0}
+
+
+def build_egg_doc(egg: dict, **fields) -> dict:
+    """Storage document for an egg given with a plaintext ``password``."""
+    page = EasterEggPage(**egg, password_hash=hash_egg_password(egg["password"]), **fields)
+    doc = page.model_dump()
+    doc['created_at'] = doc['created_at'].isoformat()
+    doc['updated_at'] = doc['updated_at'].isoformat()
+    return doc
+
+
 async def initialize_easter_eggs():
-    """Initialize default easter egg pages if they don't exist."""
-    for egg in DEFAULT_EASTER_EGGS:
-        existing = await db.easter_eggs.find_one({"page_key": egg["page_key"]}, {"_id": 0})
-        if not existing:
-            page = EasterEggPage(**egg)
-            doc = page.model_dump()
-            doc['created_at'] = doc['created_at'].isoformat()
-            doc['updated_at'] = doc['updated_at'].isoformat()
-            await db.easter_eggs.insert_one(doc)
+    """Insert the default easter egg pages that don't exist yet, in one bulk upsert."""
+    await db.easter_eggs.bulk_write([
+        UpdateOne({"page_key": egg["page_key"]}, {"$setOnInsert": build_egg_doc(egg)}, upsert=True)
+        for egg in DEFAULT_EASTER_EGGS
+    ], ordered=False)
+
+
+async def migrate_plaintext_egg_passwords() -> int:
+    """Replace plaintext ``password`` fields of older eggs with ``password_hash``."""
+    eggs = await db.easter_eggs.find({"password": {"$type": "string"}}, {"_id": 1, "password": 1}).to_list(None)
+    if not eggs:
+        return 0
+    # Matching on the password read leaves eggs edited meanwhile untouched
+    await db.easter_eggs.bulk_write([
+        UpdateOne({"_id": egg["_id"], "password": egg["password"]},
+                  {"$set": {"password_hash": hash_egg_password(egg["password"])}, "$unset": {"password": ""}})
+        for egg in eggs
+    ], ordered=False)
+    return len(eggs)
 
 
 @router.get("", response_model=List[dict])
 async def get_easter_eggs(current_user: dict = Depends(require_admin)):
     """Get all easter egg pages (admin only)."""
-    eggs = await db.easter_eggs.find({}, {"_id": 0}).to_list(100)
+    eggs = await db.easter_eggs.find({}, EGG_PROJECTION).to_list(100)
     return eggs
 
 
 @router.get("/{page_key}")
 async def get_easter_egg(page_key: str, current_user: dict = Depends(require_admin)):
     """Get a specific easter egg page (admin only)."""
-    egg = await db.easter_eggs.find_one({"page_key": page_key}, {"_id": 0})
+    egg = await db.easter_eggs.find_one({"page_key": page_key}, EGG_PROJECTION)
     if not egg:
         raise HTTPException(status_code=404, detail="Easter egg page not found")
     return egg
 
 
 @router.post("/verify")
-async def verify_easter_egg_credentials(username: str, password: str):
+async def verify_easter_egg_credentials(username: str, password: str, request: Request):
     """Verify easter egg credentials and return page key if valid."""
-    egg = await db.easter_eggs.find_one(
-        {"username": username, "password": password, "is_active": True},
-        {"_id": 0}
-    )
+    # The login form checks every login here first; only egg usernames spend a guess
+    if not await easter_egg_cache.has_username(username):
+        return {"valid": False, "page_key": None}
+    client = client_address(request.client.host if request.client else None, request.headers.get("x-forwarded-for"))
+    if not easter_egg_throttle.allow(client):
+        raise HTTPException(status_code=429, detail="Too many attempts, try again later",
+                            headers={"Retry-After": str(easter_egg_throttle.retry_after(client))})
+    # In-memory index with constant-time comparison; no database round trip
+    egg = await easter_egg_cache.verify(username, password)
     if not egg:
         return {"valid": False, "page_key": None}
     return {"valid": True, "page_key": egg["page_key"], "content": egg.get("content", {})}
@@ -250,13 +280,11 @@ async def create_easter_egg(egg_data: EasterEggPageCreate, current_user: dict =
     if existing:
         raise HTTPException(status_code=400, detail="Page key already exists")
     
-    page = EasterEggPage(**egg_data.model_dump(), updated_by=current_user["username"])
-    doc = page.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    doc['updated_at'] = doc['updated_at'].isoformat()
+    doc = build_egg_doc(egg_data.model_dump(), updated_by=current_user["username"])
     
     await db.easter_eggs.insert_one(doc)
-    return {"message": "Easter egg page created successfully", "id": page.id}
+    await easter_egg_cache.reload()
+    return {"message": "Easter egg page created successfully", "id": doc["id"]}
 
 
 @router.patch("/{page_key}")
@@ -269,8 +297,9 @@ async def update_easter_egg(page_key: str, update: EasterEggPageUpdate, current_
     update_data = {}
     if update.username is not None:
         update_data["username"] = update.username
-    if update.password is not None:
-        update_data["password"] = update.password
+    # Blank keeps the current password, which admins can no longer read back
+    if update.password:
+        update_data["password_hash"] = hash_egg_password(update.password)
     if update.title is not None:
         update_data["title"] = update.title
     if update.content is not None:
@@ -283,8 +312,9 @@ async def update_easter_egg(page_key: str, update: EasterEggPageUpdate, current_
     
     await db.easter_eggs.update_one(
         {"page_key": page_key},
-        {"$set": update_data}
+        {"$set": update_data, "$unset": {"password": ""}}
     )
+    await easter_egg_cache.reload()
     
     return {"message": f"Easter egg page '{page_key}' updated successfully"}
 
@@ -295,4 +325,5 @@ async def delete_easter_egg(page_key: str, current_user: dict = Depends(require_
     result = await db.easter_eggs.delete_one({"page_key": page_key})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Easter egg page not found")
+    await easter_egg_cache.reload()
     return {"message": f"Easter egg page '{page_key}' deleted successfully"}
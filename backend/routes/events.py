@@ -0,0 +1,46 @@
+"""Server-sent event stream routes."""
+import asyncio
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from utils.auth import create_stream_ticket, decode_stream_ticket, get_current_moderator
+from utils.events import EVENT_HEARTBEAT_SECONDS, event_broker
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+
+@router.post("/ticket")
+async def get_stream_ticket(current_user: dict = Depends(get_current_moderator)):
+    """Issue a short-lived ticket for opening the event stream."""
+    return {"ticket": create_stream_ticket(current_user["username"])}
+
+
+@router.get("/stream")
+async def stream_events(ticket: str = Query(...)):
+    """Push poll and announcement events to the connected moderator."""
+    username = decode_stream_ticket(ticket)
+    subscriber = event_broker.subscribe(username)
+
+    async def event_stream():
+        try:
+            # Tell EventSource how long to wait before reconnecting
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscriber.queue.get(), timeout=EVENT_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+                yield message
+                if subscriber.dropped and subscriber.queue.empty():
+                    return
+        finally:
+            event_broker.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -7,6 +7,7 @@ import uuid
 
 from database import db
 from utils.auth import get_current_moderator
+from utils.responses import fast_json_response
 
 router = APIRouter(prefix="/feature-requests", tags=["Feature Requests"])
 
@@ -45,10 +46,7 @@ async def create_feature_request(request: FeatureRequestCreate, current_user: di
         submitted_by=current_user["username"]
     )
     
-    doc = feature_request.model_dump()
-    doc['submitted_at'] = doc['submitted_at'].isoformat()
-    
-    await db.feature_requests.insert_one(doc)
+    await db.feature_requests.insert_one(feature_request.model_dump())
     
     return {"message": "Feature request submitted successfully", "id": feature_request.id}
 
@@ -67,7 +65,7 @@ async def get_feature_requests(current_user: dict = Depends(get_current_moderato
             {"_id": 0}
         ).sort("submitted_at", -1).to_list(100)
     
-    return requests
+    return fast_json_response(requests)
 
 
 @router.get("/all")
@@ -77,7 +75,7 @@ async def get_all_feature_requests(current_user: dict = Depends(get_current_mode
         raise HTTPException(status_code=403, detail="Only Admin, MMOD, and Developer can view all feature requests")
     
     requests = await db.feature_requests.find({}, {"_id": 0}).sort("submitted_at", -1).to_list(500)
-    return requests
+    return fast_json_response(requests)
 
 
 @router.patch("/{request_id}")
@@ -99,7 +97,7 @@ async def update_feature_request(request_id: str, update: FeatureRequestUpdate,
         update_data["admin_notes"] = update.admin_notes
     
     update_data["reviewed_by"] = current_user["username"]
-    update_data["reviewed_at"] = datetime.now(timezone.utc).isoformat()
+    update_data["reviewed_at"] = datetime.now(timezone.utc)
     
     await db.feature_requests.update_one(
         {"id": request_id},
@@ -0,0 +1,32 @@
+"""Liveness and readiness probes for the orchestrator."""
+import asyncio
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from database import db
+from utils.startup import startup_report
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+READINESS_PING_TIMEOUT_SECONDS = 2.0
+
+
+@router.get("/live")
+async def liveness():
+    """The process is running and its startup has not failed."""
+    if not startup_report.alive:
+        return JSONResponse({"status": "failed", "failed_phase": startup_report.failed_phase}, status_code=503)
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+async def readiness():
+    """Startup warm-up has finished and MongoDB answers; only then should traffic be routed here."""
+    if not startup_report.ready:
+        return JSONResponse({"status": "starting", "phases": startup_report.phases}, status_code=503)
+    try:
+        await asyncio.wait_for(db.command("ping"), READINESS_PING_TIMEOUT_SECONDS)
+    except Exception as exc:
+        return JSONResponse({"status": "database_unavailable", "detail": str(exc)}, status_code=503)
+    return {"status": "ready", "ready_after_ms": round(startup_report.ready_after_ms, 2)}
@@ -1,7 +1,6 @@
 """Moderator management routes."""
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends
 from typing import List
-from datetime import datetime
 from email_validator import EmailNotValidError, validate_email
 
 from database import db
@@ -15,7 +14,10 @@ from utils.auth import (
     get_current_moderator, require_admin, require_admin_role, get_role_rank,
     can_modify_role, get_assignable_roles, normalize_roles, get_highest_role, has_any_role
 )
+from utils.collection_versions import cache_headers, collection_versions, conditional_get
 from utils.email import send_moderator_email_confirmation
+from utils.moderator_cache import moderator_cache
+from utils.responses import fast_json_response
 
 router = APIRouter(prefix="/moderators", tags=["Moderators"])
 
@@ -30,7 +32,10 @@ def normalize_email_address(email: str) -> str:
 
 
 @router.get("", response_model=List[ModeratorInfo])
-async def get_moderators(current_user: dict = Depends(get_current_moderator)):
+async def get_moderators(
+    current_user: dict = Depends(get_current_moderator),
+    etag: str = Depends(conditional_get("moderators", scope="user"))
+):
     """Get all moderators. Email is only visible to admins."""
     moderators = await db.moderators.find({}, {"_id": 0, "hashed_password": 0}).to_list(1000)
     
@@ -42,15 +47,11 @@ async def get_moderators(current_user: dict = Depends(get_current_moderator)):
         mod["role"] = get_highest_role(mod["roles"])
         mod["is_in_game_leader"] = mod.get("is_in_game_leader", "in_game_leader" in mod["roles"])
         mod["is_discord_leader"] = mod.get("is_discord_leader", "discord_leader" in mod["roles"])
-        if isinstance(mod.get('created_at'), str):
-            mod['created_at'] = datetime.fromisoformat(mod['created_at'])
-        if isinstance(mod.get('last_login'), str):
-            mod['last_login'] = datetime.fromisoformat(mod['last_login'])
         # Strip email for non-admin users
         if not is_admin_user:
             mod.pop('email', None)
     
-    return moderators
+    return fast_json_response(moderators, ModeratorInfo, headers=cache_headers(etag))
 
 
 @router.patch("/{username}/status")
@@ -78,6 +79,9 @@ async def update_moderator_status(username: str, status_update: ModeratorStatusU
         {"username": username},
         {"$set": {"status": status_update.status}}
     )
+    await collection_versions.bump("moderators")
+    moderator_cache.invalidate(username)
+    moderator_cache.invalidate_active_count()
     
     action = "enabled" if status_update.status == "active" else "disabled"
     return {"message": f"Moderator {username} has been {action}"}
@@ -99,6 +103,9 @@ async def delete_moderator(username: str, current_user: dict = Depends(require_a
             raise HTTPException(status_code=400, detail="Cannot delete the last admin. System must have at least one admin.")
     
     result = await db.moderators.delete_one({"username": username})
+    await collection_versions.bump("moderators")
+    moderator_cache.invalidate(username)
+    moderator_cache.invalidate_active_count()
     
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Moderator not found")
@@ -142,6 +149,8 @@ async def update_moderator_role(username: str, role_update: ModeratorRoleUpdate,
         {"username": username},
         {"$set": {"role": chosen_primary_role, "roles": normalized_roles}}
     )
+    await collection_versions.bump("moderators")
+    moderator_cache.invalidate(username)
 
     return {"message": f"Moderator {username} role updated", "role": chosen_primary_role, "roles": normalized_roles}
 
@@ -175,6 +184,8 @@ async def update_moderator_leader_roles(username: str, leader_update: ModeratorL
             "roles": normalize_roles(moderator.get("role", "moderator"), next_roles)
         }}
     )
+    await collection_versions.bump("moderators")
+    moderator_cache.invalidate(username)
 
     return {
         "message": f"Moderator {username} leader roles updated",
@@ -198,6 +209,8 @@ async def update_moderator_username(username: str, username_update: ModeratorUse
         {"username": username},
         {"$set": {"username": username_update.new_username}}
     )
+    await collection_versions.bump("moderators")
+    moderator_cache.invalidate(username, username_update.new_username)
     
     return {"message": f"Username changed from {username} to {username_update.new_username}"}
 
@@ -213,7 +226,6 @@ async def require_mmod_or_admin(current_user: dict = Depends(get_current_moderat
 async def update_moderator_email(
     username: str,
     email_update: ModeratorEmailUpdate,
-    background_tasks: BackgroundTasks,
     current_user: dict = Depends(require_mmod_or_admin)
 ):
     """Change a moderator's email address. MMODs and Admins can change emails."""
@@ -230,8 +242,9 @@ async def update_moderator_email(
         {"username": username},
         {"$set": {"email": normalized_email}}
     )
+    await collection_versions.bump("moderators")
 
-    background_tasks.add_task(send_moderator_email_confirmation, normalized_email, username)
+    await send_moderator_email_confirmation(normalized_email, username)
 
     return {"message": f"Email updated for {username}"}
 
@@ -247,6 +260,8 @@ async def update_training_manager(username: str, tm_update: ModeratorTrainingMan
         {"username": username},
         {"$set": {"is_training_manager": tm_update.is_training_manager}}
     )
+    await collection_versions.bump("moderators")
+    moderator_cache.invalidate(username)
     
     status = "enabled" if tm_update.is_training_manager else "disabled"
     return {"message": f"Training Manager status {status} for {username}"}
@@ -268,6 +283,8 @@ async def update_admin(username: str, admin_update: ModeratorAdminUpdate, curren
         {"username": username},
         {"$set": {"is_admin": admin_update.is_admin}}
     )
+    await collection_versions.bump("moderators")
+    moderator_cache.invalidate(username)
     
     status = "enabled" if admin_update.is_admin else "disabled"
     return {"message": f"Admin status {status} for {username}"}
@@ -299,6 +316,8 @@ async def update_application_viewer(username: str, viewer_update: ModeratorAppli
         {"username": username},
         {"$set": {"can_view_applications": viewer_update.can_view_applications}}
     )
+    await collection_versions.bump("moderators")
+    moderator_cache.invalidate(username)
     
     status = "enabled" if viewer_update.can_view_applications else "disabled"
     return {"message": f"Application Viewer status {status} for {username}"}
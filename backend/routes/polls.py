@@ -1,25 +1,36 @@
 """Poll routes."""
 from fastapi import APIRouter, HTTPException, Depends
+import uuid
 from datetime import datetime, timezone
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
 
 from database import db
-from models.schemas import Poll, PollCreate, ArchivedPoll
+from models.schemas import Poll, PollCreate, PollOption, ArchivedPoll
 from utils.auth import get_current_moderator
+from utils.collection_versions import cache_headers, collection_versions, conditional_get
+from utils.events import event_broker
+from utils.moderator_cache import moderator_cache
+from utils.poll_scheduler import poll_expiry_scheduler
+from utils.responses import fast_json_response
+
+MAX_POLL_OPTIONS = 6
 
 router = APIRouter(prefix="/polls", tags=["Polls"])
 
 
-async def close_and_archive_poll(poll_id: str):
-    """Close a poll and archive it."""
-    poll = await db.polls.find_one({"id": poll_id}, {"_id": 0})
-    if not poll:
-        return
-    
+def option_vote_count(option: dict) -> int:
+    """Maintained tally for an option, falling back to the voter list for unmigrated polls."""
+    return option.get("vote_count", len(option.get("votes", [])))
+
+
+def build_archived_poll(poll: dict) -> dict:
+    """Archive record for a closed poll, with the winning option(s) as its outcome."""
     # Find winning option
     max_votes = 0
     winning_options = []
     for opt in poll.get("options", []):
-        vote_count = len(opt.get("votes", []))
+        vote_count = option_vote_count(opt)
         if vote_count > max_votes:
             max_votes = vote_count
             winning_options = [opt["text"]]
@@ -32,45 +43,164 @@ async def close_and_archive_poll(poll_id: str):
     else:
         outcome = f"Tie: {', '.join(winning_options)} ({max_votes} votes each)"
     
-    # Archive the poll
     archived = ArchivedPoll(
         question=poll["question"],
         outcome=outcome,
         created_by=poll["created_by"]
     )
-    archived_doc = archived.model_dump()
-    archived_doc['closed_at'] = archived_doc['closed_at'].isoformat()
-    await db.archived_polls.insert_one(archived_doc)
+    return archived.model_dump()
+
+
+async def close_and_archive_poll(poll_id: str):
+    """Close a poll and archive it.
+
+    The poll is deactivated atomically first, so concurrent callers (the last
+    vote and the expiry scheduler) archive it exactly once.
+    """
+    poll = await db.polls.find_one_and_update(
+        {"id": poll_id, "is_active": True},
+        {"$set": {"is_active": False}},
+        projection={"_id": 0}
+    )
+    if not poll:
+        return
+    
+    await db.archived_polls.insert_one(build_archived_poll(poll))
+    await collection_versions.bump("polls")
+    await event_broker.publish("poll.closed", {"id": poll_id})
+
+
+async def close_expired_polls() -> int:
+    """Close and archive every active poll whose expires_at has passed.
+
+    All due polls are deactivated in one update tagged with a batch id, and
+    only the polls carrying that tag are archived, so a poll auto-closed by a
+    vote in the meantime is never archived twice.
+    """
+    now = datetime.now(timezone.utc)
+    due = await db.polls.find(
+        {"is_active": True, "expires_at": {"$lte": now}}, {"_id": 0, "id": 1}
+    ).to_list(None)
+    if not due:
+        return 0
     
-    # Mark poll as inactive
-    await db.polls.update_one({"id": poll_id}, {"$set": {"is_active": False}})
+    due_ids = [poll["id"] for poll in due]
+    batch_id = str(uuid.uuid4())
+    await db.polls.update_many(
+        {"id": {"$in": due_ids}, "is_active": True},
+        {"$set": {"is_active": False, "close_batch": batch_id}}
+    )
+    closed = await db.polls.find({"id": {"$in": due_ids}, "close_batch": batch_id}, {"_id": 0}).to_list(None)
+    if closed:
+        await db.archived_polls.insert_many([build_archived_poll(poll) for poll in closed], ordered=False)
+        await collection_versions.bump("polls")
+        for poll in closed:
+            await event_broker.publish("poll.closed", {"id": poll["id"]})
+    return len(closed)
+
+
+async def migrate_embedded_poll_votes() -> int:
+    """Move votes and views embedded in poll documents into poll_votes and poll_views.
+
+    Records are upserted before the embedded arrays are removed, so an
+    interrupted migration simply picks the remaining polls up on next start.
+    """
+    polls = await db.polls.find(
+        {"$or": [{"options.votes": {"$exists": True}}, {"voters": {"$exists": True}},
+                 {"viewed_by": {"$exists": True}}]},
+        {"_id": 0, "id": 1, "options": 1, "viewed_by": 1, "created_at": 1}
+    ).to_list(None)
+    if not polls:
+        return 0
+
+    vote_writes, view_writes, poll_writes = [], [], []
+    for poll in polls:
+        recorded_at = poll.get("created_at")
+        tallies = {}
+        for index, opt in enumerate(poll.get("options", [])):
+            votes = list(dict.fromkeys(opt.get("votes", [])))
+            tallies[f"options.{index}.vote_count"] = len(votes)
+            for username in votes:
+                vote_writes.append(UpdateOne(
+                    {"poll_id": poll["id"], "username": username},
+                    {"$setOnInsert": {"option_index": index, "voted_at": recorded_at}},
+                    upsert=True
+                ))
+        for username in poll.get("viewed_by", []):
+            view_writes.append(UpdateOne(
+                {"poll_id": poll["id"], "username": username},
+                {"$setOnInsert": {"viewed_at": recorded_at}},
+                upsert=True
+            ))
+        tallies["total_votes"] = sum(tallies.values())
+        unset = {f"options.{index}.votes": "" for index in range(len(poll.get("options", [])))}
+        unset.update(voters="", viewed_by="")
+        poll_writes.append(UpdateOne({"id": poll["id"]}, {"$set": tallies, "$unset": unset}))
+
+    if vote_writes:
+        await db.poll_votes.bulk_write(vote_writes, ordered=False)
+    if view_writes:
+        await db.poll_views.bulk_write(view_writes, ordered=False)
+    await db.polls.bulk_write(poll_writes, ordered=False)
+    return len(poll_writes)
+
+
+async def attach_votes(polls: list, username: str):
+    """Add the caller's vote to each poll, and voter lists to polls that show them."""
+    if not polls:
+        return
+    poll_ids = [poll["id"] for poll in polls]
+    my_votes = await db.poll_votes.find(
+        {"poll_id": {"$in": poll_ids}, "username": username},
+        {"_id": 0, "poll_id": 1, "option_index": 1}
+    ).to_list(None)
+    my_vote_by_poll = {vote["poll_id"]: vote["option_index"] for vote in my_votes}
+
+    voters_by_poll = {}
+    public_ids = [poll["id"] for poll in polls if poll.get("show_voters")]
+    if public_ids:
+        async for vote in db.poll_votes.find(
+            {"poll_id": {"$in": public_ids}},
+            {"_id": 0, "poll_id": 1, "username": 1, "option_index": 1}
+        ).sort("voted_at", 1):
+            voters_by_poll.setdefault(vote["poll_id"], {}).setdefault(vote["option_index"], []).append(vote["username"])
+
+    for poll in polls:
+        poll["my_vote"] = my_vote_by_poll.get(poll["id"])
+        voters = voters_by_poll.get(poll["id"], {})
+        for index, opt in enumerate(poll.get("options", [])):
+            opt["vote_count"] = option_vote_count(opt)
+            if poll.get("show_voters"):
+                opt["voters"] = voters.get(index, [])
 
 
 @router.get("")
-async def get_polls(current_user: dict = Depends(get_current_moderator)):
+async def get_polls(current_user: dict = Depends(get_current_moderator),
+                    etag: str = Depends(conditional_get("polls", scope="user"))):
     """Get all active polls."""
     polls = await db.polls.find({"is_active": True}, {"_id": 0}).sort("created_at", -1).to_list(10)
-    return polls
+    await attach_votes(polls, current_user["username"])
+    return fast_json_response(polls, headers=cache_headers(etag))
 
 
 @router.get("/check-new")
 async def check_new_polls(current_user: dict = Depends(get_current_moderator)):
     """Check if there are polls the user hasn't viewed yet."""
     username = current_user["username"]
-    unviewed_polls = await db.polls.count_documents({
-        "is_active": True,
-        "viewed_by": {"$ne": username}
-    })
+    active = await db.polls.find({"is_active": True}, {"_id": 0, "id": 1}).to_list(None)
+    active_ids = [poll["id"] for poll in active]
+    viewed = await db.poll_views.count_documents({"poll_id": {"$in": active_ids}, "username": username}) if active_ids else 0
+    unviewed_polls = len(active_ids) - viewed
     return {"has_new_polls": unviewed_polls > 0, "count": unviewed_polls}
 
 
 @router.post("/{poll_id}/mark-viewed")
 async def mark_poll_viewed(poll_id: str, current_user: dict = Depends(get_current_moderator)):
     """Mark a poll as viewed by the current user."""
-    username = current_user["username"]
-    await db.polls.update_one(
-        {"id": poll_id},
-        {"$addToSet": {"viewed_by": username}}
+    await db.poll_views.update_one(
+        {"poll_id": poll_id, "username": current_user["username"]},
+        {"$setOnInsert": {"viewed_at": datetime.now(timezone.utc)}},
+        upsert=True
     )
     return {"message": "Poll marked as viewed"}
 
@@ -83,14 +213,14 @@ async def create_poll(poll_data: PollCreate, current_user: dict = Depends(get_cu
     
     if len(poll_data.options) < 2:
         raise HTTPException(status_code=400, detail="Poll must have at least 2 options")
-    if len(poll_data.options) > 6:
-        raise HTTPException(status_code=400, detail="Poll cannot have more than 6 options")
+    if len(poll_data.options) > MAX_POLL_OPTIONS:
+        raise HTTPException(status_code=400, detail=f"Poll cannot have more than {MAX_POLL_OPTIONS} options")
     
     active_polls_count = await db.polls.count_documents({"is_active": True})
     if active_polls_count >= 2:
         raise HTTPException(status_code=400, detail="Maximum of 2 active polls allowed. Please wait for an existing poll to close.")
     
-    options = [{"text": opt, "votes": []} for opt in poll_data.options]
+    options = [PollOption(text=opt).model_dump() for opt in poll_data.options]
     
     new_poll = Poll(
         question=poll_data.question,
@@ -99,11 +229,10 @@ async def create_poll(poll_data: PollCreate, current_user: dict = Depends(get_cu
         created_by=current_user["username"]
     )
     
-    poll_doc = new_poll.model_dump()
-    poll_doc['created_at'] = poll_doc['created_at'].isoformat()
-    poll_doc['expires_at'] = poll_doc['expires_at'].isoformat()
-    
-    await db.polls.insert_one(poll_doc)
+    await db.polls.insert_one(new_poll.model_dump())
+    await collection_versions.bump("polls")
+    poll_expiry_scheduler.wake()
+    await event_broker.publish("poll.created", {"id": new_poll.id})
     return {"message": "Poll created successfully", "id": new_poll.id}
 
 
@@ -112,34 +241,38 @@ async def vote_on_poll(poll_id: str, option_index: int, current_user: dict = Dep
     """Vote on a poll."""
     username = current_user["username"]
     
-    poll = await db.polls.find_one({"id": poll_id, "is_active": True}, {"_id": 0})
-    if not poll:
-        raise HTTPException(status_code=404, detail="Poll not found or already closed")
-    
-    # Check if user already voted
-    for opt in poll.get("options", []):
-        if username in opt.get("votes", []):
-            raise HTTPException(status_code=400, detail="You have already voted on this poll")
-    
-    if option_index < 0 or option_index >= len(poll.get("options", [])):
+    if option_index < 0 or option_index >= MAX_POLL_OPTIONS:
         raise HTTPException(status_code=400, detail="Invalid option")
     
-    # Add vote
-    await db.polls.update_one(
-        {"id": poll_id},
-        {"$push": {f"options.{option_index}.votes": username}}
-    )
+    # The unique (poll_id, username) index makes duplicate votes impossible under races
+    vote = {
+        "poll_id": poll_id,
+        "username": username,
+        "option_index": option_index,
+        "voted_at": datetime.now(timezone.utc)
+    }
+    try:
+        await db.poll_votes.insert_one(vote)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="You have already voted on this poll")
     
-    # Check if all moderators have voted (auto-close)
-    updated_poll = await db.polls.find_one({"id": poll_id}, {"_id": 0})
-    all_moderators = await db.moderators.find({"status": "active"}, {"_id": 0, "username": 1}).to_list(1000)
-    all_usernames = {mod["username"] for mod in all_moderators}
+    # Count the vote only if the poll is still open and the option exists
+    poll = await db.polls.find_one_and_update(
+        {"id": poll_id, "is_active": True, f"options.{option_index}": {"$exists": True}},
+        {"$inc": {f"options.{option_index}.vote_count": 1, "total_votes": 1}},
+        projection={"_id": 0, "total_votes": 1},
+        return_document=ReturnDocument.AFTER
+    )
     
-    voted_users = set()
-    for opt in updated_poll.get("options", []):
-        voted_users.update(opt.get("votes", []))
+    if not poll:
+        await db.poll_votes.delete_one({"poll_id": poll_id, "username": username})
+        if not await db.polls.count_documents({"id": poll_id, "is_active": True}, limit=1):
+            raise HTTPException(status_code=404, detail="Poll not found or already closed")
+        raise HTTPException(status_code=400, detail="Invalid option")
+    await collection_versions.bump("polls")
     
-    if all_usernames == voted_users:
+    # Auto-close once every active moderator has voted
+    if poll.get("total_votes", 0) >= await moderator_cache.active_count():
         await close_and_archive_poll(poll_id)
     
     return {"message": "Vote recorded successfully"}
@@ -154,6 +287,10 @@ async def delete_poll(poll_id: str, current_user: dict = Depends(get_current_mod
     result = await db.polls.delete_one({"id": poll_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Poll not found")
+    await db.poll_votes.delete_many({"poll_id": poll_id})
+    await db.poll_views.delete_many({"poll_id": poll_id})
+    await collection_versions.bump("polls")
+    await event_broker.publish("poll.deleted", {"id": poll_id})
     return {"message": "Poll deleted successfully"}
 
 
@@ -161,19 +298,15 @@ async def delete_poll(poll_id: str, current_user: dict = Depends(get_current_mod
 async def get_archived_polls(current_user: dict = Depends(get_current_moderator)):
     """Get all archived polls."""
     archived = await db.archived_polls.find({}, {"_id": 0}).sort("closed_at", -1).to_list(100)
-    return archived
+    return fast_json_response(archived)
 
 
 @router.post("/check-expired")
-async def check_expired_polls():
-    """Check and close expired polls."""
-    now = datetime.now(timezone.utc).isoformat()
-    expired_polls = await db.polls.find({
-        "is_active": True,
-        "expires_at": {"$lte": now}
-    }, {"_id": 0}).to_list(10)
-    
-    for poll in expired_polls:
-        await close_and_archive_poll(poll["id"])
-    
-    return {"message": f"Checked and closed {len(expired_polls)} expired polls"}
+async def check_expired_polls(current_user: dict = Depends(get_current_moderator)):
+    """Close expired polls now (admin only); the expiry scheduler normally does this."""
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Only Admin can trigger the poll expiry check")
+    
+    closed = await close_expired_polls()
+    poll_expiry_scheduler.wake()
+    return {"message": f"Checked and closed {closed} expired polls"}
@@ -1,11 +1,11 @@
 """Server assignment routes."""
 from fastapi import APIRouter, HTTPException, Depends
 from typing import List
-from datetime import datetime
 
 from database import db
 from models.schemas import ServerAssignment, ServerAssignmentCreate, ServerAssignmentUpdate
 from utils.auth import get_current_moderator, require_admin
+from utils.collection_versions import collection_versions, conditional_get
 
 router = APIRouter(prefix="/server-assignments", tags=["Server Assignments"])
 
@@ -14,23 +14,16 @@ router = APIRouter(prefix="/server-assignments", tags=["Server Assignments"])
 async def create_server_assignment(assignment: ServerAssignmentCreate, current_user: dict = Depends(get_current_moderator)):
     """Create a new server assignment."""
     assignment_obj = ServerAssignment(**assignment.model_dump(), created_by=current_user['username'])
-    doc = assignment_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    
-    await db.server_assignments.insert_one(doc)
+    await db.server_assignments.insert_one(assignment_obj.model_dump())
+    await collection_versions.bump("server_assignments")
     return assignment_obj
 
 
 @router.get("", response_model=List[ServerAssignment])
-async def get_server_assignments(current_user: dict = Depends(get_current_moderator)):
+async def get_server_assignments(current_user: dict = Depends(get_current_moderator),
+                                 etag: str = Depends(conditional_get("server_assignments", scope="moderator"))):
     """Get all server assignments."""
-    assignments = await db.server_assignments.find({}, {"_id": 0}).sort("created_at", -1).to_list(1000)
-    
-    for assignment in assignments:
-        if isinstance(assignment.get('created_at'), str):
-            assignment['created_at'] = datetime.fromisoformat(assignment['created_at'])
-    
-    return assignments
+    return await db.server_assignments.find({}, {"_id": 0}).sort("created_at", -1).to_list(1000)
 
 
 @router.patch("/{assignment_id}")
@@ -44,6 +37,7 @@ async def update_server_assignment(assignment_id: str, update: ServerAssignmentU
         {"id": assignment_id},
         {"$set": {"end_date": update.end_date}}
     )
+    await collection_versions.bump("server_assignments")
     
     return {"message": "End date updated successfully"}
 
@@ -55,5 +49,6 @@ async def delete_server_assignment(assignment_id: str, current_user: dict = Depe
     
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Server assignment not found")
+    await collection_versions.bump("server_assignments")
     
     return {"message": "Server assignment deleted successfully"}
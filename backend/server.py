@@ -1,11 +1,32 @@
 """Main FastAPI application - Top War Moderator Portal."""
+import asyncio
 import os
 import logging
+
+# Imported first: the startup report's clock starts here and times the imports below
+from utils.startup import startup_report
+
 from fastapi import FastAPI, APIRouter
 from starlette.middleware.cors import CORSMiddleware
 
-from database import db, close_db_connection
-from routes import auth, moderators, applications, polls, announcements, server_assignments, audit_logs, easter_eggs, feature_requests, image_generation
+from database import db, close_db_connection, mongo_settings, warm_pool
+from routes import auth, moderators, applications, polls, announcements, server_assignments, audit_logs, easter_eggs, feature_requests, image_generation, admin, events, health
+from utils.auth import password_hasher
+from utils.config_cache import application_settings_cache
+from utils.egg_credentials import easter_egg_cache
+from utils.date_backfill import date_backfill
+from utils.email_templates import preload_templates
+from utils.events import event_broker
+from utils.indexes import ensure_indexes
+from utils.metrics import MetricsMiddleware
+from utils.outbox import outbox_worker
+from utils.poll_scheduler import poll_expiry_scheduler
+from utils.view_buffer import application_view_buffer
+from utils.search import backfill_search_terms
+from utils.slow_queries import slow_query_log
+
+# Connections opened before reporting ready, so the first requests don't pay for TCP/TLS handshakes
+STARTUP_WARM_CONNECTIONS = int(os.environ.get('STARTUP_WARM_CONNECTIONS', str(max(4, mongo_settings.min_pool_size))))
 
 # Create the main app
 app = FastAPI(title="Top War Moderator Application API")
@@ -31,6 +52,9 @@ api_router.include_router(audit_logs.router)
 api_router.include_router(easter_eggs.router)
 api_router.include_router(feature_requests.router)
 api_router.include_router(image_generation.router)
+api_router.include_router(admin.router)
+api_router.include_router(events.router)
+api_router.include_router(health.router)
 
 # Include the API router in the main app
 app.include_router(api_router)
@@ -42,7 +66,10 @@ app.add_middleware(
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
+# Outermost, so recorded latency covers every other middleware too
+app.add_middleware(MetricsMiddleware)
 
 # Configure logging
 logging.basicConfig(
@@ -50,17 +77,87 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
+startup_report.record("imports", startup_report.elapsed_ms())
+
+
+async def run_migrations():
+    """Backfill search terms and move embedded votes, views and plaintext egg passwords out of the way."""
+    backfilled = await backfill_search_terms(db)
+    if backfilled:
+        logger.info(f"Backfilled search terms for {backfilled} applications")
+    migrated = await polls.migrate_embedded_poll_votes()
+    if migrated:
+        logger.info(f"Moved embedded votes and views of {migrated} polls into poll_votes/poll_views")
+    migrated = await applications.migrate_embedded_application_views()
+    if migrated:
+        logger.info(f"Moved embedded views of {migrated} applications into application_views")
+    migrated = await applications.migrate_embedded_application_threads()
+    if migrated:
+        logger.info(f"Moved embedded votes and comments of {migrated} applications into side collections")
+    migrated = await easter_eggs.migrate_plaintext_egg_passwords()
+    if migrated:
+        logger.info(f"Hashed the plaintext passwords of {migrated} easter egg pages")
+
+
+def start_background_workers():
+    outbox_worker.start()
+    poll_expiry_scheduler.start()
+    event_broker.start()
+    application_view_buffer.start()
+    date_backfill.start()
+    application_settings_cache.start()
+    easter_egg_cache.start()
+    slow_query_log.start(db)
+
+
+async def prepare_data():
+    """Indexes, the capped events collection, migrations and seeding; must finish before any request is served.
+
+    Migrations rewrite documents that routes also write (tallies, vote and
+    comment threads, egg passwords), so running them alongside traffic would
+    lose or duplicate those writes.
+    """
+    await startup_report.timed("indexes", ensure_indexes(db))
+    await startup_report.timed("events_collection", event_broker.ensure_collection())
+    await startup_report.timed("migrations", run_migrations())
+    await startup_report.timed("seed_easter_eggs", easter_eggs.initialize_easter_eggs())
+
+
+async def warm_up():
+    """Deferrable warm-up that must finish before the process reports ready, one timed phase each."""
+    # Loading the bcrypt backend and the first hash don't touch Mongo; overlap them with it
+    hashing = asyncio.create_task(startup_report.timed("password_hashing", password_hasher.hash("warm-up")))
+    try:
+        await startup_report.timed("mongo_pool", warm_pool(STARTUP_WARM_CONNECTIONS))
+        async with startup_report.phase("config_caches"):
+            await asyncio.gather(application_settings_cache.reload(), easter_egg_cache.reload())
+        async with startup_report.phase("email_templates"):
+            await asyncio.to_thread(preload_templates)
+        async with startup_report.phase("workers"):
+            start_background_workers()
+        await hashing
+    finally:
+        hashing.cancel()
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize easter egg pages on startup."""
-    from routes.easter_eggs import initialize_easter_eggs
-    await initialize_easter_eggs()
-    logger.info("Easter egg pages initialized")
+    """Reconcile indexes, migrate and seed before serving, then warm up pools, caches and workers in the background; /api/health/ready reports when that is done."""
+    await prepare_data()
+    startup_report.start(warm_up())
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Close database connection on shutdown."""
+    """Stop the warm-up if still running, background workers and config caches, release the hashing pool and close the database connection on shutdown."""
+    await startup_report.stop()
+    await slow_query_log.stop()
+    await easter_egg_cache.stop()
+    await application_settings_cache.stop()
+    await date_backfill.stop()
+    await application_view_buffer.stop()
+    await event_broker.stop()
+    await poll_expiry_scheduler.stop()
+    await outbox_worker.stop()
+    password_hasher.shutdown()
     await close_db_connection()
@@ -0,0 +1,108 @@
+"""
+Announcement Feed Cache Tests
+Offline tests for the pre-serialized public announcements feed:
+1. Repeated reads are served from memory without reloading
+2. A version bump or explicit invalidation triggers exactly one rebuild
+3. The TTL caps the age of a cached body
+4. Concurrent misses share a single load
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "topwar_test")
+
+from utils.announcement_cache import AnnouncementFeedCache
+from utils.collection_versions import collection_versions
+
+
+class FakeFeedCache(AnnouncementFeedCache):
+    """Loads from a list instead of Mongo and counts loads."""
+
+    def __init__(self, rows, ttl=30.0):
+        super().__init__(ttl=ttl)
+        self.rows = rows
+        self.loads = 0
+
+    async def _load(self):
+        self.loads += 1
+        await asyncio.sleep(0)
+        return list(self.rows)
+
+
+@pytest.fixture(autouse=True)
+def cached_versions():
+    """Serve the announcements version from memory so no database access happens."""
+    saved = (collection_versions._versions, collection_versions._expires)
+    collection_versions._versions = {"announcements": ("abcd1234", 1)}
+    collection_versions._expires = time.monotonic() + 60
+    yield
+    collection_versions._versions, collection_versions._expires = saved
+
+
+def _rows():
+    return [{"id": "a1", "title": "Hello", "is_active": True,
+             "created_at": datetime(2025, 1, 1, tzinfo=timezone.utc)}]
+
+
+def test_repeated_reads_hit_memory():
+    cache = FakeFeedCache(_rows())
+
+    async def scenario():
+        first = await cache.get()
+        second = await cache.get()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first is second
+    assert json.loads(first) == [{"id": "a1", "title": "Hello", "is_active": True,
+                                  "created_at": "2025-01-01T00:00:00Z"}]
+    assert cache.loads == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_version_bump_and_invalidate_rebuild_once():
+    cache = FakeFeedCache(_rows())
+
+    async def scenario():
+        await cache.get()
+        collection_versions._versions["announcements"] = ("abcd1234", 2)
+        cache.rows = []
+        after_bump = await cache.get()
+        await cache.get()
+        cache.invalidate()
+        await cache.get()
+        return after_bump
+
+    assert asyncio.run(scenario()) == b"[]"
+    assert cache.loads == 3
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_ttl_caps_body_age():
+    cache = FakeFeedCache(_rows(), ttl=0.0)
+
+    async def scenario():
+        await cache.get()
+        await cache.get()
+
+    asyncio.run(scenario())
+    assert cache.loads == 2
+
+
+def test_concurrent_misses_share_one_load():
+    cache = FakeFeedCache(_rows())
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get() for _ in range(20)))
+
+    bodies = asyncio.run(scenario())
+    assert cache.loads == 1
+    assert len(set(bodies)) == 1
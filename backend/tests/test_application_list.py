@@ -0,0 +1,129 @@
+"""
+Application List Route Tests
+Offline tests for GET /api/applications against an in-memory collection:
+1. Following X-Next-Cursor pages through every application exactly once
+2. The cursor header survives with FAST_JSON_RESPONSES off
+"""
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "topwar_test")
+os.environ.setdefault("EMAIL_FROM", "noreply@example.com")
+
+from routes import applications
+from utils import responses, view_buffer
+from utils.auth import get_current_moderator
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _matches(doc: dict, query: dict) -> bool:
+    for field, condition in query.items():
+        if field == "$or":
+            if not any(_matches(doc, branch) for branch in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = doc.get(field)
+            for operator, operand in condition.items():
+                if operator == "$lt" and not value < operand:
+                    return False
+                if operator == "$gt" and not value > operand:
+                    return False
+                if operator == "$in" and value not in operand:
+                    return False
+                if operator == "$type" and not isinstance(value, {"string": str, "date": datetime}[operand]):
+                    return False
+        elif doc.get(field) != condition:
+            return False
+    return True
+
+
+class _FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, keys):
+        for field, direction in reversed(keys):
+            self.docs.sort(key=lambda doc: doc[field], reverse=direction < 0)
+        return self
+
+    def limit(self, count):
+        self.docs = self.docs[:count]
+        return self
+
+    async def to_list(self, length):
+        return self.docs[:length] if length else self.docs
+
+
+class _FakeCollection:
+    def __init__(self, docs=()):
+        self.docs = list(docs)
+
+    def find(self, query, projection=None):
+        return _FakeCursor([dict(doc) for doc in self.docs if _matches(doc, query)])
+
+
+class _FakeDatabase:
+    def __init__(self, rows):
+        self.applications = _FakeCollection(rows)
+        self.application_votes = _FakeCollection()
+        self.application_views = _FakeCollection()
+
+
+def _row(index: int) -> dict:
+    return {"id": f"app-{index}", "name": "Applicant", "discord_handle": "handle", "ingame_name": "Hero",
+            "position": "Discord", "server": "42", "status": "pending",
+            "submitted_at": START + timedelta(hours=index // 2)}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    fake_db = _FakeDatabase([_row(index) for index in range(5)])
+    monkeypatch.setattr(applications, "db", fake_db)
+    monkeypatch.setattr(view_buffer, "db", fake_db)
+
+    async def moderator(username):
+        return {"username": username, "can_view_applications": True}
+
+    monkeypatch.setattr(applications.moderator_cache, "get", moderator)
+    app = FastAPI()
+    app.include_router(applications.router)
+    app.dependency_overrides[get_current_moderator] = lambda: {"username": "alice"}
+    return TestClient(app)
+
+
+def _all_pages(client) -> list:
+    ids, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": 2, "view": "summary", **({"cursor": cursor} if cursor else {})}
+        response = client.get("/applications", params=params)
+        assert response.status_code == 200
+        ids.extend(row["id"] for row in response.json())
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return ids, pages
+
+
+def test_cursor_pages_through_every_application(client):
+    ids, pages = _all_pages(client)
+    assert pages == 3
+    assert ids == ["app-4", "app-3", "app-2", "app-1", "app-0"]
+
+
+def test_cursor_header_kept_without_fast_json(client, monkeypatch):
+    monkeypatch.setattr(responses, "FAST_JSON_RESPONSES", False)
+    ids, pages = _all_pages(client)
+    assert pages == 3
+    assert sorted(ids) == [f"app-{index}" for index in range(5)]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,76 @@
+"""
+Application Search Tests
+Offline tests for the indexed prefix search behind GET /api/applications?search=:
+1. Tokenizing ignores case and punctuation
+2. search_terms hold every prefix, including joined multi-part handles
+3. Search filters never embed raw user input in a regex
+4. Ranking prefers exact matches on heavier fields
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.search import build_search_filter, build_search_terms, rank_applications, tokenize
+
+
+class TestSearchTerms:
+    """Test tokenizing and search term generation"""
+
+    def test_tokenize_lowercases_and_splits_punctuation(self):
+        assert tokenize("xX_Troll.Master-99") == ["xx", "troll", "master", "99"]
+
+    def test_terms_contain_every_prefix(self):
+        terms = build_search_terms({"ingame_name": "Kyrios"})
+        assert {"k", "ky", "kyr", "kyri", "kyrio", "kyrios"} <= set(terms)
+
+    def test_terms_include_joined_handle(self):
+        terms = build_search_terms({"discord_handle": "Troll_Master"})
+        assert "trollmaster" in terms
+        assert "master" in terms
+
+    def test_server_numbers_are_searchable(self):
+        assert "12" in build_search_terms({"server": "1234"})
+
+
+class TestSearchFilter:
+    """Test the Mongo filter built from user input"""
+
+    def test_filter_requires_all_tokens(self):
+        assert build_search_filter("Tor  VEN") == {"search_terms": {"$all": ["tor", "ven"]}}
+
+    def test_regex_metacharacters_are_not_passed_through(self):
+        search_filter = build_search_filter(".*(a+)+$")
+        assert "$regex" not in str(search_filter)
+        assert search_filter == {"search_terms": {"$all": ["a"]}}
+
+    def test_punctuation_only_search_has_no_filter(self):
+        assert build_search_filter("!!! ...") is None
+
+
+class TestRanking:
+    """Test relevance ordering"""
+
+    def test_exact_match_outranks_prefix_match(self):
+        docs = [
+            {"id": "prefix", "ingame_name": "Dragonslayer"},
+            {"id": "exact", "ingame_name": "Dragon"},
+        ]
+        assert [doc["id"] for doc in rank_applications(docs, "dragon")] == ["exact", "prefix"]
+
+    def test_name_outranks_server(self):
+        docs = [
+            {"id": "server", "server": "77", "ingame_name": "Other"},
+            {"id": "name", "ingame_name": "77"},
+        ]
+        assert rank_applications(docs, "77")[0]["id"] == "name"
+
+    def test_ties_keep_newest_first_order(self):
+        docs = [{"id": "newer", "ingame_name": "Ash"}, {"id": "older", "ingame_name": "Ash"}]
+        assert [doc["id"] for doc in rank_applications(docs, "ash")] == ["newer", "older"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
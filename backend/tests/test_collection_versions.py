@@ -0,0 +1,100 @@
+"""
+Collection Version / ETag Tests
+Offline tests for conditional GET support:
+1. ETags are weak, change with the version and epoch, and vary per user when asked
+2. If-None-Match matching handles weak and strong tags, lists and "*"
+3. A matching If-None-Match is answered with 304 from cached versions, without a handler or database call
+"""
+import os
+import sys
+import time
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "topwar_test")
+
+from utils.collection_versions import (
+    CACHE_CONTROL, build_etag, collection_versions, conditional_get, etag_matches,
+)
+
+
+def test_etag_is_weak_and_tracks_version_and_epoch():
+    etag = build_etag("polls", "abcd1234", 3)
+    assert etag == 'W/"polls-abcd1234-3"'
+    assert build_etag("polls", "abcd1234", 4) != etag
+    assert build_etag("polls", "ffff0000", 3) != etag
+
+
+def test_etag_variant_differs_per_user_without_leaking_username():
+    alice = build_etag("polls", "abcd1234", 3, "alice")
+    bob = build_etag("polls", "abcd1234", 3, "bob")
+    assert alice != bob
+    assert "alice" not in alice
+    assert build_etag("polls", "abcd1234", 3, "alice") == alice
+
+
+@pytest.mark.parametrize("header", [
+    'W/"polls-abcd1234-3"',
+    '"polls-abcd1234-3"',
+    '"other-1", W/"polls-abcd1234-3"',
+    "*",
+])
+def test_if_none_match_matches(header):
+    assert etag_matches(header, 'W/"polls-abcd1234-3"')
+
+
+@pytest.mark.parametrize("header", [None, "", 'W/"polls-abcd1234-2"', '"other-1", "other-2"'])
+def test_if_none_match_misses(header):
+    assert not etag_matches(header, 'W/"polls-abcd1234-3"')
+
+
+@pytest.fixture
+def cached_versions():
+    """Pretend the announcements counter was just read, so no database access happens."""
+    saved = (collection_versions._versions, collection_versions._expires)
+    collection_versions._versions = {"announcements": ("abcd1234", 7)}
+    collection_versions._expires = time.monotonic() + 60
+    yield
+    collection_versions._versions, collection_versions._expires = saved
+
+
+@pytest.fixture
+def client(cached_versions):
+    app = FastAPI()
+    calls = []
+
+    @app.get("/announcements")
+    async def announcements(etag: str = Depends(conditional_get("announcements"))):
+        calls.append(etag)
+        return [{"id": "1"}]
+
+    test_client = TestClient(app)
+    test_client.calls = calls
+    return test_client
+
+
+def test_first_request_gets_etag_and_cache_control(client):
+    response = client.get("/announcements")
+    assert response.status_code == 200
+    assert response.headers["etag"] == build_etag("announcements", "abcd1234", 7)
+    assert response.headers["cache-control"] == CACHE_CONTROL
+    assert response.json() == [{"id": "1"}]
+
+
+def test_matching_if_none_match_is_304_without_running_handler(client):
+    etag = build_etag("announcements", "abcd1234", 7)
+    response = client.get("/announcements", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert client.calls == []
+
+
+def test_stale_if_none_match_gets_full_response(client):
+    response = client.get("/announcements", headers={"If-None-Match": build_etag("announcements", "abcd1234", 6)})
+    assert response.status_code == 200
+    assert client.calls == [build_etag("announcements", "abcd1234", 7)]
@@ -0,0 +1,91 @@
+"""
+Config Cache Tests
+Offline tests for the change-stream driven config collection cache:
+1. Insert, update, replace and delete events keep the keyed copy current
+2. A changed natural key moves the document instead of leaving a stale entry
+3. Drop, rename and invalidate events force a reload
+4. Reads load the collection once on first use
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "topwar_test")
+
+from utils.config_cache import ConfigCache, _StreamInvalidated
+
+
+class FakeConfigCache(ConfigCache):
+    """Loads from a list instead of Mongo and counts loads."""
+
+    def __init__(self, docs):
+        super().__init__("easter_eggs", "page_key")
+        self.source = docs
+        self.loads = 0
+
+    async def reload(self):
+        self.loads += 1
+        self._docs, self._keys = {}, {}
+        for doc in self.source:
+            self._store(dict(doc))
+        self._loaded = True
+
+
+def _egg(oid, page_key, **fields):
+    return {"_id": oid, "page_key": page_key, "username": page_key.title(), "is_active": True, **fields}
+
+
+def _loaded(docs):
+    cache = FakeConfigCache(docs)
+    asyncio.run(cache.reload())
+    return cache
+
+
+def _get(cache, key):
+    return asyncio.run(cache.get(key))
+
+
+def test_reads_load_once_and_hide_object_ids():
+    cache = FakeConfigCache([_egg(1, "troll")])
+    assert _get(cache, "troll") == {"page_key": "troll", "username": "Troll", "is_active": True}
+    assert _get(cache, "missing") is None
+    assert cache.loads == 1
+
+
+def test_insert_update_and_delete_events():
+    cache = _loaded([_egg(1, "troll")])
+    cache.apply_change({"operationType": "insert", "documentKey": {"_id": 2},
+                        "fullDocument": _egg(2, "garuda")})
+    cache.apply_change({"operationType": "update", "documentKey": {"_id": 1},
+                        "fullDocument": _egg(1, "troll", is_active=False)})
+    assert _get(cache, "garuda")["username"] == "Garuda"
+    assert _get(cache, "troll")["is_active"] is False
+
+    cache.apply_change({"operationType": "delete", "documentKey": {"_id": 2}})
+    assert _get(cache, "garuda") is None
+    assert cache.changes == 3
+
+
+def test_update_of_deleted_document_removes_it():
+    cache = _loaded([_egg(1, "troll")])
+    cache.apply_change({"operationType": "update", "documentKey": {"_id": 1}, "fullDocument": None})
+    assert _get(cache, "troll") is None
+
+
+def test_changed_key_moves_document():
+    cache = _loaded([_egg(1, "troll")])
+    cache.apply_change({"operationType": "replace", "documentKey": {"_id": 1},
+                        "fullDocument": _egg(1, "prank")})
+    assert _get(cache, "troll") is None
+    assert _get(cache, "prank")["page_key"] == "prank"
+
+
+@pytest.mark.parametrize("operation", ["drop", "rename", "dropDatabase", "invalidate"])
+def test_collection_level_events_invalidate(operation):
+    cache = _loaded([_egg(1, "troll")])
+    with pytest.raises(_StreamInvalidated):
+        cache.apply_change({"operationType": operation})
@@ -0,0 +1,56 @@
+"""
+Date Backfill Tests
+Offline tests for the ISO-string to BSON date backfill:
+1. Stored ISO strings parse to aware UTC datetimes
+2. Unparseable values are left alone
+3. Updates only convert string fields and are conditional on the value read
+"""
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "topwar_test")
+
+from utils.date_backfill import DATE_FIELDS, build_backfill_write, parse_timestamp
+
+
+class TestParseTimestamp:
+    """Test parsing of stored ISO timestamps"""
+
+    def test_aware_string(self):
+        parsed = parse_timestamp("2025-01-01T10:00:00.123456+00:00")
+        assert parsed == datetime(2025, 1, 1, 10, 0, 0, 123456, tzinfo=timezone.utc)
+
+    def test_offset_is_kept(self):
+        parsed = parse_timestamp("2025-01-01T12:00:00+02:00")
+        assert parsed.utcoffset() == timedelta(hours=2)
+        assert parsed == datetime(2025, 1, 1, 10, 0, tzinfo=timezone.utc)
+
+    def test_naive_string_is_utc(self):
+        assert parse_timestamp("2025-01-01T10:00:00").tzinfo == timezone.utc
+
+    def test_garbage(self):
+        assert parse_timestamp("yesterday") is None
+
+
+class TestBuildBackfillWrite:
+    """Test the conditional update built for each document"""
+
+    def test_converts_only_strings(self):
+        already = datetime(2025, 1, 2, tzinfo=timezone.utc)
+        doc = {"_id": 1, "submitted_at": "2025-01-01T10:00:00+00:00", "reviewed_at": already}
+        write = build_backfill_write(doc, DATE_FIELDS["applications"])
+        assert write._filter == {"_id": 1, "submitted_at": "2025-01-01T10:00:00+00:00"}
+        assert write._doc == {"$set": {"submitted_at": datetime(2025, 1, 1, 10, tzinfo=timezone.utc)}}
+
+    def test_nothing_to_convert(self):
+        assert build_backfill_write({"_id": 1, "reviewed_at": None}, DATE_FIELDS["applications"]) is None
+        assert build_backfill_write({"_id": 1, "submitted_at": "n/a"}, DATE_FIELDS["applications"]) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
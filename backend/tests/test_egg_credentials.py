@@ -0,0 +1,127 @@
+"""
+Easter Egg Credential Tests
+Offline tests for hashed easter egg verification:
+1. Stored hashes are salted, verify the right password and reject others
+2. The username index only admits active eggs and follows change events
+3. The guess throttle caps attempts per client per minute
+4. Default pages are seeded without plaintext passwords
+5. Ordinary logins never spend a guess, and clients are told apart behind a trusted proxy
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "topwar_test")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routes import easter_eggs
+from routes.easter_eggs import DEFAULT_EASTER_EGGS, build_egg_doc
+from utils.egg_credentials import (EasterEggCache, GuessThrottle, client_address, hash_egg_password,
+                                   verify_egg_password)
+
+
+class FakeEggCache(EasterEggCache):
+    """Loads from a list instead of Mongo."""
+
+    def __init__(self, docs):
+        super().__init__()
+        self.source = docs
+
+    async def reload(self):
+        self._docs, self._keys = {}, {}
+        for doc in self.source:
+            self._store(dict(doc))
+        self._loaded = True
+        self._rebuilt()
+
+
+def _egg(oid, page_key, username, password, is_active=True):
+    return {"_id": oid, "page_key": page_key, "username": username, "is_active": is_active,
+            "password_hash": hash_egg_password(password), "content": {"page": page_key}}
+
+
+def test_hash_is_salted_and_verifies():
+    first, second = hash_egg_password("FunnyGuy"), hash_egg_password("FunnyGuy")
+    assert first != second
+    assert "FunnyGuy" not in first
+    assert verify_egg_password("FunnyGuy", first)
+    assert verify_egg_password("FunnyGuy", second)
+    assert not verify_egg_password("funnyguy", first)
+
+
+def test_malformed_hash_never_verifies():
+    assert not verify_egg_password("x", "")
+    assert not verify_egg_password("x", "md5$salt$digest")
+    assert not verify_egg_password("x", None)
+
+
+def test_verify_uses_active_eggs_only():
+    cache = FakeEggCache([_egg(1, "troll", "Troll", "FunnyGuy"),
+                          _egg(2, "garuda", "Garuda", "Talkingbouy", is_active=False)])
+
+    async def scenario():
+        return (await cache.verify("Troll", "FunnyGuy"), await cache.verify("Troll", "wrong"),
+                await cache.verify("Garuda", "Talkingbouy"), await cache.verify("Nobody", "FunnyGuy"))
+
+    hit, wrong, inactive, unknown = asyncio.run(scenario())
+    assert hit["page_key"] == "troll"
+    assert wrong is None and inactive is None and unknown is None
+
+
+def test_index_follows_change_events():
+    cache = FakeEggCache([_egg(1, "troll", "Troll", "FunnyGuy")])
+    asyncio.run(cache.reload())
+    renamed = _egg(1, "troll", "Trollface", "NewPass")
+    cache.apply_change({"operationType": "update", "documentKey": {"_id": 1}, "fullDocument": renamed})
+
+    async def scenario():
+        return await cache.verify("Troll", "FunnyGuy"), await cache.verify("Trollface", "NewPass")
+
+    old, new = asyncio.run(scenario())
+    assert old is None
+    assert new["page_key"] == "troll"
+
+
+def test_throttle_limits_each_client_separately():
+    throttle = GuessThrottle(per_minute=3)
+    assert [throttle.allow("10.0.0.1") for _ in range(4)] == [True, True, True, False]
+    assert throttle.allow("10.0.0.2")
+    assert throttle.rejected == 1
+    assert 1 <= throttle.retry_after("10.0.0.1") <= 61
+
+
+def test_default_pages_are_seeded_hashed():
+    for egg in DEFAULT_EASTER_EGGS:
+        doc = build_egg_doc(egg)
+        assert "password" not in doc
+        assert verify_egg_password(egg["password"], doc["password_hash"])
+
+
+def test_client_address_trusts_only_configured_hops():
+    assert client_address("10.0.0.9", None, trusted_hops=0) == "10.0.0.9"
+    assert client_address("10.0.0.9", "203.0.113.7", trusted_hops=0) == "10.0.0.9"
+    assert client_address("10.0.0.9", "203.0.113.7", trusted_hops=1) == "203.0.113.7"
+    # A forged leftmost entry is ignored when only one proxy is trusted
+    assert client_address("10.0.0.9", "1.2.3.4, 203.0.113.7", trusted_hops=1) == "203.0.113.7"
+    assert client_address(None, None, trusted_hops=2) == "unknown"
+
+
+def test_ordinary_logins_do_not_spend_guesses(monkeypatch):
+    monkeypatch.setattr(easter_eggs, "easter_egg_cache", FakeEggCache([_egg(1, "troll", "Troll", "FunnyGuy")]))
+    monkeypatch.setattr(easter_eggs, "easter_egg_throttle", GuessThrottle(per_minute=2))
+    app = FastAPI()
+    app.include_router(easter_eggs.router)
+    client = TestClient(app)
+
+    def verify(username, password):
+        return client.post("/easter-eggs/verify", params={"username": username, "password": password})
+
+    assert all(verify(f"moderator{n}", "secret").json() == {"valid": False, "page_key": None} for n in range(5))
+    assert verify("Troll", "wrong").json()["valid"] is False
+    assert verify("Troll", "FunnyGuy").json()["page_key"] == "troll"
+    assert verify("Troll", "FunnyGuy").status_code == 429
+    assert verify("moderator9", "secret").status_code == 200
@@ -0,0 +1,114 @@
+"""
+Email Outbox Sender Tests
+Offline tests for the SMTP delivery layer behind the email outbox, run
+against a local SMTP sink:
+1. Pooled connections are reused across messages
+2. Refused recipients raise without discarding the connection
+3. Retry backoff grows exponentially up to the cap
+4. The rate limiter spaces sends to the configured rate
+5. Messages carry the plain-text alternative before HTML
+"""
+import asyncio
+import os
+import smtplib
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "topwar_test")
+os.environ.setdefault("EMAIL_FROM", "noreply@example.com")
+
+from tests.smtp_sink import SMTPSink
+from utils import outbox
+from utils.outbox import RateLimiter, SMTPConnectionPool, build_message, retry_delay_seconds
+
+
+def _message(to_email="applicant@example.com", body_text=None):
+    return {
+        "to_email": to_email,
+        "subject": "Top War - Application Received",
+        "body_html": "<p>Hello</p>",
+        "body_text": body_text,
+    }
+
+
+class TestConnectionPool:
+    """Test SMTP connection reuse"""
+
+    def test_connections_are_reused(self):
+        with SMTPSink() as sink:
+            pool = SMTPConnectionPool(host=sink.host, port=sink.port, username="", password="",
+                                      starttls=False, size=1)
+            for i in range(10):
+                pool.send(build_message(_message(f"user{i}@example.com")))
+            pool.close()
+
+        assert len(sink.messages) == 10
+        assert sink.connections == 1
+        assert pool.connections_opened == 1
+
+    def test_expired_connections_are_replaced(self):
+        with SMTPSink() as sink:
+            pool = SMTPConnectionPool(host=sink.host, port=sink.port, username="", password="",
+                                      starttls=False, size=1, max_age=0)
+            for _ in range(3):
+                pool.send(build_message(_message()))
+            pool.close()
+
+        assert len(sink.messages) == 3
+        assert pool.connections_opened == 3
+
+    def test_refused_recipient_keeps_connection(self):
+        with SMTPSink(reject_recipients=True) as sink:
+            pool = SMTPConnectionPool(host=sink.host, port=sink.port, username="", password="",
+                                      starttls=False, size=1)
+            for _ in range(2):
+                with pytest.raises(smtplib.SMTPRecipientsRefused):
+                    pool.send(build_message(_message()))
+            pool.close()
+
+        assert sink.messages == []
+        assert pool.connections_opened == 1
+
+
+class TestRetryPolicy:
+    """Test retry backoff and rate limiting"""
+
+    def test_backoff_grows_and_caps(self, monkeypatch):
+        monkeypatch.setattr(outbox.random, "uniform", lambda low, high: 1.0)
+        delays = [retry_delay_seconds(attempt) for attempt in range(1, 12)]
+        assert delays[0] == outbox.EMAIL_RETRY_BASE_SECONDS
+        assert delays[1] == 2 * delays[0]
+        assert delays == sorted(delays)
+        assert delays[-1] == outbox.EMAIL_RETRY_MAX_SECONDS
+
+    def test_rate_limiter_spaces_sends(self):
+        async def acquire_many():
+            limiter = RateLimiter(per_minute=1200, burst=1)
+            started = time.perf_counter()
+            for _ in range(5):
+                await limiter.acquire()
+            return time.perf_counter() - started
+
+        # 1200/min is one token every 50ms; the first is free from the burst
+        assert asyncio.run(acquire_many()) >= 0.18
+
+
+class TestMessageBuilding:
+    """Test MIME message construction"""
+
+    def test_plain_text_precedes_html(self):
+        msg = build_message(_message(body_text="Hello"))
+        parts = [part.get_content_type() for part in msg.get_payload()]
+        assert parts == ["text/plain", "text/html"]
+
+    def test_html_only_without_text(self):
+        msg = build_message(_message())
+        assert [part.get_content_type() for part in msg.get_payload()] == ["text/html"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
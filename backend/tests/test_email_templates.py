@@ -0,0 +1,112 @@
+"""
+Email Template Rendering Tests
+Offline tests for the compiled notification email templates:
+1. Every email type renders an HTML and a plain-text part
+2. Recipient names and manager comments are escaped in HTML only
+3. Optional manager comments are omitted when blank
+4. Batch rendering matches single rendering
+5. A template that fails to render is logged instead of failing the caller
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "topwar_test")
+os.environ.setdefault("EMAIL_FROM", "noreply@example.com")
+
+from utils import email
+from utils.email_templates import APPLY_URL, EMAIL_SUBJECTS, preload_templates, render_batch, render_email
+
+CONTEXT = {"name": "Test User", "manager_comment": "Great answers", "reset_link": "https://example.com/reset?token=abc"}
+
+
+class TestRendering:
+    """Test each email type renders both parts"""
+
+    @pytest.mark.parametrize("email_type", sorted(EMAIL_SUBJECTS))
+    def test_html_and_text_parts(self, email_type):
+        email = render_email(email_type, **CONTEXT)
+        assert email.subject == EMAIL_SUBJECTS[email_type]
+        assert email.html.startswith("<!DOCTYPE html")
+        assert "Hi <strong" in email.html and "Test User" in email.html
+        assert "RiverGames" in email.html
+        assert email.text.startswith("Hi Test User,")
+        assert "<" not in email.text
+        assert "Top War Moderation Team" in email.text
+
+    def test_all_templates_preload(self):
+        assert preload_templates() == 2 * len(EMAIL_SUBJECTS)
+
+    def test_rejection_links_to_apply_page(self):
+        email = render_email("application_rejected", name="Test User", manager_comment="")
+        assert f'href="{APPLY_URL}"' in email.html
+        assert APPLY_URL in email.text
+
+    def test_password_reset_link(self):
+        email = render_email("password_reset", **CONTEXT)
+        assert CONTEXT["reset_link"] in email.html
+        assert CONTEXT["reset_link"] in email.text
+
+    def test_unknown_type_rejected(self):
+        with pytest.raises(KeyError):
+            render_email("not_an_email", **CONTEXT)
+
+
+class TestUserInput:
+    """Test handling of applicant-provided values"""
+
+    def test_html_escapes_user_values(self):
+        email = render_email("application_approved", name="<b>Bob</b>", manager_comment="Tom & Jerry")
+        assert "<b>Bob</b>" not in email.html
+        assert "&lt;b&gt;Bob&lt;/b&gt;" in email.html
+        assert "Tom &amp; Jerry" in email.html
+        assert "Hi <b>Bob</b>," in email.text
+        assert '"Tom & Jerry"' in email.text
+
+    def test_blank_comment_omitted(self):
+        email = render_email("application_approved", name="Test User", manager_comment="")
+        assert "Message from the Training Team" not in email.html
+        assert "Message from the Training Team" not in email.text
+
+
+class TestBatchRendering:
+    """Test rendering one email type for many recipients"""
+
+    def test_batch_matches_single(self):
+        contexts = [{"name": f"User {i}", "manager_comment": f"Comment {i}"} for i in range(5)]
+        batch = render_batch("application_rejected", contexts)
+        assert batch == [render_email("application_rejected", **context) for context in contexts]
+
+
+class TestRenderFailures:
+    """Test that rendering errors never reach the caller"""
+
+    @pytest.fixture
+    def queued(self, monkeypatch):
+        queued = []
+
+        async def enqueue(*args, **kwargs):
+            queued.append(args)
+            return "queued"
+
+        monkeypatch.setattr(email, "enqueue_email", enqueue)
+        monkeypatch.setattr(email, "enqueue_emails", enqueue)
+        return queued
+
+    def test_missing_context_key_is_logged(self, queued, caplog):
+        sent = asyncio.run(email.send_templated_email("application_approved", "a@example.com", name="Test User"))
+        assert sent is False and queued == []
+        assert "Failed to render application_approved" in caplog.text
+
+    def test_unknown_type_is_logged(self, queued):
+        assert asyncio.run(email.send_templated_email("not_an_email", "a@example.com", **CONTEXT)) is False
+        assert asyncio.run(email.send_templated_batch("not_an_email", [{"to_email": "a@example.com"}])) == 0
+        assert queued == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,143 @@
+"""
+Event Broker Tests
+Offline tests for the per-process SSE subscriber registry:
+1. Events are encoded in the text/event-stream format
+2. Every local subscriber receives each event
+3. Slow subscribers are dropped with a single resync event
+4. Stream tickets open one stream and are never accepted as bearer tokens
+5. The capped events collection is created up front, and an uncapped one disables the relay
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from pymongo.errors import CollectionInvalid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "topwar_test")
+
+from utils.auth import create_access_token, create_stream_ticket, decode_stream_ticket, get_current_moderator
+from utils import events
+from utils.events import EVENT_QUEUE_SIZE, RESYNC_EVENT, EventBroker, format_sse
+
+
+class TestEventBroker:
+    """Test local event fan-out"""
+
+    def test_sse_format(self):
+        assert format_sse(7, "poll.created", {"id": "abc"}) == 'id: 7\nevent: poll.created\ndata: {"id":"abc"}\n\n'
+
+    def test_fan_out_to_all_subscribers(self):
+        async def run():
+            broker = EventBroker()
+            first, second = broker.subscribe("alice"), broker.subscribe("bob")
+            broker._deliver("announcement.created", {"id": "a1"})
+            return [s.queue.get_nowait() for s in (first, second)]
+
+        messages = asyncio.run(run())
+        assert all("event: announcement.created" in message for message in messages)
+
+    def test_unsubscribed_clients_receive_nothing(self):
+        async def run():
+            broker = EventBroker()
+            subscriber = broker.subscribe("alice")
+            broker.unsubscribe(subscriber)
+            broker._deliver("poll.closed", {"id": "p1"})
+            return subscriber.queue.qsize(), broker.stats()["subscribers"]
+
+        assert asyncio.run(run()) == (0, 0)
+
+    def test_slow_subscriber_dropped_with_resync(self):
+        async def run():
+            broker = EventBroker()
+            slow, fast = broker.subscribe("slow"), broker.subscribe("fast")
+            for i in range(EVENT_QUEUE_SIZE + 1):
+                broker._deliver("poll.created", {"id": i})
+                fast.queue.get_nowait()
+            return broker, slow, fast
+
+        broker, slow, fast = asyncio.run(run())
+        assert slow.dropped and not fast.dropped
+        assert slow.queue.qsize() == 1
+        assert f"event: {RESYNC_EVENT}" in slow.queue.get_nowait()
+        assert broker.stats()["subscribers"] == 1
+        assert broker.stats()["dropped_subscribers"] == 1
+
+
+class TestStreamTickets:
+    """Test stream ticket scoping"""
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+
+        @app.get("/me")
+        async def me(current_user: dict = Depends(get_current_moderator)):
+            return current_user
+
+        return TestClient(app)
+
+    def test_ticket_rejected_as_bearer_token(self, client):
+        ticket = create_stream_ticket("alice")
+        assert client.get("/me", headers={"Authorization": f"Bearer {ticket}"}).status_code == 401
+        token = create_access_token({"sub": "alice", "role": "moderator"})
+        assert client.get("/me", headers={"Authorization": f"Bearer {token}"}).json()["username"] == "alice"
+
+    def test_ticket_opens_one_stream(self):
+        ticket = create_stream_ticket("alice")
+        assert decode_stream_ticket(ticket) == "alice"
+        with pytest.raises(HTTPException) as exc:
+            decode_stream_ticket(ticket)
+        assert exc.value.status_code == 401
+
+    def test_access_token_is_not_a_ticket(self):
+        with pytest.raises(HTTPException):
+            decode_stream_ticket(create_access_token({"sub": "alice", "scope": "event_stream"}))
+
+
+class _FakeEventsDatabase:
+    def __init__(self, existing_options=None):
+        self.existing_options = existing_options
+        self.created = []
+        self.events = self
+
+    async def create_collection(self, name, **options):
+        if self.existing_options is not None:
+            raise CollectionInvalid(f"collection {name} already exists")
+        self.created.append((name, options))
+
+    async def options(self):
+        return self.existing_options
+
+
+class TestEventsCollection:
+    """Test creation of the capped collection the relay tails"""
+
+    def test_created_capped_before_serving(self, monkeypatch):
+        fake_db = _FakeEventsDatabase()
+        monkeypatch.setattr(events, "db", fake_db)
+        broker = EventBroker()
+        asyncio.run(broker.ensure_collection())
+        assert fake_db.created[0][0] == "events" and fake_db.created[0][1]["capped"] is True
+        assert broker._relay_ready
+
+    def test_uncapped_collection_disables_relay(self, monkeypatch, caplog):
+        monkeypatch.setattr(events, "db", _FakeEventsDatabase(existing_options={}))
+        broker = EventBroker()
+        asyncio.run(broker.ensure_collection())
+        assert not broker._relay_ready
+        assert "not capped" in caplog.text
+
+    def test_existing_capped_collection_is_used(self, monkeypatch):
+        monkeypatch.setattr(events, "db", _FakeEventsDatabase(existing_options={"capped": True}))
+        broker = EventBroker()
+        asyncio.run(broker.ensure_collection())
+        assert broker._relay_ready
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,100 @@
+"""
+Metrics Tests
+Offline tests for request and MongoDB command metrics:
+1. Histograms bucket observations cumulatively and render valid exposition lines
+2. The middleware labels requests by route template, method and status and balances in-flight counts
+3. The command listener attributes durations and document counts to collection and command
+"""
+import os
+import sys
+from types import SimpleNamespace
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "topwar_test")
+
+from utils.metrics import CommandMetricsListener, Histogram, MetricsMiddleware, RouteMetrics
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+    assert histogram.cumulative() == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+    assert histogram.count == 4
+    assert abs(histogram.sum - 3.65) < 1e-9
+
+
+def _client():
+    metrics = RouteMetrics()
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        if item_id == "missing":
+            raise HTTPException(status_code=404)
+        return {"id": item_id}
+
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+    return metrics, TestClient(app)
+
+
+def test_requests_are_labelled_by_route_template():
+    metrics, client = _client()
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/items/missing")
+    client.post("/items/1")
+    client.get("/nowhere")
+
+    series = metrics.latency.series
+    assert series[("GET", "/items/{item_id}", "200")].count == 2
+    assert series[("GET", "/items/{item_id}", "404")].count == 1
+    assert series[("POST", "/items/{item_id}", "405")].count == 1
+    assert series[("GET", "unmatched", "404")].count == 1
+    assert all(count == 0 for count in metrics.in_flight.values())
+
+
+def test_route_metrics_render_prometheus_lines():
+    metrics, client = _client()
+    client.get("/items/1")
+    text = "\n".join(metrics.render())
+    assert "# TYPE topwar_http_request_duration_seconds histogram" in text
+    assert 'topwar_http_request_duration_seconds_bucket{method="GET",route="/items/{item_id}",status="200",le="+Inf"} 1' in text
+    assert 'topwar_http_requests_in_flight{method="GET"} 0' in text
+
+
+def _started(request_id, name, command):
+    return SimpleNamespace(connection_id=("localhost", 27017), request_id=request_id,
+                           command_name=name, command=command)
+
+
+def _succeeded(request_id, name, reply, micros=1500):
+    return SimpleNamespace(connection_id=("localhost", 27017), request_id=request_id,
+                           command_name=name, reply=reply, duration_micros=micros)
+
+
+def test_command_listener_tracks_collection_command_and_documents():
+    listener = CommandMetricsListener()
+    listener.started(_started(1, "find", {"find": "polls", "filter": {}}))
+    listener.succeeded(_succeeded(1, "find", {"cursor": {"firstBatch": [{}, {}], "id": 7}}))
+    listener.started(_started(2, "getMore", {"getMore": 7, "collection": "polls"}))
+    listener.succeeded(_succeeded(2, "getMore", {"cursor": {"nextBatch": [{}], "id": 0}}))
+    listener.started(_started(3, "update", {"update": "polls", "updates": []}))
+    listener.succeeded(_succeeded(3, "update", {"n": 4, "nModified": 4}))
+    listener.started(_started(4, "insert", {"insert": "audit_logs"}))
+    listener.failed(SimpleNamespace(connection_id=("localhost", 27017), request_id=4,
+                                    command_name="insert", duration_micros=900))
+
+    assert listener.latency.series[("polls", "find")].count == 1
+    assert listener._stats[("polls", "find")].documents == 2
+    assert listener._stats[("polls", "getMore")].documents == 1
+    assert listener._stats[("polls", "update")].documents == 4
+    assert listener._stats[("audit_logs", "insert")].failures == 1
+    assert listener._pending == {}
+    text = "\n".join(listener.render())
+    assert 'topwar_mongo_command_documents_total{collection="polls",command="find"} 2' in text
+    assert 'topwar_mongo_command_failures_total{collection="audit_logs",command="insert"} 1' in text
@@ -0,0 +1,96 @@
+"""
+Keyset Pagination Cursor Tests
+Offline tests for the opaque cursors used by GET /api/applications:
+1. Cursors round-trip ISO-string and datetime sort values
+2. Malformed cursors are rejected with a 400
+3. The keyset filter selects rows strictly after the cursor, in either direction,
+   including rows whose timestamp is still stored as a string
+"""
+import base64
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.pagination import decode_cursor, encode_cursor, keyset_filter
+
+
+def _raw_cursor(payload: dict) -> str:
+    """A cursor with an arbitrary payload, as a client could craft one."""
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+class TestCursorEncoding:
+    """Test cursor encoding and decoding"""
+
+    def test_round_trip_string_value(self):
+        cursor = encode_cursor("2025-01-01T10:00:00+00:00", "abc")
+        assert decode_cursor(cursor) == ("2025-01-01T10:00:00+00:00", "abc")
+
+    def test_round_trip_datetime_value(self):
+        submitted_at = datetime(2025, 1, 1, 10, 0, tzinfo=timezone.utc)
+        value, doc_id = decode_cursor(encode_cursor(submitted_at, "abc"))
+        assert value == submitted_at
+        assert doc_id == "abc"
+
+    def test_cursor_is_url_safe(self):
+        cursor = encode_cursor("2025-01-01T10:00:00+00:00", "a/b+c")
+        assert all(ch.isalnum() or ch in "-_" for ch in cursor)
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", "!!!", encode_cursor(1, "x")[:-3],
+                                        _raw_cursor({"t": "s", "v": {"$gt": ""}, "i": "x"}),
+                                        _raw_cursor({"t": "s", "v": 1, "i": "x"}),
+                                        _raw_cursor({"t": "d", "v": {"$gt": ""}, "i": "x"}),
+                                        _raw_cursor({"t": "s", "v": "a", "i": {"$gt": ""}})])
+    def test_malformed_cursor_rejected(self, cursor):
+        with pytest.raises(HTTPException) as exc_info:
+            decode_cursor(cursor)
+        assert exc_info.value.status_code == 400
+
+
+class TestKeysetFilter:
+    """Test the filter built from a cursor"""
+
+    def test_no_cursor_means_first_page(self):
+        assert keyset_filter("submitted_at", None) == {}
+
+    def test_filter_breaks_ties_on_id(self):
+        cursor = encode_cursor("2025-01-01T10:00:00+00:00", "abc")
+        assert keyset_filter("submitted_at", cursor) == {
+            "$or": [
+                {"submitted_at": {"$lt": "2025-01-01T10:00:00+00:00"}},
+                {"submitted_at": "2025-01-01T10:00:00+00:00", "id": {"$lt": "abc"}},
+            ]
+        }
+
+    def test_ascending_filter(self):
+        cursor = encode_cursor("2025-01-01T10:00:00+00:00", "abc")
+        assert keyset_filter("timestamp", cursor, ascending=True) == {
+            "$or": [
+                {"timestamp": {"$gt": "2025-01-01T10:00:00+00:00"}},
+                {"timestamp": "2025-01-01T10:00:00+00:00", "id": {"$gt": "abc"}},
+                # Dates sort after every string
+                {"timestamp": {"$type": "date"}},
+            ]
+        }
+
+    def test_date_cursor_keeps_unconverted_rows(self):
+        submitted_at = datetime(2025, 1, 1, 10, 0, tzinfo=timezone.utc)
+        cursor = encode_cursor(submitted_at, "abc")
+        assert keyset_filter("submitted_at", cursor) == {
+            "$or": [
+                {"submitted_at": {"$lt": submitted_at}},
+                {"submitted_at": submitted_at, "id": {"$lt": "abc"}},
+                # Strings sort after every date when descending
+                {"submitted_at": {"$type": "string"}},
+            ]
+        }
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,75 @@
+"""
+Fast JSON Response Tests
+Offline tests for the serializer-only list responses:
+1. Model-shaped output matches FastAPI's validating response_model path
+2. Extra keys are dropped, optional defaults filled in and absent required fields left out
+3. Plain rows encode datetimes like jsonable_encoder does
+"""
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "topwar_test")
+
+from models.schemas import ApplicationSummary, ModeratorInfo
+from utils.responses import dump_rows_json, shape_row
+
+SUBMITTED_AT = datetime(2025, 1, 1, 10, 0, tzinfo=timezone.utc)
+
+
+def _summary_row(**overrides) -> dict:
+    row = {
+        "id": "app-1", "name": "Applicant", "discord_handle": "handle", "ingame_name": "Hero",
+        "position": "Discord", "server": "42", "status": "pending", "approve_votes": 2,
+        "my_vote": "approve", "viewed": True, "submitted_at": SUBMITTED_AT,
+    }
+    row.update(overrides)
+    return row
+
+
+class TestModelShapedRows:
+    """Test rows encoded against a response model"""
+
+    def test_matches_response_model_path(self):
+        rows = [_summary_row(), _summary_row(id="app-2", my_vote=None, viewed=False)]
+        adapter = TypeAdapter(List[ApplicationSummary])
+        expected = adapter.dump_python(adapter.validate_python(rows), mode="json")
+        assert json.loads(dump_rows_json(rows, ApplicationSummary)) == expected
+
+    def test_extra_keys_dropped_and_defaults_filled(self):
+        shaped = shape_row(_summary_row(search_terms=["app"], previous_experience="..."), ApplicationSummary)
+        assert "search_terms" not in shaped
+        assert "previous_experience" not in shaped
+        assert shaped["reject_votes"] == 0
+        assert shaped["reviewed_at"] is None
+
+    def test_default_factories_are_called(self):
+        shaped = shape_row({"username": "alice", "role": "moderator", "created_at": SUBMITTED_AT}, ModeratorInfo)
+        assert shaped["roles"] == []
+        assert shaped["is_discord_leader"] is False
+
+    def test_missing_required_fields_are_left_out(self):
+        shaped = shape_row({"username": "alice", "role": "moderator", "created_at": SUBMITTED_AT}, ModeratorInfo)
+        assert "status" not in shaped
+
+
+class TestPlainRows:
+    """Test rows encoded without a model"""
+
+    def test_datetimes_are_iso(self):
+        body = json.loads(dump_rows_json([{"id": "log-1", "created_at": SUBMITTED_AT}]))
+        assert datetime.fromisoformat(body[0]["created_at"].replace("Z", "+00:00")) == SUBMITTED_AT
+
+    def test_empty(self):
+        assert dump_rows_json([]) == b"[]"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,164 @@
+"""
+Slow Query Log Tests
+Offline tests for the slow MongoDB command log:
+1. Filters, sorts and pipelines keep their shape with every literal redacted
+2. Only commands over the threshold are queued, and internal commands never are
+3. Commands are attributed to the route template of the request that issued them
+4. Explain output is reduced to examined/returned counts and the winning plan, once per shape
+"""
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "topwar_test")
+
+from utils.metrics import MetricsMiddleware, RouteMetrics
+from utils.slow_queries import (BACKGROUND_ROUTE, SlowQueryLog, command_shape, explain_command,
+                                redact_shape, summarize_explain)
+
+FIND_EXPLAIN = {
+    "queryPlanner": {"winningPlan": {"stage": "FETCH", "inputStage": {
+        "stage": "IXSCAN", "indexName": "status_submitted_at", "indexBounds": {"status": ['["pending", "pending"]']}}}},
+    "executionStats": {"nReturned": 3, "totalDocsExamined": 3, "totalKeysExamined": 3, "executionTimeMillis": 1},
+}
+AGGREGATE_EXPLAIN = {"stages": [
+    {"$cursor": {"queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}},
+                 "executionStats": {"nReturned": 2, "totalDocsExamined": 5000, "totalKeysExamined": 0}}},
+    {"$group": {"_id": {"$const": 1}, "n": {"$sum": {"$const": 1}}}},
+]}
+
+
+def _started(command_name, command, request_id=1):
+    return SimpleNamespace(command_name=command_name, command=command, database_name="topwar_test",
+                           connection_id=("localhost", 27017), request_id=request_id)
+
+
+def _succeeded(command_name, duration_ms, request_id=1, reply=None):
+    return SimpleNamespace(command_name=command_name, duration_micros=int(duration_ms * 1000), request_id=request_id,
+                           connection_id=("localhost", 27017), reply=reply or {"n": 1})
+
+
+def test_literals_are_redacted_and_operators_kept():
+    shape = command_shape("find", {
+        "find": "applications",
+        "filter": {"status": {"$in": ["pending", "approved"]}, "discord_handle": {"$regex": "^bob", "$options": "i"}},
+        "sort": {"submitted_at": -1, "id": -1},
+    })
+    assert shape == {
+        "filter": {"status": {"$in": ["?"]}, "discord_handle": {"$regex": "?", "$options": "?"}},
+        "sort": {"submitted_at": -1, "id": -1},
+    }
+    reset = command_shape("findAndModify", {"findAndModify": "moderators",
+                                            "query": {"password_reset_token": "secret-token"}})
+    assert "secret-token" not in repr(reset)
+    assert redact_shape([{"a": 1}, {"a": 2}, {"b": "x"}]) == [{"a": "?"}, {"b": "?"}]
+
+
+def test_count_pipeline_and_writes_have_shapes():
+    count = command_shape("aggregate", {"aggregate": "polls", "pipeline": [
+        {"$match": {"is_active": True, "viewed_by": {"$ne": "alice"}}},
+        {"$group": {"_id": 1, "n": {"$sum": 1}}},
+    ]})
+    assert count["pipeline"][0] == {"$match": {"is_active": "?", "viewed_by": {"$ne": "?"}}}
+    update = command_shape("update", {"update": "polls", "updates": [{"q": {"id": "p1"}, "u": {"$set": {"x": 1}}}]})
+    assert update == {"filter": {"id": "?"}}
+
+
+def test_explain_command_strips_session_fields_and_extra_statements():
+    command = {"update": "polls", "updates": [{"q": {"id": "a"}}, {"q": {"id": "b"}}],
+               "lsid": {"id": "x"}, "txnNumber": 4, "writeConcern": {"w": 1}, "$db": "topwar_test"}
+    explained = explain_command("update", command)
+    assert explained["verbosity"] == "executionStats"
+    assert explained["explain"] == {"update": "polls", "updates": [{"q": {"id": "a"}}]}
+    assert "maxTimeMS" in explain_command("find", {"find": "polls", "filter": {}})["explain"]
+
+
+def test_only_slow_user_commands_are_queued():
+    log = SlowQueryLog(threshold_ms=50)
+
+    async def scenario():
+        log._loop = asyncio.get_running_loop()
+
+        def issue(command_name, command, duration_ms, request_id):
+            log.started(_started(command_name, command, request_id))
+            log.succeeded(_succeeded(command_name, duration_ms, request_id))
+
+        await asyncio.to_thread(issue, "find", {"find": "polls", "filter": {}}, 10, 1)
+        await asyncio.to_thread(issue, "find", {"find": "polls", "filter": {}}, 80, 2)
+        await asyncio.to_thread(issue, "insert", {"insert": "slow_queries", "documents": []}, 500, 3)
+        await asyncio.to_thread(issue, "getMore", {"getMore": 1, "collection": "events"}, 900, 4)
+        await asyncio.sleep(0)
+        return [log._queue.get_nowait() for _ in range(log._queue.qsize())]
+
+    queued = asyncio.run(scenario())
+    assert [(entry["collection"], entry["duration_ms"]) for entry in queued] == [("polls", 80.0)]
+    assert queued[0]["route"] == BACKGROUND_ROUTE
+    assert log._pending == {}
+
+
+def test_commands_are_attributed_to_the_request_route():
+    log = SlowQueryLog(threshold_ms=0)
+    app = FastAPI()
+
+    def run_command():
+        # Motor runs pymongo on an executor thread with a copy of the caller's context
+        log.started(_started("find", {"find": "applications", "filter": {"id": "abc"}}))
+        log.succeeded(_succeeded("find", 5))
+
+    @app.get("/applications/{application_id}")
+    async def get_application(application_id: str):
+        log._loop = asyncio.get_running_loop()
+        await asyncio.to_thread(run_command)
+        await asyncio.sleep(0)
+        return {"queued": log._queue.get_nowait()["route"]}
+
+    client = TestClient(MetricsMiddleware(app, RouteMetrics()))
+    assert client.get("/applications/abc").json() == {"queued": "GET /applications/{application_id}"}
+
+
+def test_explain_summary_for_find_and_aggregate():
+    find = summarize_explain(FIND_EXPLAIN)
+    assert find["stages"] == ["FETCH", "IXSCAN"]
+    assert find["indexes"] == ["status_submitted_at"]
+    assert find["collscan"] is False
+    assert (find["docs_examined"], find["keys_examined"], find["explain_returned"]) == (3, 3, 3)
+
+    aggregate = summarize_explain(AGGREGATE_EXPLAIN)
+    assert aggregate["collscan"] is True
+    assert (aggregate["docs_examined"], aggregate["explain_returned"]) == (5000, 2)
+
+
+class _FakeDatabase:
+    def __init__(self):
+        self.commands = []
+        self.client = {"topwar_test": self}
+
+    async def command(self, command):
+        self.commands.append(command)
+        return FIND_EXPLAIN
+
+
+def test_each_shape_is_explained_once():
+    log = SlowQueryLog(threshold_ms=0)
+    log._db = _FakeDatabase()
+
+    def candidate(status):
+        return {"database": "topwar_test", "collection": "applications", "command_name": "find",
+                "command": {"find": "applications", "filter": {"status": status}}, "route": "GET /applications",
+                "duration_ms": 240.0, "docs_returned": 3}
+
+    async def scenario():
+        return await log.build_entry(candidate("pending")), await log.build_entry(candidate("approved"))
+
+    first, second = asyncio.run(scenario())
+    assert len(log._db.commands) == 1
+    assert first["shape"] == {"filter": {"status": "?"}}
+    assert first["plan"]["docs_examined"] == 3 and "reused" not in first["plan"]
+    assert second["plan"]["reused"] is True
+    assert first["docs_returned"] == 3 and first["route"] == "GET /applications"
@@ -0,0 +1,98 @@
+"""
+Startup Report and Health Probe Tests
+Offline tests for the cold-start path:
+1. Phases are timed in order and the process turns ready once warm-up finishes
+2. A failing phase is recorded, leaves the process unready and fails liveness
+3. The readiness probe answers 503 until ready and checks MongoDB afterwards
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "topwar_test")
+
+from routes import health
+from utils.startup import StartupReport
+
+
+def _run_warm_up(report: StartupReport, warm_up):
+    async def scenario():
+        report.start(warm_up)
+        await report._task
+
+    asyncio.run(scenario())
+
+
+def test_phases_are_timed_and_ready_after_warm_up():
+    report = StartupReport()
+
+    async def warm_up():
+        async with report.phase("indexes"):
+            await asyncio.sleep(0)
+        await report.timed("seed", asyncio.sleep(0))
+
+    _run_warm_up(report, warm_up())
+    assert [p["phase"] for p in report.phases] == ["indexes", "seed"]
+    assert all(p["status"] == "ok" and p["duration_ms"] >= 0 for p in report.phases)
+    assert report.ready and report.alive
+    assert report.stats()["ready_after_ms"] >= 0
+
+
+def test_failed_phase_is_recorded_and_fails_liveness():
+    report = StartupReport()
+
+    async def warm_up():
+        await report.timed("indexes", asyncio.sleep(0))
+        async with report.phase("migrations"):
+            raise RuntimeError("boom")
+
+    _run_warm_up(report, warm_up())
+    assert report.phases[-1] == {"phase": "migrations", "duration_ms": report.phases[-1]["duration_ms"],
+                                 "status": "failed"}
+    assert report.failed_phase == "migrations"
+    assert not report.ready and not report.alive
+
+
+class _FakeDatabase:
+    def __init__(self, fail: bool):
+        self.fail = fail
+
+    async def command(self, name):
+        if self.fail:
+            raise ConnectionError("no servers")
+        return {"ok": 1}
+
+
+@pytest.fixture
+def probe(monkeypatch):
+    report = StartupReport()
+    monkeypatch.setattr(health, "startup_report", report)
+    app = FastAPI()
+    app.include_router(health.router)
+    return report, TestClient(app)
+
+
+def test_readiness_waits_for_warm_up(probe, monkeypatch):
+    report, client = probe
+    monkeypatch.setattr(health, "db", _FakeDatabase(fail=False))
+    assert client.get("/health/live").status_code == 200
+    assert client.get("/health/ready").status_code == 503
+
+    _run_warm_up(report, asyncio.sleep(0))
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+
+def test_readiness_fails_when_mongo_is_down(probe, monkeypatch):
+    report, client = probe
+    monkeypatch.setattr(health, "db", _FakeDatabase(fail=True))
+    _run_warm_up(report, asyncio.sleep(0))
+    assert client.get("/health/ready").status_code == 503
+    assert client.get("/health/live").status_code == 200
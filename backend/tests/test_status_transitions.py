@@ -0,0 +1,127 @@
+"""
+Application Status Transition Tests
+Offline tests for the conditional status and team approval updates:
+1. A status change writes one comment and one audit log entry
+2. Re-applying the current status keeps the comment and audit entry but sends no email
+3. Re-applying a team approval returns the application unchanged
+4. Team approvals map to their flag and approved-by fields
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "topwar_test")
+os.environ.setdefault("EMAIL_FROM", "noreply@example.com")
+
+from models.schemas import ApplicationUpdate
+from routes import applications
+from routes.applications import APPLICATION_STATUSES, TEAM_APPROVALS
+
+MANAGER = {"username": "manager", "role": "admin", "roles": ["admin"]}
+
+
+def _matches(doc: dict, query: dict) -> bool:
+    for field, condition in query.items():
+        if isinstance(condition, dict):
+            if "$ne" in condition and doc.get(field) == condition["$ne"]:
+                return False
+        elif doc.get(field) != condition:
+            return False
+    return True
+
+
+class _FakeCollection:
+    def __init__(self, docs=()):
+        self.docs = [dict(doc) for doc in docs]
+
+    async def find_one(self, query, projection=None):
+        return next((dict(doc) for doc in self.docs if _matches(doc, query)), None)
+
+    async def find_one_and_update(self, query, update, projection=None, return_document=None):
+        for doc in self.docs:
+            if _matches(doc, query):
+                before = dict(doc)
+                doc.update(update.get("$set", {}))
+                for field, amount in update.get("$inc", {}).items():
+                    doc[field] = doc.get(field, 0) + amount
+                return before
+        return None
+
+    async def insert_one(self, doc):
+        self.docs.append(dict(doc))
+
+
+class _FakeDatabase:
+    def __init__(self, application):
+        self.applications = _FakeCollection([application])
+        self.application_comments = _FakeCollection()
+        self.audit_logs = _FakeCollection()
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = _FakeDatabase({"id": "app-1", "name": "Applicant", "email": "applicant@example.com",
+                        "status": "pending", "comment_count": 0})
+    monkeypatch.setattr(applications, "db", db)
+    db.emails = []
+
+    async def send_email(email, name, comment=None):
+        db.emails.append(email)
+
+    for sender in ("send_application_approved_email", "send_application_rejected_email",
+                   "send_application_waitlist_email", "send_application_waitlist_to_approved_email"):
+        monkeypatch.setattr(applications, sender, send_email)
+    return db
+
+
+def _set_status(status: str) -> dict:
+    return asyncio.run(applications.update_application_status(
+        "app-1", ApplicationUpdate(status=status, comment="reviewed"), current_user=MANAGER))
+
+
+class TestStatusTransitions:
+    """Test status changes through the conditional update"""
+
+    def test_change_writes_comment_and_audit_log(self, fake_db):
+        application = _set_status("waiting")
+        assert application["status"] == "waiting"
+        assert application["comment_count"] == 1
+        assert len(fake_db.application_comments.docs) == 1
+        assert fake_db.audit_logs.docs[0]["old_status"] == "pending"
+
+    def test_reapplying_status_keeps_comment_without_email(self, fake_db):
+        _set_status("waiting")
+        application = _set_status("waiting")
+        assert application["status"] == "waiting"
+        assert application["comment_count"] == 2
+        assert [doc["comment"] for doc in fake_db.application_comments.docs] == [
+            "[STATUS CHANGE: PENDING → WAITING] reviewed", "[STATUS CHANGE: WAITING → WAITING] reviewed"]
+        assert [doc["old_status"] for doc in fake_db.audit_logs.docs] == ["pending", "waiting"]
+        assert fake_db.emails == ["applicant@example.com"]
+
+    def test_missing_application_is_404(self, fake_db):
+        fake_db.applications.docs.clear()
+        with pytest.raises(HTTPException) as exc:
+            _set_status("approved")
+        assert exc.value.status_code == 404
+
+    def test_every_status_is_accepted(self, fake_db):
+        for status in APPLICATION_STATUSES:
+            assert _set_status(status)["status"] == status
+
+
+class TestTeamApprovals:
+    """Test the team approval field mapping"""
+
+    def test_fields(self):
+        assert TEAM_APPROVALS["discord"][:2] == ("discord_approved", "discord_approved_by")
+        assert TEAM_APPROVALS["in_game"][:2] == ("in_game_approved", "in_game_approved_by")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
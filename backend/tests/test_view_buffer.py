@@ -0,0 +1,124 @@
+"""
+Application View Buffer Tests
+Offline tests for the write-behind buffer behind application view tracking:
+1. Repeated views are buffered once until the next flush
+2. Pending views are reported per moderator
+3. Deleting an application discards its buffered views
+4. Reaching the buffer limit wakes the flush task early
+5. The unviewed count never scans the applications collection
+6. A flush leaves no views of applications deleted on another worker
+"""
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "topwar_test")
+
+from utils import view_buffer
+from utils.view_buffer import ApplicationViewBuffer, unviewed_application_count
+
+
+class TestApplicationViewBuffer:
+    """Test buffering of application views"""
+
+    def test_repeated_views_are_buffered_once(self):
+        buffer = ApplicationViewBuffer()
+        for _ in range(5):
+            buffer.record("app-1", "alice")
+        assert buffer.stats()["pending"] == 1
+        assert buffer.recorded == 1
+
+    def test_pending_views_per_moderator(self):
+        buffer = ApplicationViewBuffer()
+        buffer.record("app-1", "alice")
+        buffer.record("app-2", "alice")
+        buffer.record("app-1", "bob")
+        assert buffer.pending_for("alice") == {"app-1", "app-2"}
+        assert buffer.pending_for("bob") == {"app-1"}
+        assert buffer.pending_for("carol") == set()
+
+    def test_discard_application(self):
+        buffer = ApplicationViewBuffer()
+        buffer.record("app-1", "alice")
+        buffer.record("app-1", "bob")
+        buffer.record("app-2", "alice")
+        buffer.discard_application("app-1")
+        assert buffer.pending_for("alice") == {"app-2"}
+        assert buffer.pending_for("bob") == set()
+
+    def test_full_buffer_wakes_flush(self):
+        buffer = ApplicationViewBuffer(max_pending=2)
+        buffer.record("app-1", "alice")
+        assert not buffer._wake.is_set()
+        buffer.record("app-2", "alice")
+        assert buffer._wake.is_set()
+
+
+class _FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length):
+        return self.docs
+
+
+class _FakeApplications:
+    def __init__(self, application_ids=()):
+        self.application_ids = list(application_ids)
+
+    async def estimated_document_count(self):
+        return 10
+
+    def find(self, query, projection=None):
+        ids = query["id"]["$in"]
+        return _FakeCursor([{"id": i} for i in self.application_ids if i in ids])
+
+    async def count_documents(self, query):
+        raise AssertionError("the unviewed count must not scan applications")
+
+
+class _FakeViews:
+    def __init__(self, application_ids=()):
+        self.application_ids = list(application_ids)
+
+    async def count_documents(self, query):
+        ids = query.get("application_id", {}).get("$in")
+        return len([i for i in self.application_ids if ids is None or i in ids])
+
+    async def bulk_write(self, writes, ordered=True):
+        self.application_ids.extend(write._filter["application_id"] for write in writes)
+
+    async def delete_many(self, query):
+        ids = query["application_id"]["$in"]
+        self.application_ids = [i for i in self.application_ids if i not in ids]
+
+
+def test_unviewed_count_uses_estimated_total(monkeypatch):
+    buffer = ApplicationViewBuffer()
+    buffer.record("app-2", "alice")
+    buffer.record("app-3", "alice")
+    fake_db = SimpleNamespace(applications=_FakeApplications(), application_views=_FakeViews(["app-1", "app-2"]))
+    monkeypatch.setattr(view_buffer, "db", fake_db)
+    monkeypatch.setattr(view_buffer, "application_view_buffer", buffer)
+    # app-1 and app-2 are flushed, app-3 is only buffered: 10 - 3
+    assert asyncio.run(unviewed_application_count("alice")) == 7
+
+
+def test_flush_drops_views_of_deleted_applications(monkeypatch):
+    buffer = ApplicationViewBuffer()
+    buffer.record("app-1", "alice")
+    buffer.record("app-2", "alice")
+    # app-2 was deleted on another worker, whose cleanup already ran
+    fake_db = SimpleNamespace(applications=_FakeApplications(["app-1"]), application_views=_FakeViews())
+    monkeypatch.setattr(view_buffer, "db", fake_db)
+    assert asyncio.run(buffer.flush()) == 2
+    assert fake_db.application_views.application_ids == ["app-1"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
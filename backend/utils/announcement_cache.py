@@ -0,0 +1,79 @@
+"""Per-worker cache of the public announcements feed, pre-serialized to JSON."""
+import asyncio
+import os
+import time
+from typing import Optional, Tuple
+
+from database import db
+from utils.collection_versions import collection_versions
+from utils.responses import dump_rows_json
+
+ANNOUNCEMENT_CACHE_TTL_SECONDS = float(os.environ.get('ANNOUNCEMENT_CACHE_TTL_SECONDS', '30'))
+ANNOUNCEMENT_FEED_LIMIT = 100
+
+
+class AnnouncementFeedCache:
+    """The active announcements as ready-to-send JSON bytes.
+
+    The body is tagged with the announcements collection version it was read
+    at and rebuilt once that version moves, so writes in this worker show up
+    on the next request and writes in another worker within the collection
+    version TTL. ANNOUNCEMENT_CACHE_TTL_SECONDS caps the age of a body
+    regardless. Concurrent misses share a single rebuild.
+    """
+
+    def __init__(self, ttl: float = ANNOUNCEMENT_CACHE_TTL_SECONDS):
+        self.ttl = ttl
+        self._body: Optional[bytes] = None
+        self._version: Optional[Tuple[str, int]] = None
+        self._expires = 0.0
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _fresh(self, version: Tuple[str, int]) -> bool:
+        return self._body is not None and self._version == version and time.monotonic() < self._expires
+
+    async def get(self) -> bytes:
+        """JSON array of active announcements, newest first."""
+        version = await collection_versions.get("announcements")
+        if self._fresh(version):
+            self.hits += 1
+            return self._body
+        async with self._lock:
+            if not self._fresh(version):
+                self.misses += 1
+                # Rows read after the version, so a concurrent write can only trigger another rebuild
+                self._body = dump_rows_json(await self._load())
+                self._version = version
+                self._expires = time.monotonic() + self.ttl
+            else:
+                self.hits += 1
+            return self._body
+
+    async def _load(self) -> list:
+        return await db.announcements.find(
+            {"is_active": True}, {"_id": 0}
+        ).sort("created_at", -1).to_list(ANNOUNCEMENT_FEED_LIMIT)
+
+    def invalidate(self):
+        """Drop the cached body after creating, deleting or toggling an announcement."""
+        if self._body is not None:
+            self.invalidations += 1
+        self._body = None
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "cached": self._body is not None,
+            "size_bytes": len(self._body) if self._body is not None else 0,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+announcement_feed = AnnouncementFeedCache()
@@ -1,19 +1,36 @@
 """Authentication utilities."""
 import os
+import uuid
 from datetime import datetime, timezone, timedelta
 from typing import List, Iterable
-from passlib.context import CryptContext
 import jwt
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from utils.hashing import PasswordHasher
+
+
+def _password_context():
+    # passlib and its bcrypt backend load on first use, not on import; startup warms them up
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+password_hasher = PasswordHasher(_password_context)
 
 # JWT settings
 SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'topwar-moderator-secret-key-change-in-production')
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60  # 1 hour
+# Stream tickets are exchanged for a bearer token and only need to survive until the stream connects.
+# They travel in the query string, so they carry their own audience, are never accepted as bearer
+# tokens and open a stream only once.
+STREAM_TICKET_SCOPE = "event_stream"
+STREAM_TICKET_AUDIENCE = "topwar:event-stream"
+STREAM_TICKET_EXPIRE_SECONDS = 60
+_used_stream_tickets = TTLCache(maxsize=10000, ttl=STREAM_TICKET_EXPIRE_SECONDS)
 
 # Security settings
 MAX_LOGIN_ATTEMPTS = 3
@@ -64,10 +81,10 @@ def has_any_role(user: dict, allowed_roles: Iterable[str]) -> bool:
     return bool(user_roles.intersection(set(allowed_roles)))
 
 
-def create_access_token(data: dict):
+def create_access_token(data: dict, expires_delta: timedelta | None = None):
     """Create a JWT access token."""
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
@@ -78,6 +95,9 @@ async def get_current_moderator(credentials: HTTPAuthorizationCredentials = Depe
     try:
         token = credentials.credentials
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        if "scope" in payload:
+            # Scoped tokens such as stream tickets are not API credentials
+            raise HTTPException(status_code=401, detail="Could not validate credentials")
         username: str = payload.get("sub")
         role: str = payload.get("role", "moderator")
         roles: list = normalize_roles(role, payload.get("roles", []))
@@ -90,10 +110,39 @@ async def get_current_moderator(credentials: HTTPAuthorizationCredentials = Depe
         return {"username": username, "role": role, "roles": roles, "is_admin": is_admin, "is_in_game_leader": is_in_game_leader, "is_discord_leader": is_discord_leader}
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token has expired")
-    except jwt.JWTError:
+    except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Could not validate credentials")
 
 
+def create_stream_ticket(username: str) -> str:
+    """Short-lived, single-use token for opening an event stream, which cannot send an Authorization header."""
+    return create_access_token(
+        {"sub": username, "scope": STREAM_TICKET_SCOPE, "aud": STREAM_TICKET_AUDIENCE, "jti": uuid.uuid4().hex},
+        expires_delta=timedelta(seconds=STREAM_TICKET_EXPIRE_SECONDS)
+    )
+
+
+def decode_stream_ticket(ticket: str) -> str:
+    """Return the username a stream ticket was issued to, consuming the ticket.
+
+    Used tickets are remembered by this worker until they expire, so a ticket
+    copied from an access log cannot open a second stream here.
+    """
+    try:
+        payload = jwt.decode(ticket, SECRET_KEY, algorithms=[ALGORITHM], audience=STREAM_TICKET_AUDIENCE)
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(status_code=401, detail="Stream ticket has expired")
+    except jwt.InvalidTokenError:
+        raise HTTPException(status_code=401, detail="Invalid stream ticket")
+    ticket_id = payload.get("jti")
+    if payload.get("scope") != STREAM_TICKET_SCOPE or not payload.get("sub") or not ticket_id:
+        raise HTTPException(status_code=401, detail="Invalid stream ticket")
+    if ticket_id in _used_stream_tickets:
+        raise HTTPException(status_code=401, detail="Stream ticket has already been used")
+    _used_stream_tickets[ticket_id] = True
+    return payload["sub"]
+
+
 async def require_admin(current_user: dict = Depends(get_current_moderator)):
     """Require admin or MMOD role."""
     if not has_any_role(current_user, ["admin", "mmod"]) and not current_user.get("is_admin"):
@@ -158,9 +207,6 @@ def validate_password_strength(password: str) -> tuple:
     return True, "Password is valid"
 
 
-def check_password_history(new_password: str, password_history: List[str]) -> bool:
+async def check_password_history(new_password: str, password_history: List[str]) -> bool:
     """Check if password was used in last 10 passwords."""
-    for old_hash in password_history:
-        if pwd_context.verify(new_password, old_hash):
-            return False
-    return True
+    return not await password_hasher.matches_any(new_password, password_history)
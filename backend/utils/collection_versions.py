@@ -0,0 +1,150 @@
+"""Collection version counters behind ETag / conditional GET support.
+
+Every route that changes what a cacheable list endpoint returns bumps the
+counter of that collection in ``collection_versions``. List endpoints send
+the counter as an ``ETag`` with ``Cache-Control: private, no-cache``, so the
+browser revalidates each time, and a matching ``If-None-Match`` is answered
+with 304 before the handler runs.
+
+Counters are cached per worker for ``COLLECTION_VERSION_TTL_SECONDS``: a
+bump here is seen immediately, a bump in another worker within the TTL,
+so answering a revalidation normally costs no database access at all. Each
+counter carries a random epoch, so ETags issued before the counters were
+reset can never match again.
+"""
+import asyncio
+import hashlib
+import os
+import time
+import uuid
+from typing import Dict, Literal, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request, Response
+from pymongo import ReturnDocument
+
+from database import db
+from utils.auth import get_current_moderator
+
+COLLECTION_VERSION_TTL_SECONDS = float(os.environ.get('COLLECTION_VERSION_TTL_SECONDS', '5'))
+CACHE_CONTROL = "private, no-cache"
+
+
+def build_etag(collection: str, epoch: str, version: int, variant: str = "") -> str:
+    """Weak ETag for a collection version; ``variant`` distinguishes per-user bodies."""
+    tag = f"{collection}-{epoch}-{version}"
+    if variant:
+        tag += "-" + hashlib.sha256(variant.encode("utf-8")).hexdigest()[:12]
+    return f'W/"{tag}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against the current ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == current:
+            return True
+    return False
+
+
+class CollectionVersions:
+    """Per-worker view of the shared collection version counters."""
+
+    def __init__(self, ttl: float = COLLECTION_VERSION_TTL_SECONDS):
+        self.ttl = ttl
+        self._versions: Dict[str, Tuple[str, int]] = {}
+        self._expires = 0.0
+        self._lock = asyncio.Lock()
+        self.bumps = 0
+        self.refreshes = 0
+
+    async def bump(self, collection: str):
+        """Record that ``collection`` changed; call after the write succeeds."""
+        doc = await db.collection_versions.find_one_and_update(
+            {"_id": collection},
+            {"$inc": {"version": 1}, "$setOnInsert": {"epoch": uuid.uuid4().hex[:8]}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        self._versions[collection] = (doc["epoch"], doc["version"])
+        self.bumps += 1
+
+    async def get(self, collection: str) -> Tuple[str, int]:
+        """(epoch, version) of a collection, refreshing every counter at most once per TTL."""
+        if time.monotonic() >= self._expires or collection not in self._versions:
+            async with self._lock:
+                if time.monotonic() >= self._expires or collection not in self._versions:
+                    await self._refresh(collection)
+        return self._versions[collection]
+
+    async def _refresh(self, collection: str):
+        docs = await db.collection_versions.find({}).to_list(None)
+        versions = {doc["_id"]: (doc["epoch"], doc["version"]) for doc in docs}
+        if collection not in versions:
+            doc = await db.collection_versions.find_one_and_update(
+                {"_id": collection},
+                {"$setOnInsert": {"epoch": uuid.uuid4().hex[:8], "version": 0}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            versions[collection] = (doc["epoch"], doc["version"])
+        self._versions = versions
+        self._expires = time.monotonic() + self.ttl
+        self.refreshes += 1
+
+    async def etag(self, collection: str, variant: str = "") -> str:
+        epoch, version = await self.get(collection)
+        return build_etag(collection, epoch, version, variant)
+
+    def stats(self) -> dict:
+        return {
+            "versions": {name: version for name, (_, version) in self._versions.items()},
+            "bumps": self.bumps,
+            "refreshes": self.refreshes,
+            "ttl_seconds": self.ttl,
+        }
+
+
+collection_versions = CollectionVersions()
+
+
+def cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+async def _conditional(collection: str, variant: str, request: Request, response: Response) -> str:
+    etag = await collection_versions.etag(collection, variant)
+    headers = cache_headers(etag)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return etag
+
+
+def conditional_get(collection: str, scope: Literal["public", "moderator", "user"] = "public"):
+    """Dependency answering If-None-Match for a list of ``collection`` with 304.
+
+    ``public`` routes need no login; ``moderator`` routes authenticate first
+    and serve every moderator the same body; ``user`` routes return a
+    per-moderator body, so the ETag also varies by username. The dependency
+    returns the ETag, which routes that build their own Response must pass on
+    via ``cache_headers``.
+    """
+    if scope == "public":
+        async def dependency(request: Request, response: Response) -> str:
+            return await _conditional(collection, "", request, response)
+    elif scope == "moderator":
+        async def dependency(request: Request, response: Response,
+                             current_user: dict = Depends(get_current_moderator)) -> str:
+            return await _conditional(collection, "", request, response)
+    else:
+        async def dependency(request: Request, response: Response,
+                             current_user: dict = Depends(get_current_moderator)) -> str:
+            return await _conditional(collection, current_user["username"], request, response)
+    return dependency
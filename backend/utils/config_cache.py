@@ -0,0 +1,171 @@
+"""Per-worker in-memory copies of small, rarely-changing config collections.
+
+``application_settings`` and ``easter_eggs`` are read on public, unauthenticated
+paths (every application submission, the settings status endpoint, every
+easter egg login attempt) but only change when an admin edits them. Each
+worker keeps the whole collection in memory, keyed by its natural key, so
+those reads are dictionary lookups. The easter egg cache, which adds a
+credential index, lives in ``utils.egg_credentials``.
+
+Every worker keeps its copy current by tailing a change stream on the
+collection, so an admin edit reaches all workers within milliseconds. The
+stream is opened before the initial load, so no change between the two is
+missed. Change streams need a replica set; against a standalone server the
+cache falls back to reloading every ``CONFIG_CACHE_RELOAD_SECONDS``. Writes
+made by this worker reload immediately in either mode.
+"""
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from database import db
+
+logger = logging.getLogger(__name__)
+
+CONFIG_CACHE_RELOAD_SECONDS = float(os.environ.get('CONFIG_CACHE_RELOAD_SECONDS', '10'))
+CONFIG_CACHE_RETRY_SECONDS = 5
+# Server error codes meaning change streams are not available on this deployment
+CHANGE_STREAMS_UNSUPPORTED = {40573, 40324, 115}
+
+
+class _StreamInvalidated(Exception):
+    """The watched collection was dropped or renamed; reload and watch again."""
+
+
+class ConfigCache:
+    """All documents of one collection, keyed by ``key_field``, kept current in the background."""
+
+    def __init__(self, collection: str, key_field: str):
+        self.collection = collection
+        self.key_field = key_field
+        self._docs: Dict[Any, dict] = {}
+        # _id -> key, since delete events only carry the _id
+        self._keys: Dict[Any, Any] = {}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._task = None
+        self.mode = "stopped"
+        self.reloads = 0
+        self.changes = 0
+
+    async def get(self, key) -> Optional[dict]:
+        """The document with this key, or None; loads the collection on first use."""
+        if not self._loaded:
+            await self.reload()
+        doc = self._docs.get(key)
+        return dict(doc) if doc is not None else None
+
+    async def values(self) -> List[dict]:
+        if not self._loaded:
+            await self.reload()
+        return [dict(doc) for doc in self._docs.values()]
+
+    async def reload(self):
+        """Replace the in-memory copy with the collection's current contents."""
+        async with self._load_lock:
+            docs = await db[self.collection].find({}).to_list(None)
+            self._docs, self._keys = {}, {}
+            for doc in docs:
+                self._store(doc)
+            self._loaded = True
+            self.reloads += 1
+            self._rebuilt()
+
+    def _store(self, doc: dict):
+        doc_id = doc.pop("_id")
+        old_key = self._keys.get(doc_id)
+        if old_key is not None and old_key != doc.get(self.key_field):
+            self._docs.pop(old_key, None)
+        self._keys[doc_id] = doc.get(self.key_field)
+        self._docs[doc.get(self.key_field)] = doc
+
+    def _remove(self, doc_id):
+        key = self._keys.pop(doc_id, None)
+        if key is not None:
+            self._docs.pop(key, None)
+
+    def apply_change(self, change: dict):
+        """Apply one change stream event to the in-memory copy."""
+        operation = change["operationType"]
+        if operation in ("insert", "replace", "update"):
+            doc = change.get("fullDocument")
+            if doc is None:
+                # Deleted again before the update lookup ran
+                self._remove(change["documentKey"]["_id"])
+            else:
+                self._store(dict(doc))
+        elif operation == "delete":
+            self._remove(change["documentKey"]["_id"])
+        elif operation in ("drop", "rename", "dropDatabase", "invalidate"):
+            raise _StreamInvalidated(operation)
+        else:
+            return
+        self.changes += 1
+        self._rebuilt()
+
+    def _rebuilt(self):
+        """Hook for subclasses that derive lookup structures from the documents."""
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"config-cache-{self.collection}")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        self.mode = "stopped"
+
+    async def _run(self):
+        while True:
+            try:
+                await self._watch()
+            except asyncio.CancelledError:
+                raise
+            except _StreamInvalidated as exc:
+                logger.info(f"{self.collection} change stream ended ({exc}); reloading")
+            except OperationFailure as exc:
+                if exc.code in CHANGE_STREAMS_UNSUPPORTED:
+                    logger.info(f"Change streams unavailable, reloading {self.collection} every "
+                                f"{CONFIG_CACHE_RELOAD_SECONDS:g}s")
+                    await self._poll()  # runs until stopped
+                else:
+                    logger.warning(f"{self.collection} change stream failed, retrying: {exc}")
+                    await asyncio.sleep(CONFIG_CACHE_RETRY_SECONDS)
+            except Exception as exc:
+                logger.warning(f"{self.collection} change stream failed, retrying: {exc}")
+                await asyncio.sleep(CONFIG_CACHE_RETRY_SECONDS)
+
+    async def _watch(self):
+        async with db[self.collection].watch(full_document="updateLookup") as stream:
+            await self.reload()
+            self.mode = "change_stream"
+            async for change in stream:
+                self.apply_change(change)
+
+    async def _poll(self):
+        self.mode = "polling"
+        while True:
+            try:
+                await self.reload()
+            except PyMongoError as exc:
+                logger.warning(f"Failed to reload {self.collection}: {exc}")
+            await asyncio.sleep(CONFIG_CACHE_RELOAD_SECONDS)
+
+    def stats(self) -> dict:
+        return {
+            "documents": len(self._docs),
+            "mode": self.mode,
+            "reloads": self.reloads,
+            "changes": self.changes,
+        }
+
+
+application_settings_cache = ConfigCache("application_settings", "id")
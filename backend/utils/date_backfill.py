@@ -0,0 +1,191 @@
+"""Online backfill of ISO-string timestamps to native BSON dates.
+
+Timestamps used to be stored as ``isoformat()`` strings, so every read path
+parsed them back and date-range filters compared strings. Writes now store
+datetimes natively; this backfill converts the older documents in place.
+
+Each collection is walked in ``_id`` order, ``DATE_BACKFILL_BATCH_SIZE``
+documents at a time, selecting only documents that still hold a string in
+one of its date fields. Every update is conditional on the string it read,
+so a concurrent write is never overwritten, and a run interrupted at any
+point simply continues on next start. Only the holder of the
+``date_backfill`` lease runs it when several API processes start together.
+
+It can also be run by hand:
+
+    python -m utils.date_backfill [collection ...]
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from database import db
+from utils.leases import LeaderLease
+
+logger = logging.getLogger(__name__)
+
+DATE_BACKFILL_BATCH_SIZE = int(os.environ.get('DATE_BACKFILL_BATCH_SIZE', '500'))
+# Pause between batches so the backfill never monopolises the pool while serving traffic
+DATE_BACKFILL_PAUSE_SECONDS = float(os.environ.get('DATE_BACKFILL_PAUSE_SECONDS', '0.05'))
+DATE_BACKFILL_LEASE_SECONDS = 60.0
+
+# Collection -> fields holding timestamps. Polls come first: the expiry
+# scheduler only considers polls whose expires_at is already a date.
+DATE_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "polls": ("created_at", "expires_at"),
+    "poll_votes": ("voted_at",),
+    "poll_views": ("viewed_at",),
+    "archived_polls": ("closed_at",),
+    "applications": ("submitted_at", "reviewed_at"),
+    "application_votes": ("timestamp",),
+    "application_comments": ("timestamp",),
+    "application_views": ("viewed_at",),
+    "moderators": ("created_at", "last_login", "locked_at", "password_reset_expires"),
+    "server_assignments": ("created_at",),
+    "feature_requests": ("submitted_at", "reviewed_at"),
+    "audit_logs": ("created_at",),
+    "announcements": ("created_at",),
+}
+
+
+def parse_timestamp(value: str) -> Optional[datetime]:
+    """Parse a stored ISO timestamp, taking naive values as UTC; None if it is not one."""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def build_backfill_write(doc: dict, fields: Iterable[str]) -> Optional[UpdateOne]:
+    """Conditional update converting a document's string timestamps, or None if none parse."""
+    changes = {}
+    for field in fields:
+        value = doc.get(field)
+        if isinstance(value, str):
+            parsed = parse_timestamp(value)
+            if parsed is not None:
+                changes[field] = parsed
+    if not changes:
+        return None
+    # Matching on the strings we read leaves values rewritten meanwhile untouched
+    return UpdateOne({"_id": doc["_id"], **{field: doc[field] for field in changes}}, {"$set": changes})
+
+
+async def backfill_collection(name: str, fields: Tuple[str, ...], batch_size: int = DATE_BACKFILL_BATCH_SIZE,
+                              pause: float = DATE_BACKFILL_PAUSE_SECONDS,
+                              keep_going: Optional[Callable[[], Awaitable[bool]]] = None) -> int:
+    """Convert one collection's string timestamps; returns how many documents were updated.
+
+    ``keep_going`` is awaited before each batch and stops the walk when it returns False.
+    """
+    collection = db[name]
+    pending = {"$or": [{field: {"$type": "string"}} for field in fields]}
+    projection = {field: 1 for field in fields}
+    converted, last_id = 0, None
+    while keep_going is None or await keep_going():
+        # Resuming after the last _id seen skips values that did not parse
+        query = pending if last_id is None else {**pending, "_id": {"$gt": last_id}}
+        docs = await collection.find(query, projection).sort("_id", 1).limit(batch_size).to_list(batch_size)
+        if not docs:
+            return converted
+        writes = [write for write in (build_backfill_write(doc, fields) for doc in docs) if write is not None]
+        if writes:
+            result = await collection.bulk_write(writes, ordered=False)
+            converted += result.modified_count
+        last_id = docs[-1]["_id"]
+        await asyncio.sleep(pause)
+    return converted
+
+
+class DateBackfill:
+    """Background task running the backfill once per process start."""
+
+    def __init__(self, lease: Optional[LeaderLease] = None):
+        self.lease = lease or LeaderLease("date_backfill", DATE_BACKFILL_LEASE_SECONDS)
+        self._task = None
+        self.converted: Dict[str, int] = {}
+        self.current: Optional[str] = None
+        self.finished = False
+        self._leased = False
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="date-backfill")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.lease.release()
+        except Exception as exc:
+            logger.warning(f"Failed to release date backfill lease: {exc}")
+
+    async def _run(self):
+        # Followers wait for the leader to finish, then find nothing left to do
+        while not await self.lease.acquire():
+            await asyncio.sleep(DATE_BACKFILL_LEASE_SECONDS / 2)
+        self._leased = True
+        try:
+            await self.run()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.error(f"Date backfill stopped, will resume on next start: {exc}")
+        finally:
+            self.current = None
+            self._leased = False
+            await self.lease.release()
+
+    async def run(self, collections: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Backfill the given collections (all by default); returns documents converted per collection."""
+        for name in collections or DATE_FIELDS:
+            self.current = name
+            converted = await backfill_collection(name, DATE_FIELDS[name], keep_going=self._still_leader)
+            self.converted[name] = self.converted.get(name, 0) + converted
+            if converted:
+                logger.info(f"Converted string timestamps of {converted} {name} documents to dates")
+            if not await self._still_leader():
+                logger.warning("Lost the date backfill lease; stopping")
+                return self.converted
+        self.current = None
+        self.finished = True
+        return self.converted
+
+    async def _still_leader(self) -> bool:
+        """Renew the lease between batches; a manual run without the lease always continues."""
+        return not self._leased or await self.lease.acquire()
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "is_leader": self.lease.is_leader,
+            "current_collection": self.current,
+            "finished": self.finished,
+            "converted": dict(self.converted),
+            "batch_size": DATE_BACKFILL_BATCH_SIZE,
+        }
+
+
+date_backfill = DateBackfill()
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    unknown = [name for name in sys.argv[1:] if name not in DATE_FIELDS]
+    if unknown:
+        sys.exit(f"Unknown collections: {', '.join(unknown)}. Choose from: {', '.join(DATE_FIELDS)}")
+    print(asyncio.run(date_backfill.run(sys.argv[1:] or None)))
@@ -0,0 +1,132 @@
+"""Easter egg page credentials: hashing, the in-memory login index and guess throttling.
+
+Egg passwords are stored as salted SHA-256 digests in ``password_hash``;
+they unlock novelty pages, not accounts, so a fast hash is enough and keeps
+verification in the microseconds. Every worker indexes the active eggs by
+username on top of the easter_eggs config cache, so a guess is a dictionary
+lookup plus a constant-time digest comparison with no database round trip.
+Guesses for an egg username are limited per client address to
+``EASTER_EGG_GUESSES_PER_MINUTE``; the login form checks every login here
+first, so ordinary usernames are answered without spending a guess. Behind
+a reverse proxy set ``TRUSTED_PROXY_HOPS`` to the number of proxies in
+front of the API, so the client address is read from ``X-Forwarded-For``.
+"""
+import hashlib
+import hmac
+import os
+import secrets
+import time
+from typing import Dict, List, Optional
+
+from cachetools import TTLCache
+
+from utils.config_cache import ConfigCache
+
+EASTER_EGG_GUESSES_PER_MINUTE = int(os.environ.get('EASTER_EGG_GUESSES_PER_MINUTE', '10'))
+EASTER_EGG_THROTTLE_MAX_CLIENTS = 10000
+TRUSTED_PROXY_HOPS = int(os.environ.get('TRUSTED_PROXY_HOPS', '0'))
+_HASH_SCHEME = "sha256"
+
+
+def hash_egg_password(password: str, salt: Optional[str] = None) -> str:
+    """Salted digest stored in an egg's ``password_hash``."""
+    salt = salt or secrets.token_hex(8)
+    digest = hashlib.sha256(f"{salt}:{password}".encode("utf-8")).hexdigest()
+    return f"{_HASH_SCHEME}${salt}${digest}"
+
+
+def verify_egg_password(password: str, password_hash: str) -> bool:
+    try:
+        scheme, salt, _ = password_hash.split("$", 2)
+    except (AttributeError, ValueError):
+        return False
+    if scheme != _HASH_SCHEME:
+        return False
+    return hmac.compare_digest(hash_egg_password(password, salt), password_hash)
+
+
+# Compared against when a username is unknown, so misses cost the same as wrong passwords
+_DUMMY_HASH = hash_egg_password(secrets.token_hex(8))
+
+
+class EasterEggCache(ConfigCache):
+    """easter_eggs config cache with active eggs indexed by login username."""
+
+    def __init__(self):
+        super().__init__("easter_eggs", "page_key")
+        self._by_username: Dict[str, List[dict]] = {}
+
+    def _rebuilt(self):
+        by_username: Dict[str, List[dict]] = {}
+        for egg in self._docs.values():
+            if egg.get("is_active") and egg.get("password_hash"):
+                by_username.setdefault(egg.get("username"), []).append(egg)
+        self._by_username = by_username
+
+    async def has_username(self, username: str) -> bool:
+        """Whether any active egg uses this username."""
+        if not self._loaded:
+            await self.reload()
+        return username in self._by_username
+
+    async def verify(self, username: str, password: str) -> Optional[dict]:
+        """The active egg these credentials unlock, or None."""
+        if not self._loaded:
+            await self.reload()
+        candidates = self._by_username.get(username)
+        if not candidates:
+            verify_egg_password(password, _DUMMY_HASH)
+            return None
+        for egg in candidates:
+            if verify_egg_password(password, egg["password_hash"]):
+                return dict(egg)
+        return None
+
+    def stats(self) -> dict:
+        return {**super().stats(), "active_usernames": len(self._by_username)}
+
+
+easter_egg_cache = EasterEggCache()
+
+
+def client_address(peer: Optional[str], forwarded_for: Optional[str], trusted_hops: int = TRUSTED_PROXY_HOPS) -> str:
+    """The client's address, skipping ``trusted_hops`` proxies recorded in X-Forwarded-For.
+
+    Only entries appended by trusted proxies are believed; anything further
+    left was sent by the client and could be forged.
+    """
+    chain = [part.strip() for part in (forwarded_for or "").split(",") if part.strip()]
+    chain.append(peer or "unknown")
+    return chain[max(0, len(chain) - 1 - trusted_hops)]
+
+
+class GuessThrottle:
+    """Fixed one-minute window of allowed guesses per client."""
+
+    def __init__(self, per_minute: int = EASTER_EGG_GUESSES_PER_MINUTE,
+                 max_clients: int = EASTER_EGG_THROTTLE_MAX_CLIENTS):
+        self.per_minute = per_minute
+        self._windows = TTLCache(maxsize=max_clients, ttl=60)
+        self.rejected = 0
+
+    def allow(self, client: str) -> bool:
+        """Count one guess by ``client``; False once it is over the limit for this window."""
+        now = time.monotonic()
+        started, count = self._windows.get(client, (now, 0))
+        if now - started >= 60:
+            started, count = now, 0
+        if count >= self.per_minute:
+            self.rejected += 1
+            return False
+        self._windows[client] = (started, count + 1)
+        return True
+
+    def retry_after(self, client: str) -> int:
+        started, _ = self._windows.get(client, (time.monotonic(), 0))
+        return max(1, int(60 - (time.monotonic() - started)) + 1)
+
+    def stats(self) -> dict:
+        return {"clients": len(self._windows), "per_minute": self.per_minute, "rejected": self.rejected}
+
+
+easter_egg_throttle = GuessThrottle()
@@ -0,0 +1,82 @@
+"""Compiled Jinja2 templates for notification emails.
+
+Each email type has an HTML and a plain-text template under
+``templates/email``. Templates are compiled once per process and reused, so
+rendering a message only fills in the per-recipient values. Jinja2 itself
+is imported when the first template is needed, so it stays off the import
+path of every API process; startup preloads the templates after readiness
+work is done.
+"""
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / 'templates' / 'email'
+
+FRONTEND_URL = os.environ.get('FRONTEND_URL', 'http://localhost:3000').rstrip('/')
+TOP_WAR_LOGO = "https://www.rivergame.net/en/res/img/comm/home/topcover/title.png"
+APPLY_URL = f"{FRONTEND_URL}/apply"
+
+# Email type -> subject line
+EMAIL_SUBJECTS: Dict[str, str] = {
+    "application_received": "Top War - Application Received",
+    "application_approved": "Top War Moderator Application – Congratulations!",
+    "application_rejected": "Top War Moderator Application – Update",
+    "application_waitlist": "Top War Moderator Application – You're On Our Waiting List!",
+    "application_waitlist_to_approved": "Top War Moderator Application – A Position Is Now Available!",
+    "moderator_email_confirmed": "Top War Moderator Portal – Email Confirmed",
+    "password_reset": "Top War Moderator Portal – Password Reset Request",
+}
+
+
+@lru_cache(maxsize=None)
+def _environment():
+    from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
+
+    env = Environment(
+        loader=FileSystemLoader(str(TEMPLATE_DIR)),
+        # Recipient names and manager comments are user input; escape them in HTML only
+        autoescape=select_autoescape(enabled_extensions=("html",), default_for_string=False),
+        undefined=StrictUndefined,
+        auto_reload=False,
+        cache_size=-1,
+        trim_blocks=True,
+        keep_trailing_newline=True,
+    )
+    env.globals.update(logo_url=TOP_WAR_LOGO, apply_url=APPLY_URL, frontend_url=FRONTEND_URL)
+    return env
+
+
+class RenderedEmail(NamedTuple):
+    subject: str
+    html: str
+    text: str
+
+
+def _templates(email_type: str):
+    if email_type not in EMAIL_SUBJECTS:
+        raise KeyError(f"Unknown email type: {email_type}")
+    env = _environment()
+    return env.get_template(f"{email_type}.html"), env.get_template(f"{email_type}.txt")
+
+
+def preload_templates() -> int:
+    """Compile every email template up front; returns how many were loaded."""
+    for email_type in EMAIL_SUBJECTS:
+        _templates(email_type)
+    return len(EMAIL_SUBJECTS) * 2
+
+
+def render_email(email_type: str, **context) -> RenderedEmail:
+    """Render the subject, HTML and plain-text parts of one email."""
+    html_template, text_template = _templates(email_type)
+    return RenderedEmail(EMAIL_SUBJECTS[email_type], html_template.render(context), text_template.render(context))
+
+
+def render_batch(email_type: str, contexts: Iterable[dict]) -> List[RenderedEmail]:
+    """Render one email type for many recipients, looking the templates up once."""
+    html_template, text_template = _templates(email_type)
+    subject = EMAIL_SUBJECTS[email_type]
+    return [RenderedEmail(subject, html_template.render(context), text_template.render(context))
+            for context in contexts]
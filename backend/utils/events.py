@@ -0,0 +1,186 @@
+"""Server-sent event fan-out for moderator clients.
+
+Each API process keeps a registry of connected SSE subscribers, each with a
+bounded queue. Events are delivered to local subscribers immediately and
+written to the capped ``events`` collection, which every process tails, so
+moderators connected to another worker hear about them too.
+
+The capped collection is created at startup, before any request can
+publish; an insert into a missing ``events`` would create it uncapped, and a
+tailable cursor cannot be opened on that. If an uncapped ``events`` is found
+the relay stays off, and events only reach this process's subscribers.
+
+A subscriber that falls ``EVENT_QUEUE_SIZE`` events behind is not allowed
+to hold memory or slow publishers: its queue is replaced with a single
+``resync`` event and it is dropped, and the client refetches on reconnect.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Optional, Set
+
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid, PyMongoError
+
+from database import db
+from utils.leases import INSTANCE_ID
+
+logger = logging.getLogger(__name__)
+
+EVENT_QUEUE_SIZE = int(os.environ.get('EVENT_QUEUE_SIZE', '64'))
+EVENT_HEARTBEAT_SECONDS = float(os.environ.get('EVENT_HEARTBEAT_SECONDS', '15'))
+EVENTS_CAPPED_BYTES = int(os.environ.get('EVENTS_CAPPED_BYTES', str(1024 * 1024)))
+EVENT_RELAY_RETRY_SECONDS = 5
+EVENTS_RELAY_ENABLED = os.environ.get('EVENTS_RELAY_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
+RESYNC_EVENT = "resync"
+
+
+class Subscriber:
+    """One connected SSE client."""
+
+    def __init__(self, username: str):
+        self.username = username
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+        self.dropped = False
+
+
+def format_sse(event_id: int, event_type: str, data: dict) -> str:
+    """Encode one event in the text/event-stream wire format."""
+    return f"id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+class EventBroker:
+    """Per-process subscriber registry with cross-process relay."""
+
+    def __init__(self):
+        self._subscribers: Set[Subscriber] = set()
+        self._ids = itertools.count(1)
+        self._relay_task = None
+        self._relay_ready = False
+        self.published = 0
+        self.relayed = 0
+        self.dropped_subscribers = 0
+
+    def subscribe(self, username: str) -> Subscriber:
+        subscriber = Subscriber(username)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.discard(subscriber)
+
+    def _deliver(self, event_type: str, data: dict):
+        message = format_sse(next(self._ids), event_type, data)
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self._drop(subscriber)
+
+    def _disconnect(self, subscriber: Subscriber):
+        """Replace a subscriber's backlog with a resync instruction and end its stream."""
+        self._subscribers.discard(subscriber)
+        subscriber.dropped = True
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(format_sse(next(self._ids), RESYNC_EVENT, {}))
+
+    def _drop(self, subscriber: Subscriber):
+        self._disconnect(subscriber)
+        self.dropped_subscribers += 1
+        logger.warning(f"Dropped slow event subscriber {subscriber.username}")
+
+    async def publish(self, event_type: str, data: Optional[dict] = None):
+        """Send an event to moderators connected to every process."""
+        data = data or {}
+        self.published += 1
+        self._deliver(event_type, data)
+        if self._relay_ready:
+            try:
+                await db.events.insert_one({
+                    "type": event_type,
+                    "data": data,
+                    "origin": INSTANCE_ID,
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                })
+            except PyMongoError as exc:
+                logger.warning(f"Failed to relay {event_type} event: {exc}")
+
+    async def ensure_collection(self):
+        """Create the capped events collection the relay tails; run before serving requests."""
+        if not EVENTS_RELAY_ENABLED:
+            return
+        try:
+            await db.create_collection("events", capped=True, size=EVENTS_CAPPED_BYTES)
+        except CollectionInvalid:
+            options = await db.events.options()
+            if not options.get("capped"):
+                logger.error("The events collection is not capped, so it cannot be tailed; cross-process "
+                             "events are disabled until it is dropped or converted with convertToCapped")
+                return
+        self._relay_ready = True
+
+    async def _relay(self):
+        """Tail the capped events collection and deliver other processes' events locally."""
+        last_id = None
+        while True:
+            try:
+                if last_id is None:
+                    latest = await db.events.find_one({}, {"_id": 1}, sort=[("$natural", -1)])
+                    last_id = latest["_id"] if latest else None
+                last_id = await self._tail(last_id)
+                # A tailable cursor on an empty collection dies immediately; wait for the first event
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(f"Event relay failed, retrying: {exc}")
+                await asyncio.sleep(EVENT_RELAY_RETRY_SECONDS)
+
+    async def _tail(self, last_id):
+        query = {"_id": {"$gt": last_id}} if last_id is not None else {}
+        cursor = db.events.find(query, cursor_type=CursorType.TAILABLE_AWAIT)
+        try:
+            while cursor.alive:
+                async for doc in cursor:
+                    last_id = doc["_id"]
+                    if doc.get("origin") != INSTANCE_ID:
+                        self.relayed += 1
+                        self._deliver(doc["type"], doc.get("data", {}))
+                await asyncio.sleep(0.1)
+        finally:
+            await cursor.close()
+        return last_id
+
+    def start(self):
+        if self._relay_ready and self._relay_task is None:
+            self._relay_task = asyncio.create_task(self._relay(), name="event-relay")
+
+    async def stop(self):
+        if self._relay_task is not None:
+            self._relay_task.cancel()
+            try:
+                await self._relay_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._relay_task = None
+        for subscriber in list(self._subscribers):
+            self._disconnect(subscriber)
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "max_queue_depth": max((s.queue.qsize() for s in self._subscribers), default=0),
+            "queue_size": EVENT_QUEUE_SIZE,
+            "published": self.published,
+            "relayed": self.relayed,
+            "dropped_subscribers": self.dropped_subscribers,
+            "relay_running": self._relay_task is not None and not self._relay_task.done(),
+        }
+
+
+event_broker = EventBroker()
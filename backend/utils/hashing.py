@@ -0,0 +1,118 @@
+"""Async password hashing service backed by a bounded worker pool."""
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable
+
+from fastapi import HTTPException
+
+# bcrypt releases the GIL while hashing, so threads give real parallelism here
+PASSWORD_HASHING_WORKERS = int(os.environ.get('PASSWORD_HASHING_WORKERS', str(min(4, os.cpu_count() or 1))))
+# Requests waiting beyond this depth are turned away instead of queueing for seconds
+PASSWORD_HASHING_MAX_QUEUE = int(os.environ.get('PASSWORD_HASHING_MAX_QUEUE', '64'))
+
+
+class PasswordHasher:
+    """Run passlib hash/verify calls off the event loop with a concurrency cap.
+
+    At most ``max_workers`` bcrypt operations run at once; further callers wait
+    their turn and, once ``max_queue`` are already waiting, are rejected with a
+    503 so a burst of logins degrades gracefully instead of piling up. The
+    passlib context is built by ``context_factory`` on first use.
+    """
+
+    def __init__(self, context_factory: Callable[[], Any], max_workers: int = PASSWORD_HASHING_WORKERS,
+                 max_queue: int = PASSWORD_HASHING_MAX_QUEUE):
+        self._context_factory = context_factory
+        self._context_instance = None
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._waiting = 0
+        self._running = 0
+        self._max_waiting = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_ms_total = 0.0
+        self._run_ms_total = 0.0
+
+    @property
+    def _context(self):
+        # Built in a worker thread; a racing duplicate build is harmless
+        if self._context_instance is None:
+            self._context_instance = self._context_factory()
+        return self._context_instance
+
+    async def _run(self, func, *args):
+        if self._waiting >= self.max_queue:
+            self._rejected += 1
+            raise HTTPException(status_code=503, detail="Server is busy, please try again shortly")
+
+        self._waiting += 1
+        self._max_waiting = max(self._max_waiting, self._waiting)
+        queued_at = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        started_at = time.perf_counter()
+        self._wait_ms_total += (started_at - queued_at) * 1000
+        self._running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._running -= 1
+            self._completed += 1
+            self._run_ms_total += (time.perf_counter() - started_at) * 1000
+            self._semaphore.release()
+
+    def _hash(self, password: str) -> str:
+        return self._context.hash(password)
+
+    def _verify(self, password: str, hashed: str) -> bool:
+        return self._context.verify(password, hashed)
+
+    async def hash(self, password: str) -> str:
+        """Hash a password."""
+        return await self._run(self._hash, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        """Check a password against a stored hash."""
+        return await self._run(self._verify, password, hashed)
+
+    def _matches_any(self, password: str, hashes: list) -> bool:
+        for hashed in hashes:
+            # Skip corrupt or foreign entries rather than failing the whole check
+            if not hashed or self._context.identify(hashed) is None:
+                continue
+            if self._context.verify(password, hashed):
+                return True
+        return False
+
+    async def matches_any(self, password: str, hashes: Iterable[str]) -> bool:
+        """True if the password matches any of the hashes, stopping at the first match.
+
+        The whole history check occupies a single worker, so one user changing
+        their password cannot monopolise the pool.
+        """
+        return await self._run(self._matches_any, password, list(hashes))
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "running": self._running,
+            "waiting": self._waiting,
+            "max_waiting": self._max_waiting,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "avg_wait_ms": round(self._wait_ms_total / self._completed, 3) if self._completed else 0.0,
+            "avg_run_ms": round(self._run_ms_total / self._completed, 3) if self._completed else 0.0,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
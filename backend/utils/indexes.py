@@ -0,0 +1,287 @@
+"""MongoDB index declarations, startup reconciliation and coverage report."""
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Only documents with a real string value take part in these unique indexes, so
+# moderators without an email (or without a pending reset) never collide on null.
+_HAS_STRING = {"$type": "string"}
+
+# Required indexes per collection. Names are explicit so reconciliation can
+# detect an index whose definition changed and rebuild it.
+INDEX_SPECS: Dict[str, List[IndexModel]] = {
+    "moderators": [
+        IndexModel([("username", ASCENDING)], name="username_unique", unique=True),
+        IndexModel(
+            [("email", ASCENDING)], name="email_unique", unique=True,
+            partialFilterExpression={"email": _HAS_STRING}
+        ),
+        IndexModel(
+            [("password_reset_token", ASCENDING)], name="password_reset_token_unique", unique=True,
+            partialFilterExpression={"password_reset_token": _HAS_STRING}
+        ),
+        IndexModel([("status", ASCENDING)], name="status"),
+    ],
+    "applications": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        # Backs keyset pagination on (submitted_at, id)
+        IndexModel([("submitted_at", DESCENDING), ("id", DESCENDING)], name="submitted_at_id_desc"),
+        # Multikey prefix index behind application search
+        IndexModel([("search_terms", ASCENDING)], name="search_terms"),
+    ],
+    # One record per (application, moderator) view; the username prefix serves per-moderator lookups
+    "application_views": [
+        IndexModel([("username", ASCENDING), ("application_id", ASCENDING)],
+                   name="username_application_id_unique", unique=True),
+        IndexModel([("application_id", ASCENDING)], name="application_id"),
+    ],
+    # Discussion threads, paged oldest first per application
+    "application_votes": [
+        IndexModel([("application_id", ASCENDING), ("moderator", ASCENDING)],
+                   name="application_id_moderator_unique", unique=True),
+        IndexModel([("application_id", ASCENDING), ("timestamp", ASCENDING), ("id", ASCENDING)],
+                   name="application_id_timestamp_id"),
+    ],
+    "application_comments": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("application_id", ASCENDING), ("timestamp", ASCENDING), ("id", ASCENDING)],
+                   name="application_id_timestamp_id"),
+    ],
+    "application_settings": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    ],
+    "polls": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("is_active", ASCENDING), ("expires_at", ASCENDING)], name="is_active_expires_at"),
+        IndexModel([("is_active", ASCENDING), ("created_at", DESCENDING)], name="is_active_created_at"),
+    ],
+    # One vote and one view record per moderator per poll
+    "poll_votes": [
+        IndexModel([("poll_id", ASCENDING), ("username", ASCENDING)], name="poll_id_username_unique", unique=True),
+    ],
+    "poll_views": [
+        IndexModel([("poll_id", ASCENDING), ("username", ASCENDING)], name="poll_id_username_unique", unique=True),
+    ],
+    "archived_polls": [
+        IndexModel([("closed_at", DESCENDING)], name="closed_at_desc"),
+    ],
+    "announcements": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("is_active", ASCENDING), ("created_at", DESCENDING)], name="is_active_created_at"),
+    ],
+    "user_preferences": [
+        IndexModel([("username", ASCENDING)], name="username_unique", unique=True),
+    ],
+    "easter_eggs": [
+        IndexModel([("page_key", ASCENDING)], name="page_key_unique", unique=True),
+    ],
+    "audit_logs": [
+        IndexModel([("created_at", DESCENDING)], name="created_at_desc"),
+    ],
+    "feature_requests": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("submitted_by", ASCENDING), ("submitted_at", DESCENDING)], name="submitted_by_submitted_at"),
+        IndexModel([("submitted_at", DESCENDING)], name="submitted_at_desc"),
+    ],
+    "server_assignments": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("created_at", DESCENDING)], name="created_at_desc"),
+    ],
+    "email_outbox": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("status", ASCENDING), ("priority", ASCENDING), ("next_attempt_at", ASCENDING)],
+                   name="status_priority_next_attempt"),
+        IndexModel([("status", ASCENDING), ("lease_until", ASCENDING)], name="status_lease_until"),
+    ],
+}
+
+# Indexes superseded by a declaration above; dropped during reconciliation.
+RETIRED_INDEXES: Dict[str, List[str]] = {
+    "applications": ["submitted_at_desc"],
+}
+
+# The canonical query behind each hot route, used by the coverage report.
+# Literal values are representative only; the plan shape is what matters.
+CANONICAL_QUERIES = [
+    {"route": "POST /api/auth/login", "collection": "moderators", "filter": {"username": "example"}},
+    {"route": "POST /api/auth/set-email", "collection": "moderators", "filter": {"email": "user@example.com"}},
+    {"route": "POST /api/auth/reset-password-by-email", "collection": "moderators",
+     "filter": {"password_reset_token": "00000000-0000-0000-0000-000000000000"}},
+    {"route": "GET /api/applications", "collection": "applications", "filter": {},
+     "sort": [("submitted_at", DESCENDING), ("id", DESCENDING)], "limit": 101},
+    {"route": "GET /api/applications?submitted_after=", "collection": "applications",
+     "filter": {"submitted_at": {"$gte": datetime(2025, 1, 1, tzinfo=timezone.utc)}},
+     "sort": [("submitted_at", DESCENDING), ("id", DESCENDING)], "limit": 101},
+    {"route": "GET /api/applications?search=", "collection": "applications",
+     "filter": {"search_terms": {"$all": ["example"]}}, "sort": [("submitted_at", DESCENDING), ("id", DESCENDING)],
+     "limit": 500},
+    {"route": "GET /api/applications/{id}", "collection": "applications", "filter": {"id": "example"}},
+    {"route": "GET /api/applications (viewed)", "collection": "application_views",
+     "filter": {"username": "example", "application_id": {"$in": ["example"]}}},
+    {"route": "GET /api/applications (my votes)", "collection": "application_votes",
+     "filter": {"application_id": {"$in": ["example"]}, "moderator": "example"}},
+    {"route": "POST /api/applications/{id}/vote", "collection": "application_votes",
+     "filter": {"application_id": "example", "moderator": "example"}},
+    {"route": "GET /api/applications/{id}/votes", "collection": "application_votes",
+     "filter": {"application_id": "example"}, "sort": [("timestamp", ASCENDING), ("id", ASCENDING)], "limit": 101},
+    {"route": "GET /api/applications/{id}/comments", "collection": "application_comments",
+     "filter": {"application_id": "example"}, "sort": [("timestamp", ASCENDING), ("id", ASCENDING)], "limit": 101},
+    {"route": "GET /api/applications/unviewed-count", "collection": "application_views",
+     "filter": {"username": "example"}},
+    {"route": "POST /api/applications", "collection": "application_settings", "filter": {"id": "app_settings"}},
+    {"route": "GET /api/polls", "collection": "polls", "filter": {"is_active": True},
+     "sort": [("created_at", DESCENDING)], "limit": 10},
+    {"route": "GET /api/polls (my votes)", "collection": "poll_votes",
+     "filter": {"poll_id": {"$in": ["example"]}, "username": "example"}},
+    {"route": "GET /api/polls (voters)", "collection": "poll_votes", "filter": {"poll_id": {"$in": ["example"]}}},
+    {"route": "GET /api/polls/check-new", "collection": "poll_views",
+     "filter": {"poll_id": {"$in": ["example"]}, "username": "example"}},
+    {"route": "POST /api/polls/{id}/vote", "collection": "polls",
+     "filter": {"id": "example", "is_active": True, "options.0": {"$exists": True}}},
+    {"route": "poll expiry scheduler", "collection": "polls",
+     "filter": {"is_active": True, "expires_at": {"$lte": "2000-01-01T00:00:00+00:00"}}},
+    {"route": "poll expiry scheduler (next expiry)", "collection": "polls", "filter": {"is_active": True},
+     "sort": [("expires_at", ASCENDING)], "limit": 1},
+    {"route": "GET /api/polls/archived", "collection": "archived_polls", "filter": {},
+     "sort": [("closed_at", DESCENDING)], "limit": 100},
+    {"route": "GET /api/announcements", "collection": "announcements", "filter": {"is_active": True},
+     "sort": [("created_at", DESCENDING)], "limit": 100},
+    {"route": "GET /api/announcements/dismissed", "collection": "user_preferences", "filter": {"username": "example"}},
+    {"route": "GET /api/easter-eggs/{page_key}", "collection": "easter_eggs", "filter": {"page_key": "troll"}},
+    {"route": "GET /api/audit-logs", "collection": "audit_logs", "filter": {},
+     "sort": [("created_at", DESCENDING)], "limit": 500},
+    {"route": "GET /api/feature-requests", "collection": "feature_requests", "filter": {"submitted_by": "example"},
+     "sort": [("submitted_at", DESCENDING)], "limit": 100},
+    {"route": "GET /api/server-assignments", "collection": "server_assignments", "filter": {},
+     "sort": [("created_at", DESCENDING)], "limit": 1000},
+    {"route": "email outbox worker", "collection": "email_outbox",
+     "filter": {"status": "pending", "next_attempt_at": {"$lte": "2000-01-01T00:00:00+00:00"}},
+     "sort": [("priority", ASCENDING), ("next_attempt_at", ASCENDING)], "limit": 1},
+]
+
+
+def _normalize(value):
+    """Turn nested index options into comparable, order-independent tuples."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _normalize(v)) for k, v in value.items()))
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _index_signature(info: dict) -> tuple:
+    """Reduce index information to the options that define its behaviour."""
+    key = info.get("key")
+    key = list(key.items()) if isinstance(key, dict) else list(key)
+    return (
+        tuple((field, _normalize(direction)) for field, direction in key),
+        bool(info.get("unique", False)),
+        bool(info.get("sparse", False)),
+        _normalize(info.get("partialFilterExpression") or {}),
+    )
+
+
+async def ensure_indexes(db) -> dict:
+    """Create missing indexes and rebuild any whose definition has drifted.
+
+    Safe to call on every startup: indexes that already match are left alone and
+    only indexes listed in RETIRED_INDEXES are ever dropped. Failures (for example
+    duplicate data blocking a unique index) are logged and reported rather than
+    raised, so one bad collection cannot stop the API from starting.
+    """
+    summary = {"created": [], "rebuilt": [], "unchanged": [], "dropped": [], "failed": []}
+
+    for collection_name, models in INDEX_SPECS.items():
+        collection = db[collection_name]
+        existing = await collection.index_information()
+
+        for model in models:
+            spec = model.document
+            name = spec["name"]
+            label = f"{collection_name}.{name}"
+            try:
+                if name in existing:
+                    if _index_signature(existing[name]) == _index_signature(spec):
+                        summary["unchanged"].append(label)
+                        continue
+                    await collection.drop_index(name)
+                    await collection.create_indexes([model])
+                    summary["rebuilt"].append(label)
+                else:
+                    await collection.create_indexes([model])
+                    summary["created"].append(label)
+            except OperationFailure as exc:
+                logger.error(f"Failed to build index {label}: {exc}")
+                summary["failed"].append({"index": label, "error": str(exc)})
+
+    for collection_name, names in RETIRED_INDEXES.items():
+        collection = db[collection_name]
+        existing = await collection.index_information()
+        for name in names:
+            if name not in existing:
+                continue
+            try:
+                await collection.drop_index(name)
+                summary["dropped"].append(f"{collection_name}.{name}")
+            except OperationFailure as exc:
+                # Another worker may have dropped it first
+                logger.warning(f"Could not drop retired index {collection_name}.{name}: {exc}")
+
+    logger.info(
+        f"Index reconciliation: {len(summary['created'])} created, {len(summary['rebuilt'])} rebuilt, "
+        f"{len(summary['unchanged'])} unchanged, {len(summary['dropped'])} dropped, {len(summary['failed'])} failed"
+    )
+    return summary
+
+
+def _walk_plan(plan: dict):
+    """Yield every stage node of an explain() winning plan tree."""
+    pending = [plan]
+    while pending:
+        node = pending.pop()
+        if not isinstance(node, dict):
+            continue
+        if "stage" in node:
+            yield node
+        if "inputStage" in node:
+            pending.append(node["inputStage"])
+        pending.extend(node.get("inputStages", []))
+        # Slot-based engine plans nest the classic tree under queryPlan
+        if "queryPlan" in node:
+            pending.append(node["queryPlan"])
+
+
+def summarize_plan(winning_plan: dict) -> dict:
+    """Stage names, index names and whether an explain() winning plan scans a whole collection."""
+    nodes = list(_walk_plan(winning_plan))
+    stages = [node["stage"] for node in nodes]
+    return {
+        "stages": stages,
+        "indexes": [node["indexName"] for node in nodes if node["stage"] == "IXSCAN"],
+        "collscan": "COLLSCAN" in stages,
+    }
+
+
+async def index_coverage_report(db) -> List[dict]:
+    """Explain every canonical route query and flag plans that scan a whole collection."""
+    report = []
+    for query in CANONICAL_QUERIES:
+        entry = {"route": query["route"], "collection": query["collection"], "filter": query["filter"]}
+        try:
+            cursor = db[query["collection"]].find(query["filter"], {"_id": 0})
+            if query.get("sort"):
+                cursor = cursor.sort(query["sort"])
+            if query.get("limit"):
+                cursor = cursor.limit(query["limit"])
+            explain = await cursor.explain()
+            entry.update(summarize_plan(explain.get("queryPlanner", {}).get("winningPlan", {})))
+        except OperationFailure as exc:
+            entry["error"] = str(exc)
+            entry["collscan"] = None
+        report.append(entry)
+    return report
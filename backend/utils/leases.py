@@ -0,0 +1,55 @@
+"""Mongo-backed leader leases for background jobs.
+
+When several API processes run, a job that must run in only one of them
+takes a lease document in ``scheduler_leases`` and keeps renewing it. If the
+holder dies, the lease expires and another process takes over.
+"""
+import os
+import socket
+import uuid
+from datetime import datetime, timezone, timedelta
+
+from pymongo.errors import DuplicateKeyError
+
+from database import db
+
+# Identifies this process as a lease holder
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LeaderLease:
+    """A named, expiring lease held by at most one process at a time."""
+
+    def __init__(self, name: str, ttl_seconds: float):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.is_leader = False
+
+    async def acquire(self) -> bool:
+        """Take or renew the lease; returns whether this process holds it."""
+        now = datetime.now(timezone.utc)
+        try:
+            await db.scheduler_leases.find_one_and_update(
+                {"_id": self.name, "$or": [{"holder": INSTANCE_ID}, {"expires_at": {"$lte": now.isoformat()}}]},
+                {"$set": {
+                    "holder": INSTANCE_ID,
+                    "expires_at": (now + timedelta(seconds=self.ttl_seconds)).isoformat(),
+                    "renewed_at": now.isoformat()
+                }},
+                upsert=True
+            )
+            self.is_leader = True
+        except DuplicateKeyError:
+            # Another live holder owns the lease, so the upsert collided with its document
+            self.is_leader = False
+        return self.is_leader
+
+    async def release(self):
+        """Give the lease up so another process can take over immediately."""
+        if self.is_leader:
+            await db.scheduler_leases.delete_one({"_id": self.name, "holder": INSTANCE_ID})
+            self.is_leader = False
+
+    async def holder(self) -> dict:
+        lease = await db.scheduler_leases.find_one({"_id": self.name})
+        return {"holder": lease.get("holder"), "expires_at": lease.get("expires_at")} if lease else {}
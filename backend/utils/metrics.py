@@ -0,0 +1,259 @@
+"""Request and MongoDB command metrics in Prometheus text format.
+
+``MetricsMiddleware`` records a latency histogram per (method, route
+template, status) plus in-flight request counts per method; routes are
+labelled by their template (``/api/applications/{application_id}``), never
+the raw path, so label cardinality stays bounded by the route table.
+``CommandMetricsListener`` records a duration histogram and returned or
+affected document counts per (collection, command). Both are rendered by
+``render_prometheus`` for the admin metrics endpoint. Values are per worker.
+"""
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pymongo import monitoring
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MONGO_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+UNMATCHED_ROUTE = "unmatched"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """Cumulative-bucket histogram of observations in seconds."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, cumulative count) pairs including +Inf."""
+        pairs, running = [], 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            pairs.append((_format_float(bound), running))
+        pairs.append(("+Inf", self.count))
+        return pairs
+
+
+def _format_float(value: float) -> str:
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}"
+
+
+class _HistogramFamily:
+    """Histograms keyed by a label tuple."""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...], buckets: Tuple[float, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self.series: Dict[Tuple[str, ...], Histogram] = {}
+
+    def observe(self, labels: Tuple[str, ...], value: float):
+        histogram = self.series.get(labels)
+        if histogram is None:
+            histogram = self.series[labels] = Histogram(self.buckets)
+        histogram.observe(value)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, histogram in sorted(self.series.items()):
+            for le, count in histogram.cumulative():
+                bucket_labels = _labels(self.label_names, labels, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {count}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {histogram.sum:.6f}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {histogram.count}")
+        return lines
+
+
+def _render_values(name: str, help_text: str, metric_type: str, label_names: Tuple[str, ...],
+                   values: Dict[Tuple[str, ...], float]) -> List[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+    for labels, value in sorted(values.items()):
+        lines.append(f"{name}{_labels(label_names, labels)} {value}")
+    return lines
+
+
+class RouteMetrics:
+    """Per-route request latency and per-method in-flight counts for this worker."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = _HistogramFamily(
+            "topwar_http_request_duration_seconds", "HTTP request latency by route template.",
+            ("method", "route", "status"), HTTP_BUCKETS)
+        self.in_flight: Dict[Tuple[str], int] = defaultdict(int)
+
+    def started(self, method: str):
+        with self._lock:
+            self.in_flight[(method,)] += 1
+
+    def finished(self, method: str, route: str, status: int, seconds: float):
+        with self._lock:
+            self.in_flight[(method,)] -= 1
+            self.latency.observe((method, route, str(status)), seconds)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            return self.latency.render() + _render_values(
+                "topwar_http_requests_in_flight", "Requests currently being handled.",
+                "gauge", ("method",), dict(self.in_flight))
+
+
+# Scope of the request being handled; Motor copies the context into its executor threads
+_request_scope: ContextVar[Optional[dict]] = ContextVar("request_scope", default=None)
+
+
+def _route_template(scope) -> str:
+    # Set by the router when it matches; absent for 404s and requests answered by middleware
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def current_route() -> Optional[str]:
+    """"METHOD /route/{template}" of the request this code runs for, or None outside requests."""
+    scope = _request_scope.get()
+    if scope is None:
+        return None
+    return f"{scope['method']} {_route_template(scope)}"
+
+
+class MetricsMiddleware:
+    """ASGI middleware feeding RouteMetrics for every HTTP request."""
+
+    def __init__(self, app, metrics: Optional[RouteMetrics] = None):
+        self.app = app
+        self.metrics = metrics or route_metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        self.metrics.started(method)
+        token = _request_scope.set(scope)
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.metrics.finished(method, _route_template(scope), status, time.perf_counter() - started)
+            _request_scope.reset(token)
+
+
+class _CommandStats:
+    __slots__ = ("documents", "failures")
+
+    def __init__(self):
+        self.documents = 0
+        self.failures = 0
+
+
+def command_collection(event: monitoring.CommandStartedEvent) -> str:
+    if event.command_name == "getMore":
+        return event.command.get("collection", "-")
+    target = event.command.get(event.command_name)
+    return target if isinstance(target, str) else "-"
+
+
+def reply_documents(command_name: str, reply: dict) -> int:
+    """Documents returned (reads) or affected (writes) by a successful command."""
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        return len(cursor.get("firstBatch", cursor.get("nextBatch", [])))
+    if command_name == "findAndModify":
+        return 1 if reply.get("value") is not None else 0
+    n = reply.get("n")
+    return n if isinstance(n, int) else 0
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Per-collection, per-command durations and document counts.
+
+    Motor runs pymongo operations on executor threads, so collection names
+    are carried from started to finished events by request id under a lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[object, int], str] = {}
+        self.latency = _HistogramFamily(
+            "topwar_mongo_command_duration_seconds", "MongoDB command duration by collection and command.",
+            ("collection", "command"), MONGO_BUCKETS)
+        self._stats: Dict[Tuple[str, str], _CommandStats] = defaultdict(_CommandStats)
+
+    def started(self, event):
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = command_collection(event)
+
+    def _finish(self, event) -> Tuple[str, str]:
+        with self._lock:
+            collection = self._pending.pop((event.connection_id, event.request_id), "-")
+        return collection, event.command_name
+
+    def succeeded(self, event):
+        labels = self._finish(event)
+        documents = reply_documents(event.command_name, event.reply)
+        with self._lock:
+            self.latency.observe(labels, event.duration_micros / 1e6)
+            self._stats[labels].documents += documents
+
+    def failed(self, event):
+        labels = self._finish(event)
+        with self._lock:
+            self.latency.observe(labels, event.duration_micros / 1e6)
+            self._stats[labels].failures += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            labels = ("collection", "command")
+            return self.latency.render() + _render_values(
+                "topwar_mongo_command_documents_total", "Documents returned or affected by MongoDB commands.",
+                "counter", labels, {key: stats.documents for key, stats in self._stats.items()}
+            ) + _render_values(
+                "topwar_mongo_command_failures_total", "Failed MongoDB commands.",
+                "counter", labels, {key: stats.failures for key, stats in self._stats.items()})
+
+
+route_metrics = RouteMetrics()
+command_metrics = CommandMetricsListener()
+
+
+def render_prometheus() -> str:
+    """Every metric of this worker in the Prometheus text exposition format."""
+    return "\n".join(route_metrics.render() + command_metrics.render()) + "\n"
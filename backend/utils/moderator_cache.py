@@ -0,0 +1,109 @@
+"""Per-worker cache of the moderator fields used for authorization checks."""
+import os
+import time
+from typing import Optional
+
+from cachetools import TTLCache
+
+from database import db
+
+MODERATOR_CACHE_TTL_SECONDS = int(os.environ.get('MODERATOR_CACHE_TTL_SECONDS', '30'))
+MODERATOR_CACHE_MAX_SIZE = int(os.environ.get('MODERATOR_CACHE_MAX_SIZE', '1024'))
+
+# Only permission-bearing fields are cached; never password material
+AUTHORIZATION_PROJECTION = {
+    "_id": 0,
+    "username": 1,
+    "role": 1,
+    "roles": 1,
+    "status": 1,
+    "is_admin": 1,
+    "is_training_manager": 1,
+    "is_in_game_leader": 1,
+    "is_discord_leader": 1,
+    "can_view_applications": 1,
+}
+
+
+class _CountingTTLCache(TTLCache):
+    """TTLCache that counts least-recently-used evictions caused by the size bound."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.evictions = 0
+
+    def popitem(self):
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+
+class ModeratorCache:
+    """TTL + LRU cache of moderator authorization records.
+
+    Entries expire after MODERATOR_CACHE_TTL_SECONDS, which bounds how stale
+    another worker's copy can be. Writes in this worker invalidate explicitly.
+    Misses for unknown usernames are not cached. The number of active
+    moderators (used to auto-close polls) is cached alongside with the same TTL.
+    """
+
+    def __init__(self, ttl: float = MODERATOR_CACHE_TTL_SECONDS, maxsize: int = MODERATOR_CACHE_MAX_SIZE):
+        self._cache = _CountingTTLCache(maxsize=maxsize, ttl=ttl)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._active_count = None
+        self._active_count_expires = 0.0
+
+    async def get(self, username: str) -> Optional[dict]:
+        """Return the moderator's authorization fields, reading through to Mongo on a miss."""
+        cached = self._cache.get(username)
+        if cached is not None:
+            self.hits += 1
+            return dict(cached)
+
+        self.misses += 1
+        moderator = await db.moderators.find_one({"username": username}, AUTHORIZATION_PROJECTION)
+        if moderator is None:
+            return None
+        self._cache[username] = moderator
+        return dict(moderator)
+
+    def invalidate(self, *usernames: str):
+        """Drop cached entries after a write that changes a moderator's permissions."""
+        for username in usernames:
+            if self._cache.pop(username, None) is not None:
+                self.invalidations += 1
+
+    async def active_count(self) -> int:
+        """Number of moderators with status 'active', refreshed at most once per TTL."""
+        now = time.monotonic()
+        if self._active_count is None or now >= self._active_count_expires:
+            self._active_count = await db.moderators.count_documents({"status": "active"})
+            self._active_count_expires = now + self._cache.ttl
+        return self._active_count
+
+    def invalidate_active_count(self):
+        """Force a recount after a moderator is added, removed, enabled or disabled."""
+        self._active_count = None
+
+    def clear(self):
+        self._cache.clear()
+        self._active_count = None
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._cache),
+            "max_size": self._cache.maxsize,
+            "ttl_seconds": self._cache.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self._cache.evictions,
+            "invalidations": self.invalidations,
+            "active_count": self._active_count,
+        }
+
+
+moderator_cache = ModeratorCache()
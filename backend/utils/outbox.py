@@ -0,0 +1,362 @@
+"""Durable email outbox and pooled SMTP sender.
+
+Messages are written to the ``email_outbox`` collection by the request that
+triggers them, so nothing is lost if the process restarts before delivery.
+An async worker claims due messages in priority order, sends them in batches
+over reused authenticated SMTP connections, respects a provider rate limit
+and retries failures with exponential backoff.
+"""
+import asyncio
+import logging
+import os
+import random
+import smtplib
+import threading
+import time
+import uuid
+from datetime import datetime, timezone, timedelta
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import List, Optional
+
+from pymongo import ReturnDocument
+
+from database import db
+
+logger = logging.getLogger(__name__)
+
+# SMTP settings (the Gmail variables remain the defaults for credentials)
+SMTP_HOST = os.environ.get('SMTP_HOST', 'smtp.gmail.com')
+SMTP_PORT = int(os.environ.get('SMTP_PORT', '587'))
+SMTP_STARTTLS = os.environ.get('SMTP_STARTTLS', 'true').lower() in ('1', 'true', 'yes')
+SMTP_USER = os.environ.get('SMTP_USER', os.environ.get('GMAIL_USER', ''))
+SMTP_PASSWORD = os.environ.get('SMTP_PASSWORD', os.environ.get('GMAIL_APP_PASSWORD', ''))
+EMAIL_FROM = os.environ.get('EMAIL_FROM', SMTP_USER)
+SMTP_TIMEOUT_SECONDS = float(os.environ.get('SMTP_TIMEOUT_SECONDS', '30'))
+
+# Sender tuning
+EMAIL_SMTP_CONNECTIONS = int(os.environ.get('EMAIL_SMTP_CONNECTIONS', '2'))
+EMAIL_CONNECTION_MAX_AGE_SECONDS = float(os.environ.get('EMAIL_CONNECTION_MAX_AGE_SECONDS', '300'))
+EMAIL_BATCH_SIZE = int(os.environ.get('EMAIL_BATCH_SIZE', '20'))
+EMAIL_RATE_PER_MINUTE = float(os.environ.get('EMAIL_RATE_PER_MINUTE', '60'))
+EMAIL_MAX_ATTEMPTS = int(os.environ.get('EMAIL_MAX_ATTEMPTS', '6'))
+EMAIL_RETRY_BASE_SECONDS = float(os.environ.get('EMAIL_RETRY_BASE_SECONDS', '30'))
+EMAIL_RETRY_MAX_SECONDS = float(os.environ.get('EMAIL_RETRY_MAX_SECONDS', '3600'))
+EMAIL_POLL_INTERVAL_SECONDS = float(os.environ.get('EMAIL_POLL_INTERVAL_SECONDS', '10'))
+# A claimed message is handed back if its sender dies without finishing it
+EMAIL_CLAIM_LEASE_SECONDS = float(os.environ.get('EMAIL_CLAIM_LEASE_SECONDS', '300'))
+
+# Lower numbers are sent first
+PRIORITY_HIGH = 0     # password resets
+PRIORITY_NORMAL = 5   # confirmations
+PRIORITY_LOW = 10     # application status notices
+
+EMAIL_ENABLED = bool(SMTP_HOST and EMAIL_FROM)
+
+
+def build_message(message: dict) -> MIMEMultipart:
+    """Build the MIME message for an outbox document."""
+    msg = MIMEMultipart("alternative")
+    msg['From'] = EMAIL_FROM
+    msg['To'] = message["to_email"]
+    msg['Subject'] = message["subject"]
+    # Clients render the last alternative they support, so plain text goes first
+    if message.get("body_text"):
+        msg.attach(MIMEText(message["body_text"], 'plain'))
+    msg.attach(MIMEText(message["body_html"], 'html'))
+    return msg
+
+
+def retry_delay_seconds(attempts: int) -> float:
+    """Exponential backoff with jitter for the given number of failed attempts."""
+    delay = min(EMAIL_RETRY_MAX_SECONDS, EMAIL_RETRY_BASE_SECONDS * (2 ** max(0, attempts - 1)))
+    return delay * random.uniform(0.8, 1.2)
+
+
+class SMTPConnectionPool:
+    """Thread-safe pool of authenticated SMTP connections.
+
+    Connections are reused until they exceed EMAIL_CONNECTION_MAX_AGE_SECONDS or
+    fail, which avoids a TCP + STARTTLS + AUTH handshake per message.
+    """
+
+    def __init__(self, host: str = SMTP_HOST, port: int = SMTP_PORT, username: str = SMTP_USER,
+                 password: str = SMTP_PASSWORD, starttls: bool = SMTP_STARTTLS,
+                 size: int = EMAIL_SMTP_CONNECTIONS, max_age: float = EMAIL_CONNECTION_MAX_AGE_SECONDS):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.size = size
+        self.max_age = max_age
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self.connections_opened = 0
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=SMTP_TIMEOUT_SECONDS)
+        if self.starttls:
+            server.starttls()
+        if self.username and self.password:
+            server.login(self.username, self.password)
+        self.connections_opened += 1
+        return server, time.monotonic()
+
+    @staticmethod
+    def _close(server):
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+    def _acquire(self):
+        with self._lock:
+            entry = self._idle.pop() if self._idle else None
+        if entry is not None:
+            server, opened_at = entry
+            if time.monotonic() - opened_at < self.max_age:
+                return entry
+            self._close(server)
+        return self._connect()
+
+    def _release(self, entry, healthy: bool):
+        if healthy:
+            with self._lock:
+                self._idle.append(entry)
+        else:
+            self._close(entry[0])
+
+    def send(self, msg: MIMEMultipart):
+        """Send one message on a pooled connection, reconnecting once if the connection went stale."""
+        with self._slots:
+            entry = self._acquire()
+            try:
+                entry[0].send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                self._close(entry[0])
+                entry = self._connect()
+                try:
+                    entry[0].send_message(msg)
+                except Exception:
+                    self._release(entry, healthy=False)
+                    raise
+            except smtplib.SMTPRecipientsRefused:
+                # The connection is still usable; only this recipient was rejected
+                self._release(entry, healthy=True)
+                raise
+            except Exception:
+                self._release(entry, healthy=False)
+                raise
+            self._release(entry, healthy=True)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server, _ in idle:
+            self._close(server)
+
+
+class RateLimiter:
+    """Async token bucket limiting sends to the provider's rate."""
+
+    def __init__(self, per_minute: float = EMAIL_RATE_PER_MINUTE, burst: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = burst if burst is not None else max(1.0, min(per_minute, 10.0))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def _outbox_document(to_email: str, subject: str, body_html: str, body_text: Optional[str],
+                     priority: int, now: str) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "to_email": to_email,
+        "subject": subject,
+        "body_html": body_html,
+        "body_text": body_text,
+        "priority": priority,
+        "status": "pending",
+        "attempts": 0,
+        "next_attempt_at": now,
+        "created_at": now,
+        "last_error": None,
+    }
+
+
+async def enqueue_email(to_email: str, subject: str, body_html: str, body_text: Optional[str] = None,
+                        priority: int = PRIORITY_NORMAL) -> Optional[str]:
+    """Durably queue an email for delivery and wake the local sender."""
+    if not EMAIL_ENABLED:
+        logger.warning("Email sending not configured, skipping email send")
+        return None
+
+    doc = _outbox_document(to_email, subject, body_html, body_text, priority,
+                           datetime.now(timezone.utc).isoformat())
+    await db.email_outbox.insert_one(doc)
+    outbox_worker.wake()
+    return doc["id"]
+
+
+async def enqueue_emails(messages: List[dict]) -> int:
+    """Queue many emails in one insert; each message has the enqueue_email fields."""
+    if not EMAIL_ENABLED:
+        logger.warning("Email sending not configured, skipping email send")
+        return 0
+    if not messages:
+        return 0
+
+    now = datetime.now(timezone.utc).isoformat()
+    docs = [_outbox_document(message["to_email"], message["subject"], message["body_html"],
+                             message.get("body_text"), message.get("priority", PRIORITY_NORMAL), now)
+            for message in messages]
+    await db.email_outbox.insert_many(docs, ordered=False)
+    outbox_worker.wake()
+    return len(docs)
+
+
+class OutboxWorker:
+    """Background task draining the email outbox."""
+
+    def __init__(self, pool: Optional[SMTPConnectionPool] = None, rate_limiter: Optional[RateLimiter] = None,
+                 batch_size: int = EMAIL_BATCH_SIZE):
+        self.pool = pool or SMTPConnectionPool()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.batch_size = batch_size
+        self._task = None
+        self._wake = asyncio.Event()
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+
+    def wake(self):
+        self._wake.set()
+
+    def start(self):
+        if not EMAIL_ENABLED:
+            logger.warning("Email sending not configured, outbox worker not started")
+            return
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="email-outbox")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self.pool.close)
+
+    async def _run(self):
+        while True:
+            try:
+                processed = await self.process_batch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.error(f"Email outbox batch failed: {exc}")
+                processed = 0
+            if processed < self.batch_size:
+                # Drained: sleep until something is enqueued here or the poll interval passes
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=EMAIL_POLL_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _reclaim_expired(self, now: datetime):
+        await db.email_outbox.update_many(
+            {"status": "sending", "lease_until": {"$lte": now.isoformat()}},
+            {"$set": {"status": "pending"}}
+        )
+
+    async def _claim(self, now: datetime) -> Optional[dict]:
+        return await db.email_outbox.find_one_and_update(
+            {"status": "pending", "next_attempt_at": {"$lte": now.isoformat()}},
+            {"$set": {
+                "status": "sending",
+                "lease_until": (now + timedelta(seconds=EMAIL_CLAIM_LEASE_SECONDS)).isoformat()
+            }},
+            sort=[("priority", 1), ("next_attempt_at", 1)],
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def process_batch(self) -> int:
+        """Claim and deliver up to batch_size due messages; returns how many were claimed."""
+        now = datetime.now(timezone.utc)
+        await self._reclaim_expired(now)
+
+        batch = []
+        for _ in range(self.batch_size):
+            message = await self._claim(now)
+            if message is None:
+                break
+            batch.append(message)
+
+        if batch:
+            await asyncio.gather(*(self._deliver(message) for message in batch))
+        return len(batch)
+
+    async def _deliver(self, message: dict):
+        await self.rate_limiter.acquire()
+        try:
+            await asyncio.to_thread(self.pool.send, build_message(message))
+        except Exception as exc:
+            await self._record_failure(message, exc)
+            return
+
+        await db.email_outbox.update_one(
+            {"id": message["id"]},
+            {"$set": {"status": "sent", "sent_at": datetime.now(timezone.utc).isoformat(), "last_error": None},
+             "$inc": {"attempts": 1}}
+        )
+        self.sent += 1
+        logger.info(f"Email sent successfully to {message['to_email']}")
+
+    async def _record_failure(self, message: dict, exc: Exception):
+        attempts = message.get("attempts", 0) + 1
+        permanent = isinstance(exc, smtplib.SMTPRecipientsRefused)
+        if permanent or attempts >= EMAIL_MAX_ATTEMPTS:
+            update = {"status": "failed", "attempts": attempts, "last_error": str(exc)}
+            self.failed += 1
+            logger.error(f"Failed to send email to {message['to_email']} after {attempts} attempts: {exc}")
+        else:
+            retry_at = datetime.now(timezone.utc) + timedelta(seconds=retry_delay_seconds(attempts))
+            update = {"status": "pending", "attempts": attempts, "last_error": str(exc),
+                      "next_attempt_at": retry_at.isoformat()}
+            self.retried += 1
+            logger.warning(f"Email to {message['to_email']} failed (attempt {attempts}), retrying: {exc}")
+        await db.email_outbox.update_one({"id": message["id"]}, {"$set": update})
+
+    async def stats(self) -> dict:
+        counts = await db.email_outbox.aggregate([
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+        ]).to_list(None)
+        return {
+            "enabled": EMAIL_ENABLED,
+            "running": self._task is not None and not self._task.done(),
+            "sent": self.sent,
+            "retried": self.retried,
+            "failed": self.failed,
+            "smtp_connections_opened": self.pool.connections_opened,
+            "queue": {row["_id"]: row["count"] for row in counts},
+        }
+
+
+outbox_worker = OutboxWorker()
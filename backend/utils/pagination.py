@@ -0,0 +1,66 @@
+"""Opaque keyset pagination cursors.
+
+Sort values are ISO strings on documents the date backfill has not reached
+yet and BSON dates everywhere else. MongoDB orders every string before every
+date and only compares values of the same type, so ``keyset_filter`` adds
+the other type's rows that sort after the cursor; a page boundary never
+skips rows still waiting for the backfill.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from fastapi import HTTPException
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(sort_value: Any, doc_id: str) -> str:
+    """Encode the (sort value, id) of the last row of a page as an opaque token."""
+    if isinstance(sort_value, datetime):
+        payload = {"t": "d", "v": sort_value.isoformat(), "i": doc_id}
+    else:
+        payload = {"t": "s", "v": sort_value, "i": doc_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, str]:
+    """Decode a token produced by encode_cursor, rejecting anything malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        doc_id = payload["i"]
+        value = payload["v"]
+        # Only plain strings reach the query; anything else could smuggle in an operator
+        if not isinstance(value, str):
+            raise ValueError("cursor value must be a string")
+        if payload["t"] == "d":
+            value = datetime.fromisoformat(value)
+        elif payload["t"] != "s":
+            raise ValueError("unknown cursor type")
+        if not isinstance(doc_id, str):
+            raise ValueError("cursor id must be a string")
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor") from exc
+    return value, doc_id
+
+
+def keyset_filter(sort_field: str, cursor: Optional[str], ascending: bool = False) -> dict:
+    """Filter selecting rows strictly after the cursor for a (sort_field, id) ordering, descending by default."""
+    if not cursor:
+        return {}
+    value, doc_id = decode_cursor(cursor)
+    after = "$gt" if ascending else "$lt"
+    clauses = [
+        {sort_field: {after: value}},
+        {sort_field: value, "id": {after: doc_id}},
+    ]
+    if ascending and isinstance(value, str):
+        clauses.append({sort_field: {"$type": "date"}})
+    elif not ascending and isinstance(value, datetime):
+        clauses.append({sort_field: {"$type": "string"}})
+    return {"$or": clauses}
@@ -0,0 +1,116 @@
+"""In-process scheduler that closes polls when they expire.
+
+The scheduler sleeps until the earliest active poll's expires_at rather than
+polling on a fixed interval. Only the process holding the ``poll_expiry``
+leader lease runs the sweep, so scaling to several workers does not
+multiply the writes.
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Optional
+
+from database import db
+from utils.leases import LeaderLease
+
+logger = logging.getLogger(__name__)
+
+POLL_EXPIRY_LEASE_SECONDS = float(os.environ.get('POLL_EXPIRY_LEASE_SECONDS', '30'))
+# The leader renews (and followers retry) the lease this often, which also caps each sleep
+POLL_EXPIRY_RENEW_SECONDS = float(os.environ.get('POLL_EXPIRY_RENEW_SECONDS', '10'))
+POLL_EXPIRY_MIN_SLEEP_SECONDS = 1.0
+
+
+class PollExpiryScheduler:
+    """Background task closing and archiving expired polls."""
+
+    def __init__(self, lease: Optional[LeaderLease] = None):
+        self.lease = lease or LeaderLease("poll_expiry", POLL_EXPIRY_LEASE_SECONDS)
+        self._task = None
+        self._wake = asyncio.Event()
+        self.next_expiry = None
+        self.sweeps = 0
+        self.closed = 0
+
+    def wake(self):
+        """Re-plan the next wake-up, e.g. after a poll is created."""
+        self._wake.set()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="poll-expiry")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.lease.release()
+        except Exception as exc:
+            logger.warning(f"Failed to release poll expiry lease: {exc}")
+
+    async def _run(self):
+        while True:
+            try:
+                delay = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.error(f"Poll expiry sweep failed: {exc}")
+                delay = POLL_EXPIRY_RENEW_SECONDS
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_once(self) -> float:
+        """Close due polls if this process is the leader; returns seconds to sleep."""
+        if not await self.lease.acquire():
+            self.next_expiry = None
+            return POLL_EXPIRY_RENEW_SECONDS
+
+        self.next_expiry = await self._earliest_expiry()
+        if self.next_expiry is not None and self.next_expiry <= datetime.now(timezone.utc):
+            # Imported lazily: the poll routes import this module to wake the scheduler
+            from routes.polls import close_expired_polls
+            closed = await close_expired_polls()
+            self.sweeps += 1
+            if closed:
+                self.closed += closed
+                logger.info(f"Closed {closed} expired polls")
+            self.next_expiry = await self._earliest_expiry()
+        return self._seconds_until_next_run()
+
+    def _seconds_until_next_run(self) -> float:
+        if self.next_expiry is None:
+            return POLL_EXPIRY_RENEW_SECONDS
+        until_expiry = (self.next_expiry - datetime.now(timezone.utc)).total_seconds()
+        # The floor keeps a poll that could not be closed from spinning the loop
+        return max(POLL_EXPIRY_MIN_SLEEP_SECONDS, min(until_expiry, POLL_EXPIRY_RENEW_SECONDS))
+
+    @staticmethod
+    async def _earliest_expiry() -> Optional[datetime]:
+        # Polls still holding an ISO-string expiry are picked up once the date backfill reaches them
+        upcoming = await db.polls.find_one(
+            {"is_active": True, "expires_at": {"$type": "date"}}, {"_id": 0, "expires_at": 1}, sort=[("expires_at", 1)]
+        )
+        return upcoming.get("expires_at") if upcoming else None
+
+    async def stats(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "is_leader": self.lease.is_leader,
+            "lease": await self.lease.holder(),
+            "next_expiry": self.next_expiry,
+            "sweeps": self.sweeps,
+            "closed": self.closed,
+        }
+
+
+poll_expiry_scheduler = PollExpiryScheduler()
@@ -0,0 +1,152 @@
+"""Connection pool statistics collected from pymongo pool events."""
+import threading
+import time
+from collections import Counter, deque
+
+from pymongo import monitoring
+
+# Number of recent checkout waits kept per pool for percentile estimates
+WAIT_SAMPLE_SIZE = 1024
+
+
+def _percentile(samples: list, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, max(0, int(round(fraction * len(samples))) - 1))
+    return samples[index]
+
+
+class _PoolState:
+    """Counters for a single server's connection pool."""
+
+    def __init__(self):
+        self.open_connections = 0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.connections_created = 0
+        self.connections_closed = Counter()
+        self.checkouts = 0
+        self.checkout_failures = Counter()
+        self.clears = 0
+        self.wait_count = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.recent_waits_ms = deque(maxlen=WAIT_SAMPLE_SIZE)
+
+    def record_wait(self, wait_ms: float):
+        self.wait_count += 1
+        self.wait_total_ms += wait_ms
+        self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+        self.recent_waits_ms.append(wait_ms)
+
+    def snapshot(self) -> dict:
+        recent = sorted(self.recent_waits_ms)
+        return {
+            "open_connections": self.open_connections,
+            "in_use": self.in_use,
+            "max_in_use": self.max_in_use,
+            "connections_created": self.connections_created,
+            "connections_closed": sum(self.connections_closed.values()),
+            "connections_closed_by_reason": dict(self.connections_closed),
+            "checkouts": self.checkouts,
+            "checkout_failures": sum(self.checkout_failures.values()),
+            "checkout_failures_by_reason": dict(self.checkout_failures),
+            "pool_clears": self.clears,
+            "checkout_wait_ms": {
+                "count": self.wait_count,
+                "avg": round(self.wait_total_ms / self.wait_count, 3) if self.wait_count else 0.0,
+                "max": round(self.wait_max_ms, 3),
+                "p50": round(_percentile(recent, 0.50), 3),
+                "p95": round(_percentile(recent, 0.95), 3),
+                "p99": round(_percentile(recent, 0.99), 3),
+            },
+        }
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Track checkout wait times, in-use counts and connection churn per server.
+
+    Motor runs pymongo operations on executor threads, so checkout start times are
+    kept in thread-local storage and all counters are guarded by a lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._pools = {}
+        self._started_at = time.time()
+
+    def _pool(self, address) -> _PoolState:
+        key = f"{address[0]}:{address[1]}"
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = _PoolState()
+        return pool
+
+    def _finish_wait(self) -> float:
+        started = getattr(self._local, "checkout_started", None)
+        self._local.checkout_started = None
+        if started is None:
+            return 0.0
+        return (time.perf_counter() - started) * 1000
+
+    def pool_created(self, event):
+        with self._lock:
+            self._pool(event.address)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self._pool(event.address).clears += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.connections_created += 1
+            pool.open_connections += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.connections_closed[event.reason] += 1
+            pool.open_connections = max(0, pool.open_connections - 1)
+
+    def connection_check_out_started(self, event):
+        self._local.checkout_started = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        wait_ms = self._finish_wait()
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.checkout_failures[event.reason] += 1
+            pool.record_wait(wait_ms)
+
+    def connection_checked_out(self, event):
+        wait_ms = self._finish_wait()
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.checkouts += 1
+            pool.in_use += 1
+            pool.max_in_use = max(pool.max_in_use, pool.in_use)
+            pool.record_wait(wait_ms)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.in_use = max(0, pool.in_use - 1)
+
+    def snapshot(self) -> dict:
+        """Return a point-in-time copy of every pool's statistics."""
+        with self._lock:
+            pools = {address: pool.snapshot() for address, pool in self._pools.items()}
+        return {"uptime_seconds": round(time.time() - self._started_at, 1), "pools": pools}
+
@@ -0,0 +1,100 @@
+"""Indexed prefix search for applications.
+
+Each application stores a ``search_terms`` array holding every prefix of every
+token in its searchable fields. A multikey index on that array lets Mongo
+answer prefix searches with index lookups instead of unanchored regex scans;
+candidates are then ranked in-process by field weight and match quality.
+"""
+import re
+from typing import Dict, List, Optional
+
+from pymongo import UpdateOne
+
+# Searchable fields and their ranking weights
+SEARCH_FIELDS: Dict[str, int] = {
+    "name": 3,
+    "ingame_name": 3,
+    "discord_handle": 2,
+    "server": 1,
+}
+MAX_TERM_LENGTH = 24
+MAX_QUERY_TERMS = 6
+# Upper bound on matching rows pulled back for ranking
+SEARCH_CANDIDATE_LIMIT = 500
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def tokenize(text) -> List[str]:
+    """Split text into lowercase alphanumeric tokens, truncated to MAX_TERM_LENGTH."""
+    if text is None:
+        return []
+    return [token[:MAX_TERM_LENGTH] for token in _TOKEN_RE.findall(str(text).casefold())]
+
+
+def _field_tokens(value) -> List[str]:
+    """Tokens of one field, plus the joined form so 'Troll_Master' also matches 'trollmaster'."""
+    tokens = tokenize(value)
+    if len(tokens) > 1:
+        tokens.append("".join(tokens)[:MAX_TERM_LENGTH])
+    return tokens
+
+
+def build_search_terms(doc: dict) -> List[str]:
+    """Every prefix of every token in the document's searchable fields."""
+    terms = set()
+    for field in SEARCH_FIELDS:
+        for token in _field_tokens(doc.get(field)):
+            terms.update(token[:end] for end in range(1, len(token) + 1))
+    return sorted(terms)
+
+
+def build_search_filter(search: str) -> Optional[dict]:
+    """Mongo filter matching applications that contain every search token as a prefix.
+
+    Returns None when the input has no searchable characters. User input never
+    reaches a regex, so no escaping is needed.
+    """
+    tokens = list(dict.fromkeys(tokenize(search)))[:MAX_QUERY_TERMS]
+    if not tokens:
+        return None
+    return {"search_terms": {"$all": tokens}}
+
+
+def score_application(doc: dict, search: str) -> int:
+    """Relevance of a candidate: exact token matches outrank prefix matches, weighted by field."""
+    score = 0
+    for query_token in dict.fromkeys(tokenize(search)):
+        best = 0
+        for field, weight in SEARCH_FIELDS.items():
+            for token in _field_tokens(doc.get(field)):
+                if token == query_token:
+                    best = max(best, weight * 2)
+                elif token.startswith(query_token):
+                    best = max(best, weight)
+        score += best
+    return score
+
+
+def rank_applications(docs: List[dict], search: str) -> List[dict]:
+    """Order candidates by relevance; the incoming (newest-first) order breaks ties."""
+    scored = [(score_application(doc, search), position, doc) for position, doc in enumerate(docs)]
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return [doc for _, _, doc in scored]
+
+
+async def backfill_search_terms(db, batch_size: int = 500) -> int:
+    """Populate search_terms on applications written before search indexing existed."""
+    projection = {"_id": 1, **{field: 1 for field in SEARCH_FIELDS}}
+    updated = 0
+    while True:
+        batch = await db.applications.find(
+            {"search_terms": {"$exists": False}}, projection
+        ).limit(batch_size).to_list(batch_size)
+        if not batch:
+            return updated
+        await db.applications.bulk_write(
+            [UpdateOne({"_id": doc["_id"]}, {"$set": {"search_terms": build_search_terms(doc)}}) for doc in batch],
+            ordered=False
+        )
+        updated += len(batch)
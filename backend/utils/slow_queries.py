@@ -0,0 +1,305 @@
+"""Slow MongoDB command log with explain plans.
+
+``SlowQueryLog`` is a pymongo command listener: any command that takes at
+least ``SLOW_QUERY_THRESHOLD_MS`` is handed to a background task that
+records it in the capped ``slow_queries`` collection, together with
+
+* the route that issued it (``GET /applications/{application_id}``), or
+  ``background`` for workers and startup tasks,
+* the shape of its filter, sort or pipeline with every literal value
+  replaced by ``"?"``, so no usernames, tokens or search text are stored,
+* documents returned, and documents and index keys examined, taken from an
+  ``executionStats`` explain of the same command along with the stages and
+  indexes of the winning plan.
+
+Explain re-runs the command, so each (collection, command, shape) is
+explained at most once per ``SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS`` and later
+entries reuse that result. Listener callbacks run on Motor's executor
+threads and must not issue commands themselves; they only hand entries to
+the event loop. Entries arriving while ``SLOW_QUERY_QUEUE_SIZE`` are already
+waiting are counted and dropped.
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from cachetools import TTLCache
+from pymongo import monitoring
+from pymongo.errors import CollectionInvalid, PyMongoError
+
+from utils.indexes import summarize_plan
+from utils.metrics import command_collection, current_route, reply_documents
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', '100'))
+SLOW_QUERIES_CAPPED_BYTES = int(os.environ.get('SLOW_QUERIES_CAPPED_BYTES', str(4 * 1024 * 1024)))
+SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS = float(os.environ.get('SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS', '300'))
+SLOW_QUERY_EXPLAIN_TIMEOUT_MS = int(os.environ.get('SLOW_QUERY_EXPLAIN_TIMEOUT_MS', '5000'))
+SLOW_QUERY_QUEUE_SIZE = int(os.environ.get('SLOW_QUERY_QUEUE_SIZE', '100'))
+SLOW_QUERY_LOG_ENABLED = os.environ.get('SLOW_QUERY_LOG_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
+SLOW_QUERIES_COLLECTION = "slow_queries"
+BACKGROUND_ROUTE = "background"
+REDACTED = "?"
+
+# Long-running by design (tailable and change stream cursors) or issued by this log itself
+IGNORED_COMMANDS = {"getMore", "explain", "killCursors", "endSessions", "hello", "isMaster", "ismaster", "ping"}
+IGNORED_COLLECTIONS = {SLOW_QUERIES_COLLECTION, "events"}
+EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct", "update", "delete", "findAndModify"}
+# Commands that accept maxTimeMS themselves; writes are explained without one
+_TIME_LIMITED_COMMANDS = {"find", "aggregate", "count", "distinct", "findAndModify"}
+# Session, transaction and routing fields the server rejects inside an explained command
+_EXPLAIN_EXCLUDED_FIELDS = {
+    "lsid", "txnNumber", "autocommit", "startTransaction", "readConcern", "writeConcern",
+    "$db", "$clusterTime", "$readPreference", "apiVersion", "apiStrict", "apiDeprecationErrors",
+}
+
+
+def redact_shape(value):
+    """``value`` with field names and operators kept and every literal replaced by "?"."""
+    if isinstance(value, dict):
+        return {key: redact_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        # Lists collapse to their distinct element shapes, so $in of 3 or 300 values look alike
+        shapes = []
+        for item in value:
+            shape = redact_shape(item)
+            if shape not in shapes:
+                shapes.append(shape)
+        return shapes
+    return REDACTED
+
+
+def command_shape(command_name: str, command: dict) -> dict:
+    """Redacted filter, sort and pipeline of a command; empty for commands without one."""
+    if command_name in ("update", "delete"):
+        statements = command.get("updates" if command_name == "update" else "deletes") or [{}]
+        source = {"filter": statements[0].get("q")}
+    elif command_name in ("count", "distinct", "findAndModify"):
+        source = {"filter": command.get("query"), "sort": command.get("sort")}
+    else:
+        source = {"filter": command.get("filter"), "sort": command.get("sort"),
+                  "pipeline": command.get("pipeline")}
+    shape = {}
+    for part, value in source.items():
+        if value is None:
+            continue
+        if part == "sort":
+            # Field names and directions are not sensitive; keep them as sent
+            shape[part] = {key: direction if isinstance(direction, int) else REDACTED
+                           for key, direction in value.items()}
+        else:
+            shape[part] = redact_shape(value)
+    return shape
+
+
+def explain_command(command_name: str, command: dict) -> dict:
+    """An ``executionStats`` explain of ``command``, limited to its first write statement."""
+    explained = {key: value for key, value in command.items() if key not in _EXPLAIN_EXCLUDED_FIELDS}
+    if command_name == "update":
+        explained["updates"] = explained["updates"][:1]
+    elif command_name == "delete":
+        explained["deletes"] = explained["deletes"][:1]
+    if command_name in _TIME_LIMITED_COMMANDS:
+        explained["maxTimeMS"] = SLOW_QUERY_EXPLAIN_TIMEOUT_MS
+    return {"explain": explained, "verbosity": "executionStats"}
+
+
+def _find(document, key: str) -> Optional[dict]:
+    """First dict stored under ``key`` anywhere in an explain output."""
+    pending = [document]
+    while pending:
+        node = pending.pop(0)
+        if isinstance(node, dict):
+            found = node.get(key)
+            if isinstance(found, dict):
+                return found
+            pending.extend(node.values())
+        elif isinstance(node, list):
+            pending.extend(node)
+    return None
+
+
+def summarize_explain(explain: dict) -> dict:
+    """Examined and returned counts plus the winning plan of an ``executionStats`` explain.
+
+    Aggregations nest the planner output under their first stage, so both
+    sections are searched for rather than read from the top level.
+    """
+    summary = summarize_plan(_find(explain, "winningPlan") or {})
+    stats = _find(explain, "executionStats") or {}
+    summary.update({
+        "docs_examined": stats.get("totalDocsExamined"),
+        "keys_examined": stats.get("totalKeysExamined"),
+        "explain_returned": stats.get("nReturned"),
+        "explain_ms": stats.get("executionTimeMillis"),
+    })
+    return summary
+
+
+def _is_change_stream(event) -> bool:
+    if event.command_name != "aggregate":
+        return False
+    pipeline = event.command.get("pipeline") or [{}]
+    return "$changeStream" in pipeline[0]
+
+
+class SlowQueryLog(monitoring.CommandListener):
+    """Hands commands over the threshold from Motor's threads to a background writer."""
+
+    def __init__(self, threshold_ms: float = SLOW_QUERY_THRESHOLD_MS, queue_size: int = SLOW_QUERY_QUEUE_SIZE,
+                 explain_interval: float = SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS):
+        self.threshold_ms = threshold_ms
+        self._lock = threading.Lock()
+        # (connection, request id) -> (database, collection, command, route)
+        self._pending: Dict[Tuple[object, int], Tuple[str, str, dict, str]] = {}
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._explained: TTLCache = TTLCache(maxsize=1024, ttl=explain_interval)
+        self._loop = None
+        self._db = None
+        self._task = None
+        self.recorded = 0
+        self.dropped = 0
+        self.explained = 0
+        self.explain_failures = 0
+
+    # pymongo listener callbacks; these run on Motor's executor threads
+
+    def started(self, event):
+        if self._loop is None or event.command_name in IGNORED_COMMANDS:
+            return
+        collection = command_collection(event)
+        if collection in IGNORED_COLLECTIONS or _is_change_stream(event):
+            return
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = (
+                event.database_name, collection, event.command, current_route() or BACKGROUND_ROUTE)
+
+    def _finish(self, event, **outcome):
+        with self._lock:
+            started = self._pending.pop((event.connection_id, event.request_id), None)
+        duration_ms = event.duration_micros / 1000
+        loop = self._loop
+        if started is None or loop is None or duration_ms < self.threshold_ms:
+            return
+        database, collection, command, route = started
+        candidate = {"database": database, "collection": collection, "command_name": event.command_name,
+                     "command": command, "route": route, "duration_ms": round(duration_ms, 2), **outcome}
+        try:
+            loop.call_soon_threadsafe(self._enqueue, candidate)
+        except RuntimeError:
+            pass  # loop closed during shutdown
+
+    def succeeded(self, event):
+        self._finish(event, docs_returned=reply_documents(event.command_name, event.reply))
+
+    def failed(self, event):
+        failure = event.failure if isinstance(event.failure, dict) else {}
+        self._finish(event, error=failure.get("errmsg") or failure.get("codeName") or "failed")
+
+    # Event loop side
+
+    def _enqueue(self, candidate: dict):
+        try:
+            self._queue.put_nowait(candidate)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def start(self, database):
+        """Start recording commands; entries are written to ``database``."""
+        if not SLOW_QUERY_LOG_ENABLED or self._task is not None:
+            return
+        self._db = database
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.create_task(self._run(), name="slow-query-log")
+
+    async def stop(self):
+        self._loop = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        with self._lock:
+            self._pending.clear()
+
+    async def _ensure_capped_collection(self):
+        try:
+            await self._db.create_collection(SLOW_QUERIES_COLLECTION, capped=True, size=SLOW_QUERIES_CAPPED_BYTES)
+        except CollectionInvalid:
+            pass
+
+    async def _run(self):
+        try:
+            await self._ensure_capped_collection()
+        except PyMongoError as exc:
+            logger.warning(f"Could not create the {SLOW_QUERIES_COLLECTION} collection: {exc}")
+        while True:
+            candidate = await self._queue.get()
+            try:
+                entry = await self.build_entry(candidate)
+                await self._db[SLOW_QUERIES_COLLECTION].insert_one(entry)
+                self.recorded += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(f"Failed to record slow {candidate['command_name']} on "
+                               f"{candidate['collection']}: {exc}")
+
+    async def build_entry(self, candidate: dict) -> dict:
+        """The stored, redacted form of one slow command, explaining it if needed."""
+        command_name, command = candidate["command_name"], candidate["command"]
+        shape = command_shape(command_name, command)
+        entry = {
+            "created_at": datetime.now(timezone.utc),
+            "route": candidate["route"],
+            "collection": candidate["collection"],
+            "command": command_name,
+            "duration_ms": candidate["duration_ms"],
+            "shape": shape,
+            "docs_returned": candidate.get("docs_returned"),
+        }
+        if candidate.get("error"):
+            entry["error"] = candidate["error"]
+        logger.warning(f"Slow {command_name} on {candidate['collection']} ({candidate['duration_ms']:.0f} ms) "
+                       f"from {candidate['route']}: {json.dumps(shape, default=str)}")
+        if command_name in EXPLAINABLE_COMMANDS:
+            entry["plan"] = await self._plan(candidate, shape)
+        return entry
+
+    async def _plan(self, candidate: dict, shape: dict) -> dict:
+        key = (candidate["collection"], candidate["command_name"], json.dumps(shape, sort_keys=True, default=str))
+        plan = self._explained.get(key)
+        if plan is not None:
+            return dict(plan, reused=True)
+        database = self._db.client[candidate["database"]]
+        try:
+            explain = await database.command(explain_command(candidate["command_name"], candidate["command"]))
+            plan = summarize_explain(explain)
+            self.explained += 1
+        except PyMongoError as exc:
+            plan = {"error": str(exc)}
+            self.explain_failures += 1
+        self._explained[key] = plan
+        return dict(plan)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self._task is not None,
+            "threshold_ms": self.threshold_ms,
+            "queued": self._queue.qsize(),
+            "recorded": self.recorded,
+            "dropped": self.dropped,
+            "explained": self.explained,
+            "explain_failures": self.explain_failures,
+        }
+
+
+slow_query_log = SlowQueryLog()
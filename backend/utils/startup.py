@@ -0,0 +1,103 @@
+"""Startup phase timing and readiness state.
+
+Index reconciliation, data migrations and seeding run inside the startup
+event, so no request is served while documents are being rewritten; a
+failure there crashes startup as before. The application then starts
+accepting connections, and the deferrable warm-up (Mongo pool, config
+caches, templates, password hashing, workers) runs in a background task,
+one timed phase at a time. ``/api/health/ready`` reports ready only after
+every phase has finished, so an orchestrator sends traffic to a process
+whose pool and hashing backend are already warm. If a warm-up phase fails
+the process reports itself as not alive either, so it is restarted.
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StartupReport:
+    """Per-phase startup timings for this process."""
+
+    def __init__(self):
+        self._created = time.perf_counter()
+        self.phases: List[dict] = []
+        self.ready = False
+        self.failed_phase: Optional[str] = None
+        self._ready_at: Optional[float] = None
+        self._task = None
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._created) * 1000
+
+    def record(self, name: str, duration_ms: float, status: str = "ok"):
+        self.phases.append({"phase": name, "duration_ms": round(duration_ms, 2), "status": status})
+        logger.info(f"Startup phase {name}: {duration_ms:.1f} ms ({status})")
+
+    @asynccontextmanager
+    async def phase(self, name: str):
+        """Time the enclosed block as one startup phase."""
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.record(name, (time.perf_counter() - started) * 1000, "failed")
+            raise
+        self.record(name, (time.perf_counter() - started) * 1000)
+
+    async def timed(self, name: str, work: Awaitable):
+        """Await ``work`` as one phase; lets independent phases run concurrently."""
+        async with self.phase(name):
+            return await work
+
+    def start(self, warm_up: Awaitable):
+        """Run the warm-up coroutine in the background and mark the process ready when it finishes."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(warm_up), name="startup-warm-up")
+
+    async def _run(self, warm_up: Awaitable):
+        try:
+            await warm_up
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self.failed_phase = next((p["phase"] for p in reversed(self.phases) if p["status"] == "failed"),
+                                     "unknown")
+            logger.exception(f"Startup failed in phase {self.failed_phase}: {exc}")
+            return
+        self.ready = True
+        self._ready_at = time.perf_counter()
+        logger.info(f"Ready {self.ready_after_ms:.0f} ms after the application started loading")
+
+    async def stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self.ready = False
+
+    @property
+    def alive(self) -> bool:
+        return self.failed_phase is None
+
+    @property
+    def ready_after_ms(self) -> Optional[float]:
+        if self._ready_at is None:
+            return None
+        return (self._ready_at - self._created) * 1000
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "failed_phase": self.failed_phase,
+            "ready_after_ms": round(self.ready_after_ms, 2) if self.ready_after_ms is not None else None,
+            "phases": list(self.phases),
+        }
+
+
+startup_report = StartupReport()
@@ -0,0 +1,173 @@
+"""Write-behind buffer for application view tracking.
+
+Opening an application records the view in memory only; a background task
+flushes the buffered views to the ``application_views`` collection with one
+``bulk_write`` every ``APPLICATION_VIEW_FLUSH_SECONDS`` (or sooner once
+``APPLICATION_VIEW_BUFFER_MAX`` views are waiting). Each process reads its
+own unflushed views back, so a moderator's "viewed" badge never lags on the
+worker that served the view; other workers see it after the next flush.
+
+Deleting an application only clears the buffer of the worker that handled
+the delete, so every flush checks afterwards which of its applications still
+exist and removes the views it wrote for any that are gone. Either the
+delete's own cleanup or that check runs after the upsert, so no view of a
+deleted application outlives a flush.
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Set, Tuple
+
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
+from database import db
+
+logger = logging.getLogger(__name__)
+
+APPLICATION_VIEW_FLUSH_SECONDS = float(os.environ.get('APPLICATION_VIEW_FLUSH_SECONDS', '5'))
+APPLICATION_VIEW_BUFFER_MAX = int(os.environ.get('APPLICATION_VIEW_BUFFER_MAX', '500'))
+
+
+class ApplicationViewBuffer:
+    """Per-process buffer of (application_id, username) views awaiting a flush."""
+
+    def __init__(self, flush_interval: float = APPLICATION_VIEW_FLUSH_SECONDS,
+                 max_pending: int = APPLICATION_VIEW_BUFFER_MAX):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Dict[Tuple[str, str], datetime] = {}
+        self._task = None
+        self._wake = asyncio.Event()
+        self.recorded = 0
+        self.flushes = 0
+        self.flushed = 0
+
+    def record(self, application_id: str, username: str):
+        """Buffer a view; repeated views before the next flush cost nothing."""
+        key = (application_id, username)
+        if key not in self._pending:
+            self._pending[key] = datetime.now(timezone.utc)
+            self.recorded += 1
+            if len(self._pending) >= self.max_pending:
+                self._wake.set()
+
+    def pending_for(self, username: str) -> Set[str]:
+        """Application ids this moderator viewed here since the last flush."""
+        return {application_id for application_id, viewer in self._pending if viewer == username}
+
+    def discard_application(self, application_id: str):
+        for key in [key for key in self._pending if key[0] == application_id]:
+            del self._pending[key]
+
+    async def flush(self) -> int:
+        """Write every buffered view with a single bulk_write; returns how many were written."""
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, {}
+        writes = [
+            UpdateOne(
+                {"application_id": application_id, "username": username},
+                {"$setOnInsert": {"viewed_at": viewed_at}},
+                upsert=True
+            )
+            for (application_id, username), viewed_at in batch.items()
+        ]
+        try:
+            await db.application_views.bulk_write(writes, ordered=False)
+            await _discard_deleted_views({application_id for application_id, _ in batch})
+        except PyMongoError:
+            # Put the views back (keeping any recorded meanwhile) for the next attempt
+            for key, viewed_at in batch.items():
+                self._pending.setdefault(key, viewed_at)
+            raise
+        self.flushes += 1
+        self.flushed += len(writes)
+        return len(writes)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="application-view-flush")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except PyMongoError as exc:
+            logger.error(f"Dropped {len(self._pending)} buffered application views on shutdown: {exc}")
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(f"Application view flush failed, will retry: {exc}")
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "recorded": self.recorded,
+            "flushes": self.flushes,
+            "flushed": self.flushed,
+            "flush_interval_seconds": self.flush_interval,
+            "running": self._task is not None and not self._task.done(),
+        }
+
+
+async def _discard_deleted_views(application_ids: Set[str]):
+    """Remove just-flushed views of applications deleted on another worker."""
+    existing = await db.applications.find(
+        {"id": {"$in": list(application_ids)}}, {"_id": 0, "id": 1}
+    ).to_list(None)
+    deleted = application_ids - {application["id"] for application in existing}
+    if deleted:
+        await db.application_views.delete_many({"application_id": {"$in": list(deleted)}})
+
+
+async def viewed_application_ids(username: str, application_ids: Iterable[str]) -> Set[str]:
+    """Which of the given applications this moderator has opened, including unflushed views."""
+    application_ids = list(application_ids)
+    if not application_ids:
+        return set()
+    views = await db.application_views.find(
+        {"username": username, "application_id": {"$in": application_ids}},
+        {"_id": 0, "application_id": 1}
+    ).to_list(None)
+    viewed = {view["application_id"] for view in views}
+    return viewed | (application_view_buffer.pending_for(username) & set(application_ids))
+
+
+async def unviewed_application_count(username: str) -> int:
+    """Number of applications this moderator has never opened.
+
+    The total comes from collection metadata rather than a scan of every
+    application; a badge count tolerates its rare drift after an unclean
+    shutdown.
+    """
+    total = await db.applications.estimated_document_count()
+    viewed = await db.application_views.count_documents({"username": username})
+    pending = application_view_buffer.pending_for(username)
+    if pending:
+        # Views already flushed by an earlier visit are counted once
+        already_flushed = await db.application_views.count_documents(
+            {"username": username, "application_id": {"$in": list(pending)}}
+        )
+        viewed += len(pending) - already_flushed
+    return max(0, total - viewed)
+
+
+application_view_buffer = ApplicationViewBuffer()
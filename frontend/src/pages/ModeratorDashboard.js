@@ -146,15 +146,15 @@ export default function ModeratorDashboard() {
     
     // Apply "not voted" filter
     if (notVotedFilter) {
-      filtered = filtered.filter(app => !hasUserVoted(app.votes));
+      filtered = filtered.filter(app => !hasUserVoted(app));
     }
     
     // Apply sort order
     filtered.sort((a, b) => {
       const dateA = new Date(a.submitted_at);
       const dateB = new Date(b.submitted_at);
-      const votesA = getVoteCounts(a.votes || []);
-      const votesB = getVoteCounts(b.votes || []);
+      const votesA = getVoteCounts(a);
+      const votesB = getVoteCounts(b);
 
       if (sortOrder === "most_positive_votes") {
         return votesB.approve - votesA.approve;
@@ -218,11 +218,20 @@ export default function ModeratorDashboard() {
   const fetchApplications = async () => {
     try {
       const token = localStorage.getItem('moderator_token');
-      const response = await axios.get(`${API}/applications`, {
-        headers: { Authorization: `Bearer ${token}` }
-      });
-      setApplications(response.data);
-      setFilteredApplications(response.data);
+      // Follow keyset pagination cursors until every page has been loaded.
+      // The list only needs summary rows; the full document is loaded when an application is opened.
+      const allApplications = [];
+      let cursor = null;
+      do {
+        const response = await axios.get(`${API}/applications`, {
+          headers: { Authorization: `Bearer ${token}` },
+          params: { limit: 500, view: 'summary', ...(cursor ? { cursor } : {}) }
+        });
+        allApplications.push(...response.data);
+        cursor = response.headers['x-next-cursor'] || null;
+      } while (cursor);
+      setApplications(allApplications);
+      setFilteredApplications(allApplications);
     } catch (error) {
       console.error(error);
       if (error.response?.status === 401) {
@@ -241,26 +250,51 @@ export default function ModeratorDashboard() {
     }
   };
 
+  // Follow keyset pagination cursors until an application's whole vote or comment thread is loaded
+  const fetchThread = async (applicationId, thread) => {
+    const token = localStorage.getItem('moderator_token');
+    const rows = [];
+    let cursor = null;
+    do {
+      const response = await axios.get(`${API}/applications/${applicationId}/${thread}`, {
+        headers: { Authorization: `Bearer ${token}` },
+        params: { limit: 500, ...(cursor ? { cursor } : {}) }
+      });
+      rows.push(...response.data);
+      cursor = response.headers['x-next-cursor'] || null;
+    } while (cursor);
+    return rows;
+  };
+
+  // Load an application together with its vote and comment threads
+  const fetchApplicationDetail = async (applicationId) => {
+    const token = localStorage.getItem('moderator_token');
+    const [response, votes, comments] = await Promise.all([
+      axios.get(`${API}/applications/${applicationId}`, {
+        headers: { Authorization: `Bearer ${token}` }
+      }),
+      fetchThread(applicationId, 'votes'),
+      fetchThread(applicationId, 'comments')
+    ]);
+    return { ...response.data, votes, comments };
+  };
+
   // View application and track the view
   const viewApplication = async (app) => {
     try {
-      const token = localStorage.getItem('moderator_token');
       // Fetch the individual application to record the view
-      const response = await axios.get(`${API}/applications/${app.id}`, {
-        headers: { Authorization: `Bearer ${token}` }
-      });
-      setSelectedApp(response.data);
+      setSelectedApp(await fetchApplicationDetail(app.id));
       
       // Update the local application list to reflect viewed status
       setApplications(prev => prev.map(a => 
         a.id === app.id 
-          ? { ...a, viewed_by: response.data.viewed_by || [...(a.viewed_by || []), currentUser.username] }
+          ? { ...a, viewed: true }
           : a
       ));
     } catch (error) {
       console.error(error);
-      // Fallback to just showing the app if fetch fails
-      setSelectedApp(app);
+      // List rows are summaries without the answers, so there is nothing complete to fall back to
+      toast.error("Failed to load application");
     }
   };
 
@@ -276,10 +310,7 @@ export default function ModeratorDashboard() {
       toast.success(`Vote recorded: ${vote}`);
       fetchApplications();
       // Refresh selected app
-      const response = await axios.get(`${API}/applications/${applicationId}`, {
-        headers: { Authorization: `Bearer ${token}` }
-      });
-      setSelectedApp(response.data);
+      setSelectedApp(await fetchApplicationDetail(applicationId));
     } catch (error) {
       console.error(error);
       toast.error(error.response?.data?.detail || `Failed to vote`);
@@ -311,10 +342,7 @@ export default function ModeratorDashboard() {
       setNewComment("");
       fetchApplications();
       // Refresh selected app
-      const response = await axios.get(`${API}/applications/${applicationId}`, {
-        headers: { Authorization: `Bearer ${token}` }
-      });
-      setSelectedApp(response.data);
+      setSelectedApp(await fetchApplicationDetail(applicationId));
     } catch (error) {
       console.error(error);
       toast.error(error.response?.data?.detail || "Failed to add comment");
@@ -381,16 +409,14 @@ export default function ModeratorDashboard() {
     navigate('/');
   };
   
-  const getUserVote = (votes) => {
-    if (!votes || votes.length === 0) return null;
-    return votes.find(v => v.moderator === currentUser.username);
+  const getUserVote = (app) => {
+    return app.my_vote ? { vote: app.my_vote } : null;
   };
   
-  const getVoteCounts = (votes) => {
-    if (!votes || votes.length === 0) return { approve: 0, reject: 0 };
+  const getVoteCounts = (app) => {
     return {
-      approve: votes.filter(v => v.vote === 'approve').length,
-      reject: votes.filter(v => v.vote === 'reject').length
+      approve: app.approve_votes || 0,
+      reject: app.reject_votes || 0
     };
   };
 
@@ -452,10 +478,7 @@ export default function ModeratorDashboard() {
       toast.success(`${approvalType === 'discord' ? 'Discord' : 'In-Game'} approval granted!`);
       fetchApplications();
       // Refresh selected app
-      const response = await axios.get(`${API}/applications/${applicationId}`, {
-        headers: { Authorization: `Bearer ${token}` }
-      });
-      setSelectedApp(response.data);
+      setSelectedApp(await fetchApplicationDetail(applicationId));
     } catch (error) {
       console.error(error);
       toast.error(error.response?.data?.detail || "Failed to approve");
@@ -480,10 +503,7 @@ export default function ModeratorDashboard() {
       toast.success(`${approvalType === 'discord' ? 'Discord' : 'In-Game'} approval removed`);
       fetchApplications();
       // Refresh selected app
-      const response = await axios.get(`${API}/applications/${applicationId}`, {
-        headers: { Authorization: `Bearer ${token}` }
-      });
-      setSelectedApp(response.data);
+      setSelectedApp(await fetchApplicationDetail(applicationId));
     } catch (error) {
       console.error(error);
       toast.error(error.response?.data?.detail || "Failed to remove approval");
@@ -517,23 +537,16 @@ export default function ModeratorDashboard() {
     return badges;
   };
 
-  // Check if current user has viewed the application
-  const hasUserViewed = (viewedBy) => {
-    if (!viewedBy || viewedBy.length === 0) return false;
-    return viewedBy.includes(currentUser.username);
-  };
-
   // Check if current user has voted on the application
-  const hasUserVoted = (votes) => {
-    if (!votes || votes.length === 0) return false;
-    return votes.some(v => v.moderator === currentUser.username);
+  const hasUserVoted = (app) => {
+    return Boolean(app.my_vote);
   };
 
   // Get the user's interaction status with an application
   const getUserInteractionBadge = (app) => {
-    const voted = hasUserVoted(app.votes);
-    const viewed = hasUserViewed(app.viewed_by);
-    const userVote = getUserVote(app.votes);
+    const voted = hasUserVoted(app);
+    const viewed = Boolean(app.viewed);
+    const userVote = getUserVote(app);
     
     if (voted) {
       // User has voted - show their vote
@@ -925,7 +938,7 @@ export default function ModeratorDashboard() {
             </div>
           ) : (
             filteredApplications.map((app) => {
-              const voteCounts = getVoteCounts(app.votes);
+              const voteCounts = getVoteCounts(app);
               return (
                 <div 
                   key={app.id} 
@@ -1002,7 +1015,7 @@ export default function ModeratorDashboard() {
                   </tr>
                 ) : (
                   filteredApplications.map((app) => {
-                    const voteCounts = getVoteCounts(app.votes);
+                    const voteCounts = getVoteCounts(app);
                     return (
                       <tr
                         key={app.id}
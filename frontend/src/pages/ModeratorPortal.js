@@ -70,6 +70,67 @@ export default function ModeratorPortal() {
     }
   }, [currentUser]);
 
+  // Live poll and announcement updates pushed by the server
+  useEffect(() => {
+    if (!currentUser) return;
+
+    const canManageAnnouncements = currentUser.role === 'admin' || currentUser.role === 'mmod';
+    const refreshAnnouncements = () => {
+      fetchAnnouncements();
+      if (canManageAnnouncements) fetchAllAnnouncements();
+    };
+    const resync = () => {
+      checkNewPolls();
+      refreshAnnouncements();
+    };
+
+    let source = null;
+    let retryTimer = null;
+    let retryDelay = 1000;
+    let connectedBefore = false;
+    let closed = false;
+
+    const scheduleReconnect = () => {
+      if (closed) return;
+      retryTimer = setTimeout(connect, retryDelay);
+      retryDelay = Math.min(retryDelay * 2, 60000);
+    };
+
+    const connect = async () => {
+      try {
+        // EventSource cannot send headers, so exchange the token for a short-lived stream ticket
+        const response = await axios.post(`${API}/events/ticket`, {}, {
+          headers: { Authorization: `Bearer ${currentUser.token}` }
+        });
+        if (closed) return;
+        source = new EventSource(`${API}/events/stream?ticket=${encodeURIComponent(response.data.ticket)}`);
+        source.onopen = () => {
+          retryDelay = 1000;
+          // Catch up on anything missed while disconnected
+          if (connectedBefore) resync();
+          connectedBefore = true;
+        };
+        ['poll.created', 'poll.closed', 'poll.deleted'].forEach(type => source.addEventListener(type, checkNewPolls));
+        ['announcement.created', 'announcement.toggled', 'announcement.deleted'].forEach(type => source.addEventListener(type, refreshAnnouncements));
+        source.addEventListener('resync', resync);
+        source.onerror = () => {
+          // The ticket may have expired by now, so reconnect with a fresh one
+          source.close();
+          scheduleReconnect();
+        };
+      } catch (error) {
+        scheduleReconnect();
+      }
+    };
+
+    connect();
+    return () => {
+      closed = true;
+      clearTimeout(retryTimer);
+      if (source) source.close();
+    };
+  }, [currentUser]);
+
   // Announcement functions
   const fetchAnnouncements = async () => {
     try {
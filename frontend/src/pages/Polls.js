@@ -48,8 +48,6 @@ export default function Polls() {
         headers: { Authorization: `Bearer ${token}` }
       });
       setPolls(response.data);
-      // Check for expired polls
-      await axios.post(`${API}/polls/check-expired`);
     } catch (error) {
       console.error("Failed to fetch polls:", error);
     }
@@ -174,11 +172,11 @@ export default function Polls() {
 
   const hasUserVoted = (poll) => {
     if (!currentUser) return false;
-    return poll.options.some(opt => opt.votes?.includes(currentUser.username));
+    return poll.my_vote !== null && poll.my_vote !== undefined;
   };
 
   const getTotalVotes = (poll) => {
-    return poll.options.reduce((sum, opt) => sum + (opt.votes?.length || 0), 0);
+    return poll.total_votes ?? poll.options.reduce((sum, opt) => sum + (opt.vote_count || 0), 0);
   };
 
   const getRoleBadge = (role) => {
@@ -344,9 +342,9 @@ export default function Polls() {
 
                       <div className="space-y-2">
                         {poll.options.map((option, index) => {
-                          const voteCount = option.votes?.length || 0;
+                          const voteCount = option.vote_count || 0;
                           const percentage = totalVotes > 0 ? Math.round((voteCount / totalVotes) * 100) : 0;
-                          const isSelected = option.votes?.includes(currentUser.username);
+                          const isSelected = poll.my_vote === index;
 
                           return (
                             <div key={index} className="relative">
@@ -366,9 +364,9 @@ export default function Polls() {
                                       style={{ width: `${percentage}%` }}
                                     />
                                   </div>
-                                  {poll.show_voters && option.votes?.length > 0 && (
+                                  {poll.show_voters && option.voters?.length > 0 && (
                                     <p className="text-xs text-slate-500 mt-1">
-                                      Voters: {option.votes.join(', ')}
+                                      Voters: {option.voters.join(', ')}
                                     </p>
                                   )}
                                 </div>
@@ -296,7 +296,7 @@ export default function Settings() {
     setSelectedEasterEgg(egg);
     setEasterEggForm({
       username: egg.username,
-      password: egg.password,
+      password: "",
       title: egg.title,
       content: egg.content || {}
     });
@@ -1550,7 +1550,6 @@ export default function Settings() {
                   >
                     <p className="text-slate-200 font-medium capitalize">{egg.page_key}</p>
                     <p className="text-slate-400 text-xs">User: {egg.username}</p>
-                    <p className="text-slate-500 text-xs">Pass: {egg.password}</p>
                   </button>
                 ))}
               </div>
@@ -1573,6 +1572,7 @@ export default function Settings() {
                       <Label className="text-slate-400 text-xs uppercase">Password</Label>
                       <Input
                         value={easterEggForm.password}
+                        placeholder="Leave blank to keep current password"
                         onChange={(e) => setEasterEggForm({ ...easterEggForm, password: e.target.value })}
                         className="bg-slate-900/50 border-slate-700 text-slate-200 rounded-sm mt-1"
                       />